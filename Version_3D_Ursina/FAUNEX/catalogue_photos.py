@@ -0,0 +1,252 @@
+"""
+Catalogue des photos FAUNEX (SQLite embarqué)
+---------------------------------------------
+Chaque cliché est enregistré avec ses métadonnées (animal, score, mise au
+point, distance, position, horodatage, chemin du fichier). Les insertions
+passent par un thread d'écriture qui les regroupe en lots : le thread de
+rendu ne fait jamais d'E/S disque pour une photo.
+
+Les lectures n'attendent pas ce thread : les photos encore en file sont
+gardées en mémoire et fusionnées aux résultats de la base (mode WAL, la
+lecture ne bloque pas l'écriture). Les identifiants sont attribués dès
+l'ajout, ce qui permet d'écarter une photo écrite entre-temps et vue deux
+fois.
+
+Requêtes courantes :
+    catalogue.meilleures_photos()            # meilleur cliché de chaque animal
+    catalogue.photos_score_min(100)          # toutes les photos > 100 pts
+    catalogue.photos_proches(x, z, rayon)    # photos prises près d'un point
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+TAILLE_LOT_MAX = 64       # nombre max de photos écrites par transaction
+DELAI_LOT      = 0.25     # attente max (s) pour compléter un lot
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS photos (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    nom           TEXT    NOT NULL,
+    espece        TEXT    NOT NULL,
+    score         INTEGER NOT NULL,
+    mise_au_point REAL    NOT NULL,
+    distance      REAL    NOT NULL,
+    x             REAL    NOT NULL,
+    y             REAL    NOT NULL,
+    z             REAL    NOT NULL,
+    horodatage    REAL    NOT NULL,
+    chemin        TEXT,
+    rarete        INTEGER,
+    premiere_fois INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_photos_nom   ON photos (nom, score DESC);
+CREATE INDEX IF NOT EXISTS idx_photos_score ON photos (score);
+CREATE INDEX IF NOT EXISTS idx_photos_x     ON photos (x);
+"""
+
+COLONNES = ("id", "nom", "espece", "score", "mise_au_point", "distance",
+            "x", "y", "z", "horodatage", "chemin", "rarete", "premiere_fois")
+
+# Colonnes ajoutées après la première version du catalogue. Sans valeur par
+# défaut : NULL marque une photo antérieure à la colonne (valeur inconnue),
+# que le rejeu des scores ignore au lieu de l'évaluer avec une valeur inventée.
+MIGRATIONS = {
+    "rarete":        "ALTER TABLE photos ADD COLUMN rarete INTEGER",
+    "premiere_fois": "ALTER TABLE photos ADD COLUMN premiere_fois INTEGER",
+}
+
+_FIN = object()   # sentinelle d'arrêt du thread d'écriture
+
+
+class CataloguePhotos:
+    def __init__(self, chemin_base="faunex_photos.db"):
+        self.chemin = Path(chemin_base)
+        self._file  = queue.Queue()
+        self._ferme = False
+
+        # Connexion de lecture (thread principal) — le schéma est créé ici
+        self._lecture = sqlite3.connect(str(self.chemin), check_same_thread=False)
+        self._lecture.row_factory = sqlite3.Row
+        self._lecture.execute("PRAGMA journal_mode=WAL")
+        self._lecture.executescript(SCHEMA)
+        existantes = {ligne[1] for ligne in self._lecture.execute("PRAGMA table_info(photos)")}
+        for colonne, sql in MIGRATIONS.items():
+            if colonne not in existantes:
+                self._lecture.execute(sql)
+        self._lecture.commit()
+
+        # Animaux déjà photographiés : lookup O(1) pour le calcul du score,
+        # mis à jour dès l'ajout (sans attendre l'écriture disque)
+        self._noms_connus = {
+            ligne[0] for ligne in self._lecture.execute("SELECT DISTINCT nom FROM photos")
+        }
+
+        # Photos en file, pas encore dans la base : {id: ligne}, retirées après leur écriture
+        self._en_attente = {}
+        self._verrou     = threading.Lock()
+        self._prochain_id = self._lecture.execute(
+            "SELECT COALESCE(MAX(id), 0) + 1 FROM photos").fetchone()[0]
+
+        self._ecrivain = threading.Thread(target=self._boucle_ecriture,
+                                          name="catalogue-photos", daemon=True)
+        self._ecrivain.start()
+
+    # ------------------------------------------------------------------
+    #  Écriture
+    # ------------------------------------------------------------------
+    def ajouter(self, nom, espece, score, mise_au_point, distance, position,
+                chemin=None, horodatage=None, rarete=1, premiere_fois=False):
+        """Met une photo en file d'écriture. Ne bloque pas."""
+        self._noms_connus.add(nom)
+        ligne = (
+            self._prochain_id, nom, espece, int(score), float(mise_au_point), float(distance),
+            float(position[0]), float(position[1]), float(position[2]),
+            horodatage if horodatage is not None else time.time(),
+            None if chemin is None else str(chemin),
+            int(rarete), int(bool(premiere_fois)),
+        )
+        self._prochain_id += 1
+        with self._verrou:
+            self._en_attente[ligne[0]] = dict(zip(COLONNES, ligne))
+        self._file.put(ligne)
+
+    def _boucle_ecriture(self):
+        connexion = sqlite3.connect(str(self.chemin))
+        requete   = f"INSERT INTO photos ({', '.join(COLONNES)}) VALUES ({', '.join('?' * len(COLONNES))})"
+        continuer = True
+        while continuer:
+            premier = self._file.get()
+            if premier is _FIN:
+                self._file.task_done()
+                break
+            lot = [premier]
+            limite = time.monotonic() + DELAI_LOT
+            while len(lot) < TAILLE_LOT_MAX:
+                reste = limite - time.monotonic()
+                if reste <= 0:
+                    break
+                try:
+                    suivant = self._file.get(timeout=reste)
+                except queue.Empty:
+                    break
+                if suivant is _FIN:
+                    continuer = False
+                    self._file.task_done()
+                    break
+                lot.append(suivant)
+            with connexion:
+                connexion.executemany(requete, lot)
+            with self._verrou:
+                for ligne in lot:
+                    self._en_attente.pop(ligne[0], None)
+            for _ in lot:
+                self._file.task_done()
+        connexion.close()
+
+    def vider(self):
+        """Attend que toutes les photos en file soient écrites."""
+        self._file.join()
+
+    def fermer(self):
+        """Écrit les photos en file puis ferme la base. Sans effet au second appel."""
+        if self._ferme:
+            return
+        self._ferme = True
+        self._file.put(_FIN)
+        self._ecrivain.join()
+        self._lecture.close()
+
+    # ------------------------------------------------------------------
+    #  Lecture
+    # ------------------------------------------------------------------
+    def deja_photographie(self, nom):
+        return nom in self._noms_connus
+
+    def marquer_connus(self, noms):
+        """Reprend les découvertes d'une sauvegarde antérieure au catalogue."""
+        self._noms_connus.update(noms)
+
+    def noms_photographies(self):
+        return set(self._noms_connus)
+
+    def _requete(self, sql, parametres=(), filtre=None):
+        """
+        Lignes de la base, plus les photos en file qui passent `filtre`.
+        La file est relue avant la base : une photo écrite entre les deux
+        est dans la base, et son doublon est écarté par son identifiant.
+        """
+        with self._verrou:
+            en_attente = list(self._en_attente.values())
+        lignes = [dict(ligne) for ligne in self._lecture.execute(sql, parametres)]
+        if filtre is not None and en_attente:
+            vus = {ligne["id"] for ligne in lignes}
+            lignes += [dict(l) for l in en_attente if l["id"] not in vus and filtre(l)]
+        return lignes
+
+    def meilleures_photos(self, noms=None):
+        """Meilleur cliché de chaque animal (ou de ceux de `noms`), indexé par nom."""
+        if noms is None:
+            condition, parametres, filtre = "", (), lambda l: True
+        else:
+            parametres = tuple(noms)
+            if not parametres:
+                return {}
+            condition = f"WHERE nom IN ({', '.join('?' * len(parametres))}) "
+            filtre    = lambda l, noms=set(parametres): l["nom"] in noms
+        lignes = self._requete(
+            "SELECT p.* FROM photos p "
+            f"JOIN (SELECT nom, MAX(score) AS meilleur FROM photos {condition}GROUP BY nom) m "
+            "ON p.nom = m.nom AND p.score = m.meilleur "
+            "GROUP BY p.nom",
+            parametres, filtre,
+        )
+        meilleures = {}
+        for ligne in lignes:     # la base d'abord : à score égal, la photo la plus ancienne
+            actuelle = meilleures.get(ligne["nom"])
+            if actuelle is None or ligne["score"] > actuelle["score"]:
+                meilleures[ligne["nom"]] = ligne
+        return meilleures
+
+    def meilleure_photo(self, nom):
+        return self.meilleures_photos((nom,)).get(nom)
+
+    def photos_score_min(self, score_min):
+        lignes = self._requete(
+            "SELECT * FROM photos WHERE score > ?", (score_min,),
+            filtre=lambda l: l["score"] > score_min,
+        )
+        return sorted(lignes, key=lambda l: l["score"], reverse=True)
+
+    def photos_proches(self, x, z, rayon):
+        # Boîte englobante indexée sur x, puis filtre exact sur le disque
+        lignes = self._requete(
+            "SELECT * FROM photos WHERE x BETWEEN ? AND ? AND z BETWEEN ? AND ?",
+            (x - rayon, x + rayon, z - rayon, z + rayon),
+            filtre=lambda l: True,
+        )
+        r2 = rayon * rayon
+        return [l for l in lignes if (l["x"] - x) ** 2 + (l["z"] - z) ** 2 <= r2]
+
+    def nombre_photos(self, nom=None):
+        with self._verrou:
+            en_attente = [l for l in self._en_attente.values() if nom is None or l["nom"] == nom]
+        # Une seule instruction : compte et dernier identifiant écrit lus sur le même état
+        n, dernier = self._lecture.execute(
+            "SELECT (SELECT COUNT(*) FROM photos" + ("" if nom is None else " WHERE nom = ?") + "), "
+            "(SELECT COALESCE(MAX(id), 0) FROM photos)",
+            () if nom is None else (nom,)
+        ).fetchone()
+        # Les lots sont écrits dans l'ordre des identifiants : au-delà de `dernier`, rien n'est en base
+        return n + sum(1 for l in en_attente if l["id"] > dernier)
+
+    def effacer(self):
+        """Supprime toutes les photos (réinitialisation de la progression)."""
+        self.vider()
+        self._lecture.execute("DELETE FROM photos")
+        self._lecture.commit()
+        self._noms_connus.clear()
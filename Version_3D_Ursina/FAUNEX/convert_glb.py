@@ -21,28 +21,85 @@ Exemples :
 
     # Spécifier un dossier de sortie
     python convert_glb_to_obj.py ./mes_modeles --output ./obj_output
+
+Conversion incrémentale : le dossier de sortie contient un manifeste
+(`.conversion_manifest.json`) qui associe à chaque GLB l'empreinte SHA-256
+de son contenu et les fichiers produits. Un GLB inchangé dont les sorties
+sont présentes n'est pas reconverti (--force pour tout refaire). En mode
+local, les conversions sont réparties sur un pool de processus (--jobs).
+Chaque fichier est écrit dans un temporaire puis renommé : une conversion
+interrompue ne laisse jamais d'OBJ tronqué.
 """
 
 import argparse
+import hashlib
+import importlib.util
+import json
 import os
+import re
 import sys
 import time
 import zipfile
 import io
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
+from sauvegarde import ecrire_atomique
+
+
+MANIFESTE         = ".conversion_manifest.json"
+VERSION_MANIFESTE = 1
+TAILLE_BLOC       = 1 << 20       # lecture par blocs pour l'empreinte
+
+
+# ─────────────────────────────────────────────────────────────
+# Manifeste (conversion incrémentale)
+# ─────────────────────────────────────────────────────────────
+
+def empreinte(chemin: Path) -> str:
+    """SHA-256 du contenu du fichier."""
+    h = hashlib.sha256()
+    with open(chemin, "rb") as f:
+        for bloc in iter(lambda: f.read(TAILLE_BLOC), b""):
+            h.update(bloc)
+    return h.hexdigest()
+
+
+def charger_manifeste(output_dir: Path) -> dict:
+    """{nom du GLB: {"sha256", "sorties"}} ; vide si absent ou illisible."""
+    try:
+        donnees = json.loads((output_dir / MANIFESTE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if donnees.get("version") != VERSION_MANIFESTE:
+        return {}
+    return donnees.get("fichiers", {})
+
+
+def enregistrer_manifeste(output_dir: Path, fichiers: dict):
+    donnees = {"version": VERSION_MANIFESTE, "fichiers": dict(sorted(fichiers.items()))}
+    ecrire_atomique(output_dir / MANIFESTE,
+                    json.dumps(donnees, ensure_ascii=False, indent=4).encode("utf-8"),
+                    garder_secours=False)
+
+
+def a_jour(entree, sha256: str, output_dir: Path) -> bool:
+    """Vrai si le GLB n'a pas changé et que toutes ses sorties existent."""
+    return (entree is not None and entree.get("sha256") == sha256 and entree.get("sorties")
+            and all((output_dir / nom).exists() for nom in entree["sorties"]))
+
 
 # ─────────────────────────────────────────────────────────────
 # Conversion via l'API Convert3D
 # ─────────────────────────────────────────────────────────────
 
-def convert_via_api(glb_path: Path, output_dir: Path, api_key: str) -> bool:
-    """Envoie le fichier GLB à l'API Convert3D et récupère OBJ+MTL."""
+def convert_via_api(glb_path: Path, output_dir: Path, api_key: str):
+    """Envoie le fichier GLB à l'API Convert3D et récupère OBJ+MTL ; retourne les fichiers écrits (None si échec)."""
     try:
         import requests
     except ImportError:
         print("  ✗ Le module 'requests' est manquant. Installez-le : pip install requests")
-        return False
+        return None
 
     url = "https://convert3d.org/api/convert"
     headers = {"Authorization": f"Token {api_key}"}
@@ -59,15 +116,16 @@ def convert_via_api(glb_path: Path, output_dir: Path, api_key: str) -> bool:
             )
     except requests.exceptions.RequestException as e:
         print(f"  ✗ Erreur réseau : {e}")
-        return False
+        return None
 
     if response.status_code != 200:
         print(f"  ✗ Erreur API ({response.status_code}) : {response.text[:200]}")
-        return False
+        return None
 
     # L'API renvoie soit un ZIP (OBJ + MTL + textures), soit un OBJ seul
     content_type = response.headers.get("Content-Type", "")
     stem = glb_path.stem
+    sorties = []
 
     if "zip" in content_type or response.content[:2] == b"PK":
         # Extraire le ZIP dans le dossier de sortie
@@ -76,62 +134,96 @@ def convert_via_api(glb_path: Path, output_dir: Path, api_key: str) -> bool:
                 # Renommer les fichiers avec le nom du GLB source
                 ext = Path(member).suffix
                 dest_name = f"{stem}{ext}"
-                dest_path = output_dir / dest_name
-                with z.open(member) as src, open(dest_path, "wb") as dst:
-                    dst.write(src.read())
+                with z.open(member) as src:
+                    ecrire_atomique(output_dir / dest_name, src.read(), garder_secours=False)
+                sorties.append(dest_name)
                 print(f"  ✓ Extrait : {dest_name}")
     else:
         # Réponse directe OBJ
         obj_path = output_dir / f"{stem}.obj"
-        obj_path.write_bytes(response.content)
+        ecrire_atomique(obj_path, response.content, garder_secours=False)
+        sorties.append(obj_path.name)
         print(f"  ✓ Sauvegardé : {obj_path.name}")
 
-    return True
+    return sorties
 
 
 # ─────────────────────────────────────────────────────────────
 # Conversion locale via trimesh
 # ─────────────────────────────────────────────────────────────
 
-def convert_local(glb_path: Path, output_dir: Path) -> bool:
-    """Convertit un GLB en OBJ+MTL localement avec trimesh."""
+def rendre_obj(scene, stem: str):
+    """
+    Rend `scene` en OBJ : retourne le texte de `<stem>.obj` et ses annexes
+    {nom de fichier: octets} (MTL et textures), à écrire dans le même dossier.
+    """
+    from trimesh.exchange.obj import export_obj
+
+    texte, annexes = export_obj(scene, include_texture=True, return_texture=True,
+                                mtl_name=f"{stem}.mtl")
+    # Textures préfixées par le modèle : deux GLB ont souvent une « Texture.png »,
+    # qui s'écraseraient l'une l'autre (et se disputeraient le même temporaire)
+    mtl = annexes.pop(f"{stem}.mtl", b"").decode("utf-8")
+    for nom in list(annexes):
+        annexes[f"{stem}_{nom}"] = annexes.pop(nom)
+        mtl = re.sub(rf"^(map_\w+\s+){re.escape(nom)}$", rf"\g<1>{stem}_{nom}", mtl, flags=re.M)
+    if mtl:
+        annexes[f"{stem}.mtl"] = mtl.encode("utf-8")
+    return texte, annexes
+
+
+def convert_local(glb_path: Path, output_dir: Path) -> dict:
+    """
+    Convertit un GLB en OBJ+MTL localement avec trimesh. Exécutée dans un
+    processus du pool : ne fait aucun affichage et retourne un résultat
+    {"nom", "sorties", "erreur", "duree"}.
+    """
+    debut = time.perf_counter()
+    resultat = {"nom": glb_path.name, "sorties": [], "erreur": None, "duree": 0.0}
     try:
         import trimesh
-    except ImportError:
-        print("  ✗ Le module 'trimesh' est manquant. Installez-le : pip install trimesh")
-        return False
-
-    stem = glb_path.stem
-    obj_path = output_dir / f"{stem}.obj"
-    mtl_path = output_dir / f"{stem}.mtl"
 
-    try:
+        stem = glb_path.stem
         scene = trimesh.load(str(glb_path), force="scene")
 
         # Si c'est un simple mesh et non une scène
         if isinstance(scene, trimesh.Trimesh):
             scene = trimesh.scene.scene.Scene(geometry={stem: scene})
 
-        # Export OBJ (trimesh génère automatiquement le .mtl associé)
-        result = scene.export(str(obj_path))
-
-        if obj_path.exists():
-            size_kb = obj_path.stat().st_size / 1024
-            print(f"  ✓ OBJ créé : {obj_path.name} ({size_kb:.1f} Ko)")
-        if mtl_path.exists():
-            print(f"  ✓ MTL créé : {mtl_path.name}")
-
-        return True
+        # OBJ, MTL et textures rendus en mémoire, puis écrits de façon atomique
+        texte, annexes = rendre_obj(scene, stem)
+        for nom, octets in annexes.items():
+            ecrire_atomique(output_dir / nom, octets, garder_secours=False)
+            resultat["sorties"].append(nom)
+        # OBJ en dernier : sa présence implique celle de son MTL
+        ecrire_atomique(output_dir / f"{stem}.obj", texte.encode("utf-8"), garder_secours=False)
+        resultat["sorties"].append(f"{stem}.obj")
 
     except Exception as e:
-        print(f"  ✗ Erreur de conversion : {e}")
-        return False
+        resultat["erreur"] = str(e) or type(e).__name__
+    resultat["duree"] = time.perf_counter() - debut
+    return resultat
 
 
 # ─────────────────────────────────────────────────────────────
 # Point d'entrée principal
 # ─────────────────────────────────────────────────────────────
 
+def afficher_resultat(i, total, resultat, output_dir):
+    print(f"[{i}/{total}] {resultat['nom']} ({resultat['duree']:.2f} s)")
+    if resultat["erreur"]:
+        print(f"  ✗ Erreur de conversion : {resultat['erreur']}")
+        return
+    for nom in resultat["sorties"]:
+        chemin = output_dir / nom
+        if chemin.suffix.lower() == ".obj":
+            print(f"  ✓ OBJ créé : {nom} ({chemin.stat().st_size / 1024:.1f} Ko)")
+        elif chemin.suffix.lower() == ".mtl":
+            print(f"  ✓ MTL créé : {nom}")
+        else:
+            print(f"  ✓ Texture : {nom}")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Convertit tous les fichiers GLB d'un dossier en OBJ + MTL"
@@ -164,7 +256,19 @@ def main():
         default=1.0,
         help="Délai en secondes entre les appels API (défaut : 1.0)",
     )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processus de conversion en mode local (défaut : nombre de cœurs)",
+    )
+    parser.add_argument(
+        "--force", "-f",
+        action="store_true",
+        help="Reconvertir même les fichiers inchangés depuis la dernière conversion",
+    )
     args = parser.parse_args()
+    debut = time.perf_counter()
 
     # ── Résolution des chemins ──────────────────────────────
     input_dir = Path(args.input_dir).resolve()
@@ -176,7 +280,9 @@ def main():
     output_dir.mkdir(parents=True, exist_ok=True)
 
     # ── Recherche des fichiers GLB ──────────────────────────
-    glb_files = sorted(input_dir.glob("*.glb"))
+    # Les niveaux simplifiés (lod_modeles.py) ne sont pas des modèles à convertir
+    from lod_modeles import est_lod
+    glb_files = sorted(p for p in input_dir.glob("*.glb") if not est_lod(p))
     if not glb_files:
         print(f"✗ Aucun fichier .glb trouvé dans : {input_dir}")
         sys.exit(0)
@@ -186,6 +292,27 @@ def main():
     print(f"🔢 Fichiers GLB trouvés : {len(glb_files)}\n")
     print("─" * 50)
 
+    # ── Fichiers modifiés depuis la dernière conversion ─────
+    ancien   = charger_manifeste(output_dir)
+    manifeste = {}
+    empreintes = {}
+    a_convertir = []
+    for glb_path in glb_files:
+        sha256 = empreintes[glb_path.name] = empreinte(glb_path)
+        entree = ancien.get(glb_path.name)
+        if not args.force and a_jour(entree, sha256, output_dir):
+            manifeste[glb_path.name] = entree
+        else:
+            a_convertir.append(glb_path)
+    inchanges = len(glb_files) - len(a_convertir)
+    if inchanges:
+        print(f"⏭️  Inchangés depuis la dernière conversion : {inchanges}")
+    if not a_convertir:
+        enregistrer_manifeste(output_dir, manifeste)
+        print(f"✅ Rien à convertir ({time.perf_counter() - debut:.2f} s)")
+        print(f"📂 Fichiers disponibles dans : {output_dir}")
+        return
+
     # ── Sélection du mode ───────────────────────────────────
     use_local = args.local
     api_key = args.api_key or os.environ.get("CONVERT3D_API_KEY")
@@ -195,36 +322,62 @@ def main():
         print("   Conseil : définissez la variable CONVERT3D_API_KEY ou passez --api-key\n")
         use_local = True
 
-    mode_label = "local (trimesh)" if use_local else "API Convert3D"
-    print(f"⚙️  Mode : {mode_label}\n")
-
-    # ── Boucle de conversion ────────────────────────────────
-    success, failed = 0, 0
+    if use_local and importlib.util.find_spec("trimesh") is None:
+        print("✗ Le module 'trimesh' est manquant. Installez-le : pip install trimesh")
+        sys.exit(1)
 
-    for i, glb_path in enumerate(glb_files, start=1):
-        print(f"[{i}/{len(glb_files)}] {glb_path.name}")
+    jobs = max(1, min(args.jobs, len(a_convertir)))
+    mode_label = f"local (trimesh, {jobs} processus)" if use_local else "API Convert3D"
+    print(f"⚙️  Mode : {mode_label}\n")
 
-        if use_local:
-            ok = convert_local(glb_path, output_dir)
-        else:
-            ok = convert_via_api(glb_path, output_dir, api_key)
-            if i < len(glb_files):
+    # ── Conversion ──────────────────────────────────────────
+    resultats = []
+
+    def enregistrer(resultat):
+        resultats.append(resultat)
+        if not resultat["erreur"]:
+            manifeste[resultat["nom"]] = {"sha256": empreintes[resultat["nom"]],
+                                          "sorties": sorted(resultat["sorties"])}
+            # Manifeste tenu à jour au fil de l'eau : une interruption ne perd rien
+            enregistrer_manifeste(output_dir, manifeste)
+
+    if use_local:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            taches = [pool.submit(convert_local, glb_path, output_dir) for glb_path in a_convertir]
+            for i, tache in enumerate(as_completed(taches), start=1):
+                resultat = tache.result()
+                afficher_resultat(i, len(a_convertir), resultat, output_dir)
+                enregistrer(resultat)
+                print()
+    else:
+        for i, glb_path in enumerate(a_convertir, start=1):
+            print(f"[{i}/{len(a_convertir)}] {glb_path.name}")
+            t0 = time.perf_counter()
+            sorties = convert_via_api(glb_path, output_dir, api_key)
+            enregistrer({"nom": glb_path.name, "sorties": sorties or [],
+                         "erreur": None if sorties else "échec API",
+                         "duree": time.perf_counter() - t0})
+            if i < len(a_convertir):
                 time.sleep(args.delay)  # respecter le rate-limit de l'API
-
-        if ok:
-            success += 1
-        else:
-            failed += 1
-
-        print()
+            print()
+    enregistrer_manifeste(output_dir, manifeste)
 
     # ── Résumé ──────────────────────────────────────────────
+    failed = [r for r in resultats if r["erreur"]]
+    cumul = sum(r["duree"] for r in resultats)
     print("─" * 50)
-    print(f"✅ Convertis avec succès : {success}")
+    print("⏱️  Durée par fichier :")
+    for r in sorted(resultats, key=lambda r: -r["duree"]):
+        print(f"   {r['nom']:<32}{r['duree']:>8.2f} s{'  ✗' if r['erreur'] else ''}")
+    print(f"   {'cumul':<32}{cumul:>8.2f} s")
+    print(f"✅ Convertis avec succès : {len(resultats) - len(failed)}")
+    if inchanges:
+        print(f"⏭️  Inchangés : {inchanges}")
     if failed:
-        print(f"❌ Échecs : {failed}")
+        print(f"❌ Échecs : {len(failed)}")
+    print(f"⏱️  Durée totale : {time.perf_counter() - debut:.2f} s")
     print(f"📂 Fichiers disponibles dans : {output_dir}")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
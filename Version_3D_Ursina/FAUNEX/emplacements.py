@@ -0,0 +1,127 @@
+"""
+Emplacements de sauvegarde FAUNEX
+---------------------------------
+Les sauvegardes vivent dans un dossier propre à l'utilisateur (et non plus
+dans le dossier courant) :
+
+    Windows  %APPDATA%\\FAUNEX
+    macOS    ~/Library/Application Support/FAUNEX
+    Linux    $XDG_DATA_HOME/faunex (par défaut ~/.local/share/faunex)
+
+La variable d'environnement FAUNEX_SAUVEGARDES remplace ce dossier
+(installation portable, tests).
+
+Chaque emplacement est un sous-dossier `emplacement_<n>/` contenant la
+progression, son journal, l'instantané du monde, le catalogue photo et une
+miniature. Un petit fichier `index.json` résume chaque emplacement
+(crédits, espèces découvertes, temps de jeu, miniature) : le sélecteur
+l'affiche sans ouvrir aucune sauvegarde.
+"""
+
+import json
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+
+from sauvegarde import EcrivainAtomique, lire_json
+
+
+NB_EMPLACEMENTS = 3
+NOM_INDEX       = "index.json"
+NOM_MINIATURE   = "miniature.png"
+VERSION_INDEX   = 1
+
+
+def dossier_utilisateur():
+    if os.environ.get("FAUNEX_SAUVEGARDES"):
+        return Path(os.environ["FAUNEX_SAUVEGARDES"])
+    if sys.platform == "win32":
+        return Path(os.environ.get("APPDATA", Path.home() / "AppData" / "Roaming")) / "FAUNEX"
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Application Support" / "FAUNEX"
+    return Path(os.environ.get("XDG_DATA_HOME", Path.home() / ".local" / "share")) / "faunex"
+
+
+class GestionnaireEmplacements:
+    def __init__(self, dossier=None, nb_emplacements=NB_EMPLACEMENTS):
+        self.dossier = Path(dossier) if dossier is not None else dossier_utilisateur()
+        self.nb      = nb_emplacements
+        self.dossier.mkdir(parents=True, exist_ok=True)
+        index = lire_json(self.dossier / NOM_INDEX) or {}
+        self._resumes = {
+            int(n): resume for n, resume in index.get("emplacements", {}).items()
+        }
+        self.anciens_repris = index.get("anciens_repris", False)
+        # L'index est écrit hors du thread de rendu, une écriture à la fois ;
+        # une erreur reste dans `ecriture.erreur` jusqu'à ce que le jeu la lise
+        self.ecriture = EcrivainAtomique(self.dossier / NOM_INDEX)
+
+    def chemin(self, numero):
+        """Dossier de l'emplacement `numero` (créé au besoin)."""
+        dossier = self.dossier / f"emplacement_{numero}"
+        dossier.mkdir(exist_ok=True)
+        return dossier
+
+    def lister(self):
+        """[(numero, résumé ou None)] pour chaque emplacement — lit uniquement l'index."""
+        return [(n, self._resumes.get(n)) for n in range(1, self.nb + 1)]
+
+    def resume(self, numero):
+        return self._resumes.get(numero)
+
+    def est_vide(self, numero):
+        """Vrai si l'emplacement n'a ni résumé ni fichier (partie jamais sauvegardée)."""
+        dossier = self.dossier / f"emplacement_{numero}"
+        return numero not in self._resumes and not (dossier.is_dir() and any(dossier.iterdir()))
+
+    def mettre_a_jour(self, numero, credits, nb_especes, temps_jeu, miniature=False, attendre=False):
+        resume = {
+            "credits":    credits,
+            "especes":    nb_especes,
+            "temps_jeu":  round(temps_jeu, 1),
+            "modifie":    time.time(),
+            "miniature":  self._resumes.get(numero, {}).get("miniature"),
+        }
+        if miniature:
+            resume["miniature"] = f"emplacement_{numero}/{NOM_MINIATURE}"
+        self._resumes[numero] = resume
+        self._ecrire_index(attendre)
+
+    def chemin_miniature(self, numero):
+        resume = self._resumes.get(numero)
+        if not resume or not resume.get("miniature"):
+            return None
+        chemin = self.dossier / resume["miniature"]
+        return chemin if chemin.exists() else None
+
+    def effacer(self, numero):
+        shutil.rmtree(self.dossier / f"emplacement_{numero}", ignore_errors=True)
+        self._resumes.pop(numero, None)
+        self._ecrire_index()
+
+    def reprendre_anciens(self, numero, fichiers):
+        """
+        Copie une seule fois dans l'emplacement `numero` les fichiers d'avant
+        les emplacements (sauvegarde dans le dossier courant).
+        """
+        if self.anciens_repris:
+            return
+        dossier = self.chemin(numero)
+        for source in fichiers:
+            source = Path(source)
+            if source.exists() and not (dossier / source.name).exists():
+                shutil.copy2(source, dossier / source.name)
+        self.anciens_repris = True
+        self._ecrire_index()
+
+    def _ecrire_index(self, attendre=False):
+        index = {
+            "version":        VERSION_INDEX,
+            "anciens_repris": self.anciens_repris,
+            "emplacements": {str(n): dict(r) for n, r in sorted(self._resumes.items())},
+        }
+        self.ecriture.ecrire(json.dumps(index, ensure_ascii=False, indent=4).encode("utf-8"))
+        if attendre:
+            self.ecriture.attendre()
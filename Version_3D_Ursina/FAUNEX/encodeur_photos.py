@@ -0,0 +1,67 @@
+"""
+Encodeur d'images asynchrone FAUNEX
+-----------------------------------
+L'encodage PNG/JPEG d'une grande image prend plusieurs centaines de
+millisecondes : il est fait dans un thread dédié pour ne pas figer le rendu.
+Chaque fichier est d'abord écrit sous un nom temporaire puis renommé, un
+fichier à moitié écrit n'apparaît donc jamais dans le dossier des photos.
+
+Les résultats (chemin, succès) sont récupérés par le thread principal via
+`terminees()`, à appeler depuis la boucle `update`.
+"""
+
+import os
+import queue
+import threading
+from pathlib import Path
+
+from panda3d.core import Filename
+
+
+_FIN = object()
+
+
+class EncodeurAsynchrone:
+    def __init__(self):
+        self._travaux   = queue.Queue()
+        self._resultats = queue.Queue()
+        self._thread    = threading.Thread(target=self._boucle, name="encodeur-photos", daemon=True)
+        self._thread.start()
+
+    def encoder(self, image, chemin):
+        """Met en file l'écriture d'une PNMImage vers `chemin`. Ne bloque pas."""
+        self._travaux.put((image, Path(chemin)))
+
+    def _boucle(self):
+        while True:
+            travail = self._travaux.get()
+            if travail is _FIN:
+                break
+            image, chemin = travail
+            # L'extension finale est conservée : PNMImage choisit le format d'après elle
+            temporaire = chemin.with_name(f".{chemin.stem}.tmp{chemin.suffix}")
+            ok = False
+            try:
+                # Dossier impossible à créer : échec de cette photo, le thread continue
+                chemin.parent.mkdir(parents=True, exist_ok=True)
+                ok = image.write(Filename.from_os_specific(str(temporaire)))
+                if ok:
+                    os.replace(temporaire, chemin)
+            except OSError:
+                ok = False
+            if not ok and temporaire.exists():
+                temporaire.unlink()
+            self._resultats.put((chemin, ok))
+
+    def terminees(self):
+        """Retourne les encodages finis depuis le dernier appel : [(chemin, ok), ...]."""
+        resultats = []
+        while True:
+            try:
+                resultats.append(self._resultats.get_nowait())
+            except queue.Empty:
+                return resultats
+
+    def fermer(self):
+        self._travaux.put(_FIN)
+        self._thread.join()
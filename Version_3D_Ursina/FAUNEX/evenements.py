@@ -0,0 +1,246 @@
+"""
+Journal d'événements FAUNEX
+---------------------------
+Remplace les `print` de diagnostic, perdus dans la version compilée sans
+console (`console=False`). Chaque événement est un enregistrement de
+taille fixe (horodatage, niveau, catégorie, nom, champs) rangé dans un
+tampon circulaire en mémoire ; un thread d'arrière-plan le vide dans un
+fichier JSON Lines à rotation (`faunex.log`, `.1`, `.2`, ...) et, s'il
+y a une console, en recopie une version lisible.
+
+    LOG = EVENEMENTS.categorie("modeles")
+    LOG.attention("modele_absent", chemin=str(chemin))
+    if LOG.detail:                       # chemin chaud : rien n'est évalué si filtré
+        LOG.detail("modele_charge", chemin=relatif)
+
+Un niveau filtré est un appelable inerte et faux : l'appel direct ne fait
+rien, et le test `if LOG.detail:` évite même de construire les arguments.
+Le formatage (JSON, texte) se fait entièrement dans le thread d'écriture.
+
+Niveaux par catégorie, variable d'environnement FAUNEX_LOG :
+    FAUNEX_LOG="modeles=detail,animaux=detail,*=attention"
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+
+DETAIL, INFO, ATTENTION, ERREUR, AUCUN = 10, 20, 30, 40, 100
+NOMS_NIVEAUX = {DETAIL: "detail", INFO: "info", ATTENTION: "attention", ERREUR: "erreur"}
+NIVEAUX      = {**{nom: n for n, nom in NOMS_NIVEAUX.items()}, "aucun": AUCUN}
+SYMBOLES     = {DETAIL: "·", INFO: "ℹ️ ", ATTENTION: "⚠️ ", ERREUR: "❌"}
+
+CAPACITE        = 4096          # enregistrements du tampon circulaire
+INTERVALLE      = 1.0           # vidage périodique (s)
+NOM_FICHIER     = "faunex.log"
+TAILLE_FICHIER  = 1 << 20       # rotation au-delà (octets)
+NB_FICHIERS     = 3             # fichiers conservés, rotation comprise
+
+
+class _Inerte:
+    """Niveau filtré : appelable sans effet, et faux pour `if LOG.detail:`."""
+    __slots__ = ()
+
+    def __call__(self, *args, **champs):
+        pass
+
+    def __bool__(self):
+        return False
+
+
+_INERTE = _Inerte()
+
+
+class Categorie:
+    def __init__(self, journal, nom, index, niveau):
+        self.journal = journal
+        self.nom     = nom
+        self.index   = index
+        self.regler(niveau)
+
+    def _emetteur(self, niveau):
+        ecrire, index = self.journal._ecrire, self.index
+
+        def emettre(evenement, **champs):
+            ecrire(niveau, index, evenement, champs)
+        return emettre
+
+    def regler(self, niveau):
+        self.niveau    = niveau
+        self.detail    = self._emetteur(DETAIL)    if niveau <= DETAIL    else _INERTE
+        self.info      = self._emetteur(INFO)      if niveau <= INFO      else _INERTE
+        self.attention = self._emetteur(ATTENTION) if niveau <= ATTENTION else _INERTE
+        self.erreur    = self._emetteur(ERREUR)    if niveau <= ERREUR    else _INERTE
+
+
+class JournalEvenements:
+    def __init__(self, capacite=CAPACITE):
+        self.capacite   = capacite
+        # Tampon circulaire : champs parallèles, emplacements préalloués
+        self._temps     = [0.0] * capacite
+        self._niveaux   = [0] * capacite
+        self._cats      = [0] * capacite
+        self._evs       = [None] * capacite
+        self._champs    = [None] * capacite
+        self._ecrits    = 0             # enregistrements produits (jamais remis à zéro)
+        self._lus       = 0             # enregistrements vidés
+        self.perdus     = 0             # écrasés avant d'avoir été vidés
+        self.categories = {}
+        self._noms      = []
+        self._defaut    = INFO
+        self._config    = {}
+        self.console    = sys.stdout is not None   # pas de console dans la version compilée
+        self.chemin     = None
+        self._fichier   = None
+        self._reveil    = threading.Event()
+        self._arret     = False
+        self._thread    = None
+        self._verrou    = threading.Lock()       # un seul vidage à la fois
+        self._interne   = self.categorie("journal")
+
+    # ------------------------------------------------------------------
+    #  Catégories et niveaux
+    # ------------------------------------------------------------------
+    def categorie(self, nom):
+        c = self.categories.get(nom)
+        if c is None:
+            c = self.categories[nom] = Categorie(self, nom, len(self._noms),
+                                                 self._config.get(nom, self._defaut))
+            self._noms.append(nom)
+        return c
+
+    def configurer(self, texte):
+        """Applique « cat=niveau,*=niveau » ; retourne les entrées invalides."""
+        invalides = []
+        for morceau in filter(None, (m.strip() for m in (texte or "").split(","))):
+            nom, _, niveau = morceau.partition("=")
+            if niveau.strip().lower() not in NIVEAUX:
+                invalides.append(morceau)
+                continue
+            niveau = NIVEAUX[niveau.strip().lower()]
+            if nom.strip() == "*":
+                self._defaut = niveau
+            else:
+                self._config[nom.strip()] = niveau
+        for nom, c in self.categories.items():
+            c.regler(self._config.get(nom, self._defaut))
+        return invalides
+
+    # ------------------------------------------------------------------
+    #  Écriture (thread principal)
+    # ------------------------------------------------------------------
+    def _ecrire(self, niveau, categorie, evenement, champs):
+        i = self._ecrits % self.capacite
+        self._temps[i]   = time.time()
+        self._niveaux[i] = niveau
+        self._cats[i]    = categorie
+        self._evs[i]     = evenement
+        self._champs[i]  = champs
+        self._ecrits += 1
+        if niveau >= ERREUR or self._ecrits - self._lus >= self.capacite // 2:
+            self._reveil.set()
+
+    # ------------------------------------------------------------------
+    #  Vidage (thread d'arrière-plan)
+    # ------------------------------------------------------------------
+    def demarrer(self, dossier):
+        """
+        Ouvre `dossier/faunex.log` et lance le thread de vidage. Si le fichier
+        ne peut pas être ouvert, le tampon n'est vidé que sur la console :
+        retourne False (l'erreur est aussi journalisée).
+        """
+        chemin = Path(dossier) / NOM_FICHIER
+        try:
+            chemin.parent.mkdir(parents=True, exist_ok=True)
+            self._fichier = open(chemin, "a", encoding="utf-8")
+            self.chemin   = chemin
+        except OSError as e:
+            self._interne.attention("fichier_indisponible", chemin=str(chemin), erreur=str(e))
+        self._thread  = threading.Thread(target=self._boucle, name="journal-evenements", daemon=True)
+        self._thread.start()
+        return self._fichier is not None
+
+    def arreter(self):
+        """Dernier vidage puis fermeture (appelé à la sortie)."""
+        if self._thread is not None:
+            self._arret = True
+            self._reveil.set()
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self.vider()
+        if self._fichier is not None:
+            self._fichier.close()
+            self._fichier = None
+
+    def _boucle(self):
+        while not self._arret:
+            self._reveil.wait(INTERVALLE)
+            self._reveil.clear()
+            self.vider()
+
+    def _extraire(self):
+        """Copie les enregistrements non vidés ; ceux déjà écrasés sont comptés perdus."""
+        fin   = self._ecrits
+        debut = max(self._lus, fin - self.capacite)
+        perdus = debut - self._lus
+        lot = []
+        for n in range(debut, fin):
+            i = n % self.capacite
+            lot.append((self._temps[i], self._niveaux[i], self._cats[i],
+                        self._evs[i], self._champs[i]))
+        # Le thread principal a pu réécrire le début du lot pendant la copie
+        ecrases = max(0, self._ecrits - self.capacite - debut)
+        if ecrases:
+            del lot[:ecrases]
+            perdus += ecrases
+        self._lus = fin
+        return lot, perdus
+
+    def vider(self):
+        with self._verrou:
+            lot, perdus = self._extraire()
+            if perdus:
+                self.perdus += perdus
+                lot.insert(0, (time.time(), ATTENTION, self._interne.index,
+                               "evenements_perdus", {"nombre": perdus}))
+            if not lot:
+                return
+            lignes = []
+            for t, niveau, cat, evenement, champs in lot:
+                nom_cat = self._noms[cat]
+                enregistrement = {"t": round(t, 3), "niveau": NOMS_NIVEAUX[niveau],
+                                  "cat": nom_cat, "ev": evenement}
+                enregistrement.update(champs)
+                lignes.append(json.dumps(enregistrement, ensure_ascii=False, default=str))
+                if self.console:
+                    details = " ".join(f"{k}={v}" for k, v in champs.items())
+                    print(f"{SYMBOLES[niveau]} [{nom_cat}] {evenement} {details}".rstrip())
+            if self._fichier is not None:
+                try:
+                    self._fichier.write("\n".join(lignes) + "\n")
+                    self._fichier.flush()
+                    if self._fichier.tell() >= TAILLE_FICHIER:
+                        self._tourner()
+                except OSError:
+                    pass    # disque plein ou retiré : le jeu continue sans journal
+
+    def _tourner(self):
+        self._fichier.close()
+        try:
+            for rang in range(NB_FICHIERS - 1, 0, -1):
+                source = self.chemin if rang == 1 else self.chemin.with_name(f"{NOM_FICHIER}.{rang - 1}")
+                if source.exists():
+                    os.replace(source, self.chemin.with_name(f"{NOM_FICHIER}.{rang}"))
+        finally:
+            # Même après une rotation interrompue : jamais de fichier fermé laissé en place
+            try:
+                self._fichier = open(self.chemin, "a", encoding="utf-8")
+            except OSError:
+                self._fichier = None
+
+
+EVENEMENTS = JournalEvenements()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Format binaire des sauvegardes FAUNEX
+-------------------------------------
+Les instantanés sont écrits dans un format binaire versionné : les champs
+fixes sont empaquetés avec `struct` et les noms d'espèces / de badges sont
+remplacés par des identifiants entiers (table `NOMS` internée). Les noms
+inconnus de la table sont stockés une seule fois dans une table de chaînes
+en fin de fichier.
+
+Toutes les anciennes sauvegardes JSON sont reprises par une chaîne de
+migrations explicites :
+
+    v1  JSON de main.py         noms accentués, pas de `appat_pnj_donne`
+    v2  JSON de version_dev.py  noms sans accents, `appat_pnj_donne`
+    v3  JSON + `generation`     instantané du journal de sauvegarde
+    v4  binaire (ce module)
+
+Usage :
+    # Compare JSON et binaire (taille, temps d'écriture et de lecture)
+    python format_sauvegarde.py bench --especes 1000
+
+    # Convertit une ancienne sauvegarde JSON
+    python format_sauvegarde.py migrer sauvegarde_faunex.json sauvegarde_faunex.sav
+"""
+
+import argparse
+import json
+import struct
+import sys
+import time
+import unicodedata
+from pathlib import Path
+
+from sauvegarde import encadrer, encoder_json, lire_generations, lire_json
+
+
+MAGIC           = b"FXSV"
+VERSION_BINAIRE = 4
+
+# Noms internés — ordre figé : n'ajouter qu'en fin de tuple
+ESPECES = (
+    "Renard Roux", "Ours Brun", "Cerf", "Fennec", "Loup Gris", "Sanglier",
+    "Lynx", "Panthere", "Aigle Royal", "Faucon", "Corbeau", "Hibou",
+    "Pigeon", "Crocodile", "Vipere", "Cameleon", "Iguane", "Scorpion",
+    "Scarabee", "Mante", "Papillon",
+)
+BADGES = ("Photographe Debutant", "Ami de la Nature")
+NOMS   = ESPECES + BADGES
+IDS    = {nom: i for i, nom in enumerate(NOMS)}
+
+# credits, appats, dechets, capacite_sd, photos_sd, drapeaux, generation
+ENTETE   = struct.Struct("<4sB")
+FIXES    = struct.Struct("<iiiIIBI")
+COMPTE   = struct.Struct("<H")
+TAILLE_TABLE = struct.Struct("<I")
+DRAPEAU_PNJ_RENCONTRE = 0x01
+DRAPEAU_APPAT_DONNE   = 0x02
+
+
+class SauvegardeInvalide(ValueError):
+    pass
+
+
+# ─────────────────────────────────────────────────────────────
+# Encodage v4
+# ─────────────────────────────────────────────────────────────
+
+def encoder(etat):
+    """Encode un état (dictionnaire au format courant) en octets v4."""
+    # Les noms absents de `NOMS` reçoivent un identifiant à la suite
+    extras = {}
+    for nom in (*etat["encyclopedie"], *etat["badges"]):
+        if nom not in IDS:
+            extras.setdefault(nom, len(NOMS) + len(extras))
+    ids = IDS if not extras else {**IDS, **extras}
+    encyclopedie = [ids[n] for n in etat["encyclopedie"]]
+    badges       = [ids[n] for n in etat["badges"]]
+    drapeaux = ((DRAPEAU_PNJ_RENCONTRE if etat["pnj_rencontre"] else 0)
+                | (DRAPEAU_APPAT_DONNE if etat["appat_pnj_donne"] else 0))
+
+    morceaux = [
+        ENTETE.pack(MAGIC, VERSION_BINAIRE),
+        FIXES.pack(etat["credits"], etat["appats_restants"], etat["dechets_ramasses"],
+                   etat["capacite_sd"], etat["photos_sd"], drapeaux, etat.get("generation", 0)),
+    ]
+    for ids in (encyclopedie, badges):
+        morceaux.append(COMPTE.pack(len(ids)))
+        morceaux.append(struct.pack(f"<{len(ids)}H", *ids))
+    # Table des noms hors `NOMS` : un seul bloc UTF-8, noms séparés par \0
+    table = "\0".join(extras).encode("utf-8")
+    morceaux.append(COMPTE.pack(len(extras)))
+    morceaux.append(TAILLE_TABLE.pack(len(table)))
+    morceaux.append(table)
+    return b"".join(morceaux)
+
+
+def _decoder_v4(donnees, pos):
+    try:
+        (credits, appats, dechets, capacite, photos,
+         drapeaux, generation) = FIXES.unpack_from(donnees, pos)
+        pos += FIXES.size
+        listes = []
+        for _ in range(2):
+            (n,) = COMPTE.unpack_from(donnees, pos)
+            pos += COMPTE.size
+            listes.append(struct.unpack_from(f"<{n}H", donnees, pos))
+            pos += 2 * n
+        (n,) = COMPTE.unpack_from(donnees, pos)
+        pos += COMPTE.size
+        (longueur,) = TAILLE_TABLE.unpack_from(donnees, pos)
+        pos += TAILLE_TABLE.size
+        noms = NOMS
+        if n:
+            extras = donnees[pos:pos + longueur].decode("utf-8").split("\0")
+            if len(extras) != n:
+                raise SauvegardeInvalide("table des noms incohérente")
+            noms = NOMS + tuple(extras)
+        encyclopedie = [noms[i] for i in listes[0]]
+        badges       = [noms[i] for i in listes[1]]
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise SauvegardeInvalide(f"sauvegarde tronquée ou corrompue : {e}") from e
+    return {
+        "credits":          credits,
+        "appats_restants":  appats,
+        "encyclopedie":     encyclopedie,
+        "badges":           badges,
+        "dechets_ramasses": dechets,
+        "capacite_sd":      capacite,
+        "photos_sd":        photos,
+        "pnj_rencontre":    bool(drapeaux & DRAPEAU_PNJ_RENCONTRE),
+        "appat_pnj_donne":  bool(drapeaux & DRAPEAU_APPAT_DONNE),
+        "generation":       generation,
+    }
+
+
+DECODEURS = {4: _decoder_v4}
+
+
+def decoder(donnees):
+    """Décode des octets (toute version binaire connue) vers le format courant."""
+    if len(donnees) < ENTETE.size:
+        raise SauvegardeInvalide("fichier trop court")
+    magic, version = ENTETE.unpack_from(donnees, 0)
+    if magic != MAGIC:
+        raise SauvegardeInvalide("ce n'est pas une sauvegarde FAUNEX")
+    if version not in DECODEURS:
+        raise SauvegardeInvalide(f"version {version} inconnue (jeu trop ancien ?)")
+    return DECODEURS[version](donnees, ENTETE.size)
+
+
+# ─────────────────────────────────────────────────────────────
+# Migrations des sauvegardes JSON
+# ─────────────────────────────────────────────────────────────
+
+def sans_accents(nom):
+    decompose = unicodedata.normalize("NFKD", nom)
+    return "".join(c for c in decompose if not unicodedata.combining(c))
+
+
+def _sans_doublons(noms):
+    return list(dict.fromkeys(noms))
+
+
+def _v1_vers_v2(donnees):
+    # main.py : champs facultatifs (chaîne de `if cle in donnees`)
+    return {
+        "credits":          donnees.get("credits",          50),
+        "appats_restants":  donnees.get("appats_restants",  2),
+        "encyclopedie":     donnees.get("encyclopedie",     []),
+        "badges":           donnees.get("badges",           []),
+        "dechets_ramasses": donnees.get("dechets_ramasses", 0),
+        "capacite_sd":      donnees.get("capacite_sd",      5),
+        "photos_sd":        donnees.get("photos_sd",        0),
+        "pnj_rencontre":    donnees.get("pnj_rencontre",    False),
+        "appat_pnj_donne":  False,
+    }
+
+
+def _v2_vers_v3(donnees):
+    # Les noms accentués ("Panthère", "Photographe Débutant") de main.py
+    # subsistent aussi dans des sauvegardes v2 : ils sont normalisés ici
+    donnees = dict(donnees)
+    donnees["encyclopedie"] = _sans_doublons(sans_accents(n) for n in donnees["encyclopedie"])
+    donnees["badges"]       = _sans_doublons(sans_accents(n) for n in donnees["badges"])
+    donnees["generation"]   = 0
+    return donnees
+
+
+MIGRATIONS_JSON = {1: _v1_vers_v2, 2: _v2_vers_v3}
+
+
+def version_json(donnees):
+    if "generation" in donnees:
+        return 3
+    if "appat_pnj_donne" in donnees:
+        return 2
+    return 1
+
+
+def migrer_json(donnees):
+    """Amène une sauvegarde JSON (v1 à v3) au format courant."""
+    version = version_json(donnees)
+    while version in MIGRATIONS_JSON:
+        donnees = MIGRATIONS_JSON[version](donnees)
+        version += 1
+    return donnees
+
+
+# ─────────────────────────────────────────────────────────────
+# Lecture depuis le disque
+# ─────────────────────────────────────────────────────────────
+
+def lire_binaire(chemin):
+    """Lit une sauvegarde binaire encadrée ; en cas d'échec, la génération valide la plus récente."""
+    return lire_generations(chemin, decoder, (SauvegardeInvalide,))
+
+
+def lire_ancienne(ancien_json):
+    """Reprise d'une ancienne sauvegarde JSON (None si absente ou illisible)."""
+    donnees = lire_json(ancien_json)
+    return migrer_json(donnees) if donnees is not None else None
+
+
+def lire_sauvegarde(chemin, ancien_json=None):
+    """Sauvegarde binaire si elle existe, sinon reprise de l'ancienne sauvegarde JSON."""
+    etat = lire_binaire(chemin)
+    if etat is None and ancien_json is not None:
+        etat = lire_ancienne(ancien_json)
+    return etat
+
+
+# ─────────────────────────────────────────────────────────────
+# Outils en ligne de commande
+# ─────────────────────────────────────────────────────────────
+
+def _etat_exemple(nb_especes):
+    especes = list(ESPECES) + [f"Espece {i:05d}" for i in range(max(0, nb_especes - len(ESPECES)))]
+    return {
+        "credits": 1371, "appats_restants": 11,
+        "encyclopedie": especes[:nb_especes], "badges": list(BADGES),
+        "dechets_ramasses": 7, "capacite_sd": 50, "photos_sd": 28,
+        "pnj_rencontre": True, "appat_pnj_donne": False, "generation": 12,
+    }
+
+
+def _chronometrer(fonction, argument, iterations):
+    debut = time.perf_counter()
+    for _ in range(iterations):
+        fonction(argument)
+    return (time.perf_counter() - debut) / iterations * 1e6
+
+
+def bench(nb_especes, iterations):
+    etat = _etat_exemple(nb_especes)
+    octets_json = encoder_json(etat)
+    octets_bin  = encoder(etat)
+    assert decoder(octets_bin) == etat
+
+    lignes = [
+        ("JSON",    len(octets_json),
+         _chronometrer(encoder_json, etat, iterations),
+         _chronometrer(json.loads, octets_json, iterations)),
+        ("Binaire", len(octets_bin),
+         _chronometrer(encoder, etat, iterations),
+         _chronometrer(decoder, octets_bin, iterations)),
+    ]
+    print(f"📦 Encyclopédie : {len(etat['encyclopedie'])} espèces, {iterations} itérations")
+    print(f"{'Format':<8} {'Taille':>10} {'Écriture':>12} {'Lecture':>12}")
+    for nom, taille, ecriture, lecture in lignes:
+        print(f"{nom:<8} {taille:>8} o {ecriture:>9.1f} µs {lecture:>9.1f} µs")
+    (_, t_json, e_json, l_json), (_, t_bin, e_bin, l_bin) = lignes
+    print(f"Gain     {t_json / t_bin:>9.1f}x {e_json / e_bin:>11.1f}x {l_json / l_bin:>11.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Format binaire des sauvegardes FAUNEX")
+    sous = parser.add_subparsers(dest="commande", required=True)
+
+    p_bench = sous.add_parser("bench", help="Compare les formats JSON et binaire")
+    p_bench.add_argument("--especes", "-e", type=int, default=len(ESPECES),
+                         help="Taille de l'encyclopédie simulée (défaut : toutes les espèces du jeu)")
+    p_bench.add_argument("--iterations", "-n", type=int, default=2000,
+                         help="Nombre de répétitions par mesure (défaut : 2000)")
+
+    p_migrer = sous.add_parser("migrer", help="Convertit une sauvegarde JSON en binaire")
+    p_migrer.add_argument("source", type=str, help="Sauvegarde JSON (toute version)")
+    p_migrer.add_argument("destination", type=str, help="Fichier binaire à écrire")
+    args = parser.parse_args()
+
+    if args.commande == "bench":
+        bench(args.especes, args.iterations)
+        return
+
+    donnees = lire_json(args.source)
+    if donnees is None:
+        print(f"✗ Sauvegarde illisible : {args.source}")
+        sys.exit(1)
+    version = version_json(donnees)
+    octets = encoder(migrer_json(donnees))
+    Path(args.destination).write_bytes(encadrer(octets))
+    print(f"✅ v{version} → v{VERSION_BINAIRE} : {args.destination} ({len(octets)} o)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Test de robustesse des sauvegardes FAUNEX
+-----------------------------------------
+Construit un historique de sauvegarde réel (instantanés binaires encadrés,
+générations de secours et journaux) dans un dossier temporaire, puis, à
+chaque itération, endommage un fichier au hasard (troncature, bit inversé,
+bloc mis à zéro, suppression) avant de recharger.
+
+Le chargement ne doit jamais lever d'exception et doit toujours rendre un
+état réellement atteint pendant l'historique (un préfixe de la suite des
+mutations). Seul le journal de la génération courante peut faire perdre
+des mutations : un instantané, une génération de secours ou un journal
+plus ancien endommagé doit redonner l'état final.
+
+Usage :
+    python fuzz_sauvegarde.py --verifier          # vérification rapide (graine fixe)
+    python fuzz_sauvegarde.py --iterations 2000 --graine 42
+
+Code de sortie 1 au premier échec constaté (à lancer avant un commit qui
+touche sauvegarde.py ou format_sauvegarde.py).
+"""
+
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+from sauvegarde import JournalSauvegarde, REINITIALISATION, appliquer, copier_etat
+from format_sauvegarde import ESPECES, BADGES, decoder, encoder
+
+
+ETAT_INITIAL = {
+    "credits": 50, "appats_restants": 2, "encyclopedie": [], "badges": [],
+    "dechets_ramasses": 0, "pnj_rencontre": False, "appat_pnj_donne": False,
+    "capacite_sd": 5, "photos_sd": 0,
+}
+NOM_SAUVEGARDE = "sauvegarde_faunex.sav"
+ALTERATIONS    = ("tronquer", "inverser_bit", "zero", "supprimer")
+
+# --verifier : rapide et reproductible
+VERIFICATION_ITERATIONS = 300
+VERIFICATION_GRAINE     = 2026
+
+
+def _mutation(rng):
+    tirage = rng.random()
+    if tirage < 0.30:
+        return ["credits", rng.randint(-20, 60)]
+    if tirage < 0.55:
+        # Quelques noms hors de la table internée pour couvrir la table de chaînes
+        return ["encyclopedie", rng.choice(ESPECES + ("Espece inconnue", "Dodo"))]
+    if tirage < 0.65:
+        return ["badges", rng.choice(BADGES)]
+    if tirage < 0.80:
+        return ["photos_sd", rng.randint(0, 50)]
+    if tirage < 0.90:
+        return ["dechets_ramasses", 1]
+    if tirage < 0.98:
+        return ["pnj_rencontre", rng.random() < 0.5]
+    return [REINITIALISATION]
+
+
+def _ouvrir(dossier, seuil):
+    return JournalSauvegarde(dossier / NOM_SAUVEGARDE, ETAT_INITIAL, seuil,
+                             decodeur=decoder, encodeur=encoder)
+
+
+def construire_historique(dossier, rng, nb_lots, seuil):
+    """Écrit l'historique sur disque. Retourne la liste des états atteints (préfixes)."""
+    journal = _ouvrir(dossier, seuil)
+    journal.charger()
+    etat = copier_etat(ETAT_INITIAL)
+    prefixes = [copier_etat(etat)]
+    for _ in range(nb_lots):
+        lot = [_mutation(rng) for _ in range(rng.randint(1, 3))]
+        journal.enregistrer(lot)
+        for m in lot:
+            appliquer(etat, m, ETAT_INITIAL)
+            prefixes.append(copier_etat(etat))
+    journal.fermer(compacter=False)
+    if journal.erreur is not None:
+        raise journal.erreur
+    return prefixes
+
+
+def alterer(chemin, rng):
+    """Endommage `chemin` ; retourne la description de l'altération."""
+    octets = bytearray(chemin.read_bytes())
+    alteration = rng.choice(ALTERATIONS)
+    if alteration == "supprimer" or not octets:
+        chemin.unlink()
+        return "supprimer"
+    position = rng.randrange(len(octets))
+    if alteration == "tronquer":
+        del octets[position:]
+    elif alteration == "inverser_bit":
+        octets[position] ^= 1 << rng.randrange(8)
+    else:
+        octets[position:position + 16] = bytes(len(octets[position:position + 16]))
+    chemin.write_bytes(bytes(octets))
+    return f"{alteration}@{position}"
+
+
+def fuzz(iterations, graine, nb_lots, seuil):
+    rng = random.Random(graine)
+    racine = Path(tempfile.mkdtemp(prefix="faunex_fuzz_"))
+    try:
+        original = racine / "original"
+        original.mkdir()
+        prefixes = construire_historique(original, rng, nb_lots, seuil)
+        fichiers = sorted(p.name for p in original.iterdir())
+        # Le seul fichier dont l'altération peut légitimement faire perdre des mutations
+        dernier_journal = max(_ouvrir(original, seuil)._journaux())[1].name
+        final = prefixes[-1]
+        # Les états atteints, sans tenir compte de l'ordre des listes
+        atteints = [{k: sorted(v) if isinstance(v, list) else v for k, v in e.items()}
+                    for e in prefixes]
+
+        print(f"🧪 Historique : {len(prefixes) - 1} mutations, fichiers : {', '.join(fichiers)}")
+        sans_perte, repli, echecs = 0, 0, []
+        for i in range(iterations):
+            essai = racine / f"essai_{i}"
+            shutil.copytree(original, essai)
+            cible = essai / rng.choice(fichiers)
+            alteration = alterer(cible, rng)
+            try:
+                journal = _ouvrir(essai, seuil)
+                etat = journal.charger() or copier_etat(ETAT_INITIAL)
+                journal.fermer(compacter=False)
+                if journal.erreur is not None:
+                    raise journal.erreur
+                # La compaction de reprise doit redonner exactement le même état
+                relu = _ouvrir(essai, seuil)
+                etat_relu = relu.charger() or copier_etat(ETAT_INITIAL)
+                relu.fermer(compacter=False)
+            except Exception as e:
+                echecs.append(f"{cible.name} {alteration} : exception {e!r}")
+                continue
+            finally:
+                shutil.rmtree(essai, ignore_errors=True)
+
+            normalise = {k: sorted(v) if isinstance(v, list) else v for k, v in etat.items()}
+            if normalise not in atteints:
+                echecs.append(f"{cible.name} {alteration} : état jamais atteint")
+            elif etat_relu != etat:
+                echecs.append(f"{cible.name} {alteration} : état différent après reprise")
+            elif etat == final:
+                sans_perte += 1
+            elif cible.name != dernier_journal:
+                echecs.append(f"{cible.name} {alteration} : perte sans dommage du dernier journal")
+            else:
+                repli += 1
+    finally:
+        shutil.rmtree(racine, ignore_errors=True)
+
+    print(f"   Itérations         : {iterations} (graine {graine})")
+    print(f"   Sans perte         : {sans_perte}")
+    print(f"   Repli sur un état antérieur : {repli}")
+    print(f"   Échecs             : {len(echecs)}")
+    for echec in echecs[:20]:
+        print(f"   ❌ {echec}")
+    if echecs:
+        return False
+    print("✅ Chaque chargement a rendu un état réellement atteint")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de robustesse des sauvegardes FAUNEX")
+    parser.add_argument("--iterations", "-n", type=int, default=1000,
+                        help="Nombre de fichiers endommagés puis rechargés (défaut : 1000)")
+    parser.add_argument("--graine", "-g", type=int, default=0,
+                        help="Graine aléatoire, pour rejouer un échec (défaut : 0)")
+    parser.add_argument("--lots", type=int, default=40,
+                        help="Autosauvegardes dans l'historique (défaut : 40)")
+    parser.add_argument("--seuil", type=int, default=12,
+                        help="Enregistrements avant compaction (défaut : 12)")
+    parser.add_argument("--verifier", action="store_true",
+                        help=f"Vérification rapide : {VERIFICATION_ITERATIONS} itérations, "
+                             f"graine {VERIFICATION_GRAINE} (ignore -n et -g)")
+    args = parser.parse_args()
+    if args.verifier:
+        args.iterations, args.graine = VERIFICATION_ITERATIONS, VERIFICATION_GRAINE
+    sys.exit(0 if fuzz(args.iterations, args.graine, args.lots, args.seuil) else 1)
+
+
+if __name__ == "__main__":
+    main()
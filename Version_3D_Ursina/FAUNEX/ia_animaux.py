@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+IA des animaux FAUNEX
+---------------------
+Comportements des animaux (`fuit`, `curieux`, `sommeil`, vol des animaux
+placés au-dessus de HAUTEUR_VOL, attraction par les appâts) et
+ordonnanceur qui espace les mises à jour selon le niveau de détail.
+
+Le comportement est un mixin : `Animal` du jeu l'ajoute à `Entity`, le
+banc d'essai l'ajoute à une `Entity` sans modèle. Le code mesuré est donc
+exactement celui du jeu, sans fenêtre (`Ursina(window_type='none')`).
+
+Usage (banc d'essai de montée en charge) :
+    python ia_animaux.py bench --sortie bench_ia.json
+    python ia_animaux.py bench --reference bench_ia_reference.json
+    python ia_animaux.py comparer bench_ia_reference.json bench_ia.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from math import sin
+from pathlib import Path
+
+from panda3d.core import ClockObject
+from ursina import Vec3, destroy
+
+
+VITESSE_ANIMAL          = 2
+DIST_ATTRACTION_APPAT   = 20
+DIST_CONSOMMATION_APPAT = 1.5
+DIST_FUITE              = 15      # le joueur fait fuir les animaux `fuit` en deçà
+DIST_CURIOSITE          = 25      # les animaux `curieux` le suivent du regard en deçà
+FACTEUR_FUITE           = 3
+HAUTEUR_VOL             = 1.5     # base_y au-dessus de laquelle l'animal vole
+
+COMPORTEMENTS = ("fuit", "curieux", "sommeil")
+
+# Temps de frame Panda3D plutôt que time.time() : à pas fixe pendant un rejeu
+_HORLOGE = ClockObject.getGlobalClock()
+
+
+def distance_2d(a, b):
+    return ((a[0] - b[0]) ** 2 + (a[2] - b[2]) ** 2) ** 0.5
+
+
+class ComportementAnimal:
+    """
+    Mixin d'IA pour une Entity portant `comportement`, `base_y` et
+    `rotation_offset`.
+    """
+
+    # appats est passé directement — plus de filtrage coûteux à chaque frame
+    def mettre_a_jour_ia(self, joueur, entites, appats, dt):
+        # Animation de vol
+        if self.base_y > HAUTEUR_VOL:
+            self.y = self.base_y + sin(_HORLOGE.getFrameTime() * 2 + self.x) * 1.5
+
+        if self.comportement == 'sommeil':
+            return
+
+        move_dir = None
+        speed    = VITESSE_ANIMAL
+
+        # Attraction vers les appâts (liste pré-filtrée)
+        if appats:
+            le_plus_proche  = min(appats, key=lambda b: distance_2d(self.position, b.position))
+            dist_vers_appat = distance_2d(self.position, le_plus_proche.position)
+
+            if dist_vers_appat < DIST_ATTRACTION_APPAT:
+                move_dir = Vec3(
+                    le_plus_proche.x - self.x, 0,
+                    le_plus_proche.z - self.z
+                ).normalized()
+
+                if dist_vers_appat < DIST_CONSOMMATION_APPAT:
+                    entites.remove(le_plus_proche)
+                    appats.remove(le_plus_proche)  # retirer des deux listes
+                    destroy(le_plus_proche)
+
+        # Interaction joueur
+        dist_vers_joueur = distance_2d(self.position, joueur.position)
+
+        if self.comportement == 'fuit' and dist_vers_joueur < DIST_FUITE:
+            move_dir = Vec3(self.x - joueur.x, 0, self.z - joueur.z).normalized()
+            speed   *= FACTEUR_FUITE
+        elif self.comportement == 'curieux' and dist_vers_joueur < DIST_CURIOSITE:
+            self.look_at(Vec3(joueur.x, self.y, joueur.z))
+
+        # Déplacement + orientation
+        if move_dir:
+            self.look_at(self.position + move_dir)
+            self.rotation_y = (self.rotation_y + self.rotation_offset) % 360
+            self.position  += move_dir * dt * speed
+
+
+class OrdonnanceurIA:
+    def __init__(self, periodes):
+        self.periodes = periodes     # une mise à jour toutes les N frames, par niveau de détail
+        self._trame   = 0
+
+    def executer(self, animaux, joueur, entites, appats, dt):
+        self._trame += 1
+        periodes = self.periodes
+        for i, animal in enumerate(animaux):
+            animal.dt_ia += dt
+            # Décalage par indice : les animaux lointains ne tombent pas tous sur la même frame
+            if (self._trame + i) % periodes[animal.niveau_detail] == 0:
+                animal.mettre_a_jour_ia(joueur, entites, appats, animal.dt_ia)
+                animal.dt_ia = 0.0
+
+
+# ─────────────────────────────────────────────────────────────
+# Banc d'essai sans affichage
+# ─────────────────────────────────────────────────────────────
+
+NB_ANIMAUX    = (21, 100, 1000, 10000)
+NB_APPATS     = (0, 5, 50)
+DEMI_COTE     = 150                   # monde de 300 x 300, comme le terrain du jeu
+TOLERANCE     = 0.15                  # écart relatif toléré avant de signaler une régression
+VERSION_BENCH = 1
+
+
+def _scenario(nb_animaux, nb_appats, ticks, graine, dt):
+    from ursina import Entity
+
+    class AnimalBench(ComportementAnimal, Entity):
+        pass
+
+    rng     = random.Random(graine)
+    joueur  = Entity(position=(0, 2, 0))
+    animaux = []
+    for i in range(nb_animaux):
+        volant = i % 4 == 3
+        a = AnimalBench(position=(rng.uniform(-DEMI_COTE, DEMI_COTE),
+                                  rng.uniform(3, 8) if volant else 1,
+                                  rng.uniform(-DEMI_COTE, DEMI_COTE)))
+        a.comportement    = COMPORTEMENTS[i % len(COMPORTEMENTS)]
+        a.base_y          = a.y
+        a.rotation_offset = 0
+        a.niveau_detail   = 0            # pire cas : tous les animaux à chaque tick
+        a.dt_ia           = 0.0
+        animaux.append(a)
+    # Appâts posés près du joueur, comme en jeu
+    appats = [Entity(position=(rng.uniform(-30, 30), 0.2, rng.uniform(-30, 30)))
+              for _ in range(nb_appats)]
+    entites = list(appats)
+
+    ordonnanceur = OrdonnanceurIA((1,))
+    ordonnanceur.executer(animaux, joueur, entites, appats, dt)   # échauffement
+    mesures = []
+    for _ in range(ticks):
+        debut = time.perf_counter()
+        ordonnanceur.executer(animaux, joueur, entites, appats, dt)
+        mesures.append(time.perf_counter() - debut)
+    restants = len(appats)
+
+    for e in animaux + appats + [joueur]:
+        destroy(e)
+
+    mesures.sort()
+    p50 = mesures[len(mesures) // 2]
+    return {
+        "nom":                f"{nb_animaux}a_{nb_appats}p",
+        "animaux":            nb_animaux,
+        "appats":             nb_appats,
+        "appats_consommes":   nb_appats - restants,
+        "ticks":              ticks,
+        "ms_tick_p50":        round(p50 * 1e3, 4),
+        "us_tick_animal_p50": round(p50 * 1e6 / nb_animaux, 4),
+        "us_tick_animal_moy": round(sum(mesures) * 1e6 / len(mesures) / nb_animaux, 4),
+    }
+
+
+def bench(tailles, nb_appats, ticks, graine):
+    from ursina import Ursina
+
+    Ursina(window_type='none')
+    dt = 1 / 60
+    print(f"🦊 IA des animaux : {ticks} ticks par scénario, graine {graine}")
+    print(f"   {'scénario':<12}{'ms/tick':>10}{'µs/animal':>12}{'appâts mangés':>16}")
+    scenarios = []
+    for n in tailles:
+        for p in nb_appats:
+            s = _scenario(n, p, ticks, graine, dt)
+            scenarios.append(s)
+            print(f"   {s['nom']:<12}{s['ms_tick_p50']:>10.3f}{s['us_tick_animal_p50']:>12.2f}"
+                  f"{s['appats_consommes']:>16}")
+    return {
+        "version":   VERSION_BENCH,
+        "date":      time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python":    platform.python_version(),
+        "machine":   platform.machine(),
+        "ticks":     ticks,
+        "graine":    graine,
+        "scenarios": scenarios,
+    }
+
+
+def comparer(reference, resultat, tolerance):
+    """Affiche l'écart par scénario ; retourne False si un scénario a régressé."""
+    references = {s["nom"]: s for s in reference["scenarios"]}
+    regressions = 0
+    print(f"📊 Comparaison à la référence du {reference.get('date', '?')} "
+          f"(tolérance {tolerance:.0%})")
+    for s in resultat["scenarios"]:
+        ref = references.pop(s["nom"], None)
+        if ref is None:
+            print(f"   ⚠️  {s['nom']:<12} absent de la référence")
+            continue
+        avant, apres = ref["us_tick_animal_p50"], s["us_tick_animal_p50"]
+        ecart = (apres - avant) / avant if avant else 0.0
+        ligne = f"{s['nom']:<12}{avant:>10.2f} → {apres:<10.2f}µs  {ecart:+.0%}"
+        if ecart > tolerance:
+            regressions += 1
+            print(f"   ❌ {ligne}  régression")
+        elif ecart < -tolerance:
+            print(f"   🚀 {ligne}")
+        else:
+            print(f"   ✅ {ligne}")
+    for nom in references:
+        print(f"   ⚠️  {nom:<12} absent du résultat")
+    if regressions:
+        print(f"❌ {regressions} scénario(s) en régression")
+        return False
+    print("✅ Aucune régression")
+    return True
+
+
+def _lire(chemin):
+    donnees = json.loads(Path(chemin).read_text(encoding="utf-8"))
+    if donnees.get("version") != VERSION_BENCH:
+        raise ValueError(f"{chemin} : version de banc d'essai {donnees.get('version')!r} inconnue")
+    return donnees
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IA des animaux FAUNEX")
+    sous = parser.add_subparsers(dest="commande", required=True)
+
+    p_bench = sous.add_parser("bench", help="Mesure le coût de l'IA selon le nombre d'animaux")
+    p_bench.add_argument("--animaux", "-a", type=int, nargs="+", default=list(NB_ANIMAUX),
+                         help="Nombres d'animaux (défaut : 21 100 1000 10000)")
+    p_bench.add_argument("--appats", "-p", type=int, nargs="+", default=list(NB_APPATS),
+                         help="Nombres d'appâts posés (défaut : 0 5 50)")
+    p_bench.add_argument("--ticks", "-n", type=int, default=30,
+                         help="Ticks mesurés par scénario (défaut : 30)")
+    p_bench.add_argument("--graine", "-g", type=int, default=0,
+                         help="Graine de placement (défaut : 0)")
+    p_bench.add_argument("--sortie", "-o", type=str, default=None,
+                         help="Fichier JSON des résultats")
+    p_bench.add_argument("--reference", "-r", type=str, default=None,
+                         help="Résultats de référence à comparer")
+    p_bench.add_argument("--tolerance", "-t", type=float, default=TOLERANCE,
+                         help=f"Écart relatif toléré (défaut : {TOLERANCE})")
+
+    p_comp = sous.add_parser("comparer", help="Compare deux fichiers de résultats")
+    p_comp.add_argument("reference", type=str, help="Résultats de référence")
+    p_comp.add_argument("resultat", type=str, help="Résultats à vérifier")
+    p_comp.add_argument("--tolerance", "-t", type=float, default=TOLERANCE,
+                        help=f"Écart relatif toléré (défaut : {TOLERANCE})")
+    args = parser.parse_args()
+
+    try:
+        if args.commande == "comparer":
+            ok = comparer(_lire(args.reference), _lire(args.resultat), args.tolerance)
+            sys.exit(0 if ok else 1)
+
+        reference = _lire(args.reference) if args.reference else None
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+
+    resultat = bench(args.animaux, args.appats, args.ticks, args.graine)
+    if args.sortie:
+        Path(args.sortie).write_text(json.dumps(resultat, ensure_ascii=False, indent=4),
+                                     encoding="utf-8")
+        print(f"✅ Résultats écrits dans {args.sortie}")
+    if reference is not None:
+        sys.exit(0 if comparer(reference, resultat, args.tolerance) else 1)
+
+
+if __name__ == "__main__":
+    main()
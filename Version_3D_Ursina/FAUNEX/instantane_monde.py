@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Instantané du monde FAUNEX
+--------------------------
+La sauvegarde (`sauvegarde.py`) ne conserve que la progression. Ce module
+capture l'état de la simulation : transformations du joueur et des
+animaux, état IA, objets posés ou restant à ramasser (appâts, déchets),
+appâts encore en poche (ils vont avec ceux posés) et état du générateur
+aléatoire global.
+
+Tout est rangé dans des tableaux typés (`array`) écrits bout à bout :
+capture et restauration se font en une seule passe sur chaque tableau,
+sans objet Python intermédiaire par entité. Les transformations sont lues
+et écrites directement sur les NodePath (getPos/getHpr/setPosHpr).
+
+Usage (mesure des temps de capture / restauration) :
+    python instantane_monde.py bench --entites 10000
+"""
+
+import argparse
+import random
+import struct
+import time
+from array import array
+
+
+MAGIC   = b"FXMD"
+VERSION = 2       # 2 : appâts restants en fin d'instantané
+
+# magic, version, nb_animaux, nb_objets, trame_ia
+ENTETE = struct.Struct("<4sBIII")
+# version du générateur, gauss_next (NaN si absent)
+ENTETE_RNG = struct.Struct("<Id")
+
+CHAMPS_JOUEUR = 9      # x, y, z, h, p, r du corps + h, p, r du pivot caméra
+CHAMPS_ANIMAL = 7      # x, y, z, h, p, r, dt_ia
+CHAMPS_OBJET  = 3      # x, y, z
+
+# Codes des objets du monde
+OBJET_DECHET = 0
+OBJET_APPAT  = 1
+
+
+class InstantaneInvalide(ValueError):
+    pass
+
+
+def _tableau(code, valeurs=()):
+    t = array(code, valeurs)
+    # Format disque petit-boutiste, quelle que soit la machine
+    if struct.pack("=H", 1) != struct.pack("<H", 1):
+        t.byteswap()
+    return t
+
+
+def _lire_tableau(code, donnees, pos, nombre):
+    t = array(code)
+    fin = pos + nombre * t.itemsize
+    if fin > len(donnees):
+        raise InstantaneInvalide("instantané tronqué")
+    t.frombytes(donnees[pos:fin])
+    if struct.pack("=H", 1) != struct.pack("<H", 1):
+        t.byteswap()
+    return t, fin
+
+
+# ─────────────────────────────────────────────────────────────
+# Capture
+# ─────────────────────────────────────────────────────────────
+
+def capturer(joueur, pivot, animaux, objets, trame_ia=0, appats=0):
+    """
+    Encode le monde en octets.
+
+    - `joueur`, `pivot` : NodePath du joueur et du pivot de caméra
+    - `animaux`         : entités dans un ordre stable (celui de la création)
+    - `objets`          : liste de (code, ident, NodePath) — appâts, déchets
+    - `appats`          : appâts restants du joueur
+    """
+    j = joueur.getPos(), joueur.getHpr(), pivot.getHpr()
+    transformations_joueur = _tableau("f", (*j[0], *j[1], *j[2]))
+
+    plat = []
+    ajouter = plat.extend
+    for a in animaux:
+        ajouter(a.getPos())
+        ajouter(a.getHpr())
+        plat.append(a.dt_ia)
+    transformations = _tableau("f", plat)
+    decouverts      = _tableau("B", [a.decouvert for a in animaux])
+
+    codes       = _tableau("B", [code for code, _, _ in objets])
+    idents      = _tableau("I", [ident for _, ident, _ in objets])
+    positions   = []
+    for _, _, entite in objets:
+        positions.extend(entite.getPos())
+    positions   = _tableau("f", positions)
+
+    version_rng, etat_rng, gauss = random.getstate()
+    rng = _tableau("I", etat_rng)
+
+    return b"".join((
+        ENTETE.pack(MAGIC, VERSION, len(animaux), len(objets), trame_ia),
+        transformations_joueur.tobytes(),
+        transformations.tobytes(),
+        decouverts.tobytes(),
+        codes.tobytes(),
+        idents.tobytes(),
+        positions.tobytes(),
+        ENTETE_RNG.pack(version_rng, float("nan") if gauss is None else gauss),
+        struct.pack("<H", len(rng)),
+        rng.tobytes(),
+        struct.pack("<I", appats),
+    ))
+
+
+# ─────────────────────────────────────────────────────────────
+# Restauration
+# ─────────────────────────────────────────────────────────────
+
+def decoder(donnees):
+    """Octets -> dictionnaire de tableaux (aucun effet sur le monde)."""
+    if len(donnees) < ENTETE.size:
+        raise InstantaneInvalide("instantané trop court")
+    magic, version, nb_animaux, nb_objets, trame_ia = ENTETE.unpack_from(donnees, 0)
+    if magic != MAGIC:
+        raise InstantaneInvalide("ce n'est pas un instantané du monde FAUNEX")
+    if version not in (1, VERSION):
+        raise InstantaneInvalide(f"version {version} inconnue")
+
+    pos = ENTETE.size
+    joueur,          pos = _lire_tableau("f", donnees, pos, CHAMPS_JOUEUR)
+    transformations, pos = _lire_tableau("f", donnees, pos, nb_animaux * CHAMPS_ANIMAL)
+    decouverts,      pos = _lire_tableau("B", donnees, pos, nb_animaux)
+    codes,           pos = _lire_tableau("B", donnees, pos, nb_objets)
+    idents,          pos = _lire_tableau("I", donnees, pos, nb_objets)
+    positions,       pos = _lire_tableau("f", donnees, pos, nb_objets * CHAMPS_OBJET)
+    try:
+        version_rng, gauss = ENTETE_RNG.unpack_from(donnees, pos)
+        (taille_rng,) = struct.unpack_from("<H", donnees, pos + ENTETE_RNG.size)
+    except struct.error as e:
+        raise InstantaneInvalide("instantané tronqué") from e
+    rng, pos = _lire_tableau("I", donnees, pos + ENTETE_RNG.size + 2, taille_rng)
+    appats = None     # version 1 : compteur non sauvegardé
+    if version >= 2:
+        (appats,), pos = _lire_tableau("I", donnees, pos, 1)
+
+    return {
+        "trame_ia":        trame_ia,
+        "joueur":          joueur,
+        "transformations": transformations,
+        "decouverts":      decouverts,
+        "objets":          [
+            (codes[i], idents[i], tuple(positions[3 * i:3 * i + 3])) for i in range(nb_objets)
+        ],
+        "rng":             (version_rng, tuple(rng), None if gauss != gauss else gauss),
+        "appats":          appats,
+    }
+
+
+def restaurer(donnees, joueur, pivot, animaux):
+    """
+    Replace joueur et animaux en une passe et rétablit l'aléatoire global.
+    `donnees` : octets, ou dictionnaire déjà produit par `decoder` (au
+    chargement, la validation a déjà décodé l'instantané).
+
+    Retourne (objets, trame_ia, appats) : les objets [(code, ident, (x, y, z))]
+    sont à recréer par le jeu, qui seul connaît leurs classes ; `appats` est
+    None pour un instantané de version 1.
+    """
+    etat = donnees if isinstance(donnees, dict) else decoder(donnees)
+    j = etat["joueur"]
+    joueur.setPosHpr(j[0], j[1], j[2], j[3], j[4], j[5])
+    pivot.setHpr(j[6], j[7], j[8])
+
+    t = etat["transformations"]
+    d = etat["decouverts"]
+    # Colonnes extraites par tranches (en C) puis une seule boucle sur les animaux ;
+    # zip s'arrête au plus court si des animaux ont été ajoutés/retirés depuis
+    colonnes = [t[k::CHAMPS_ANIMAL] for k in range(CHAMPS_ANIMAL)]
+    for a, x, y, z, h, p, r, dt_ia, decouvert in zip(animaux, *colonnes, d):
+        a.setPosHpr(x, y, z, h, p, r)
+        a.dt_ia     = dt_ia
+        a.decouvert = decouvert == 1
+
+    random.setstate(etat["rng"])
+    return etat["objets"], etat["trame_ia"], etat["appats"]
+
+
+# ─────────────────────────────────────────────────────────────
+# Mesure
+# ─────────────────────────────────────────────────────────────
+
+def bench(nb_entites, iterations):
+    from panda3d.core import NodePath
+
+    class Noeud(NodePath):   # comme Entity : un NodePath qui accepte des attributs
+        pass
+
+    racine  = NodePath("monde")
+    joueur  = racine.attachNewNode("joueur")
+    pivot   = joueur.attachNewNode("pivot")
+    animaux = []
+    for i in range(nb_entites):
+        a = Noeud(racine.attachNewNode(f"animal_{i}"))
+        a.setPosHpr(random.uniform(-150, 150), 1, random.uniform(-150, 150), random.uniform(0, 360), 0, 0)
+        a.dt_ia, a.decouvert = 0.0, i % 3 == 0
+        animaux.append(a)
+    objets = [(OBJET_DECHET, i, racine.attachNewNode(f"dechet_{i}")) for i in range(3)]
+
+    debut = time.perf_counter()
+    for _ in range(iterations):
+        blob = capturer(joueur, pivot, animaux, objets)
+    t_capture = (time.perf_counter() - debut) / iterations * 1000
+
+    debut = time.perf_counter()
+    for _ in range(iterations):
+        restaurer(blob, joueur, pivot, animaux)
+    t_restauration = (time.perf_counter() - debut) / iterations * 1000
+
+    print(f"🌍 {nb_entites} entités, {iterations} itérations")
+    print(f"   Taille        : {len(blob) / 1024:.1f} Ko")
+    print(f"   Capture       : {t_capture:.2f} ms")
+    print(f"   Restauration  : {t_restauration:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Instantané du monde FAUNEX")
+    sous = parser.add_subparsers(dest="commande", required=True)
+    p_bench = sous.add_parser("bench", help="Mesure capture et restauration")
+    p_bench.add_argument("--entites", "-e", type=int, default=10000,
+                         help="Nombre d'animaux simulés (défaut : 10000)")
+    p_bench.add_argument("--iterations", "-n", type=int, default=20,
+                         help="Nombre de répétitions (défaut : 20)")
+    args = parser.parse_args()
+    bench(args.entites, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Niveaux de détail des modèles FAUNEX
+------------------------------------
+Produit, à côté de chaque modèle, des versions simplifiées par
+décimation quadrique (trimesh + fast-simplification) :
+
+    01_red_fox.glb       →  01_red_fox_lod1.glb, 01_red_fox_lod2.glb, 01_red_fox_lod3.glb
+    09_golden_eagle.obj  →  09_golden_eagle_lod1.obj (+ .mtl), ...
+
+La source est le fichier que charge le jeu (voir charger_modele) : l'OBJ
+s'il existe, sinon le GLB. Les niveaux gardent son format, car les
+importeurs OBJ et glTF de Panda3D n'orientent pas le modèle de la même
+façon (x inversé pour l'un, z pour l'autre) : un niveau GLB d'un modèle
+chargé en OBJ apparaîtrait retourné.
+
+Chaque niveau vise une fraction des triangles de la source (FRACTIONS),
+sans descendre sous PLANCHER ; un niveau qui ne retire pas au moins
+GAIN_MIN des triangles du précédent n'est pas produit (les petits
+rochers s'arrêtent au niveau 1). La décimation ne conserve pas les
+coordonnées de texture : chaque sommet simplifié reprend celles du sommet
+source le plus proche, chaque face la couleur de la face source la plus
+proche. Les textures, embarquées dans chaque GLB, sont
+divisées par deux à chaque niveau (comme des mipmaps) : sans cela, chaque
+niveau rechargerait la texture pleine résolution du modèle.
+
+Le jeu charge les niveaux présents et choisit, par entité, celui qui
+correspond à sa taille à l'écran (voir GestionnaireDetail).
+
+Un `rapport_lod.json` par dossier donne les triangles par niveau et sert
+de manifeste : un modèle inchangé (empreinte SHA-256, MTL compris) n'est
+pas retraité.
+
+Usage :
+    python lod_modeles.py generer assets_add/3d/animals assets_add/3d/ground
+    python lod_modeles.py rapport assets_add/3d/animals assets_add/3d/ground
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from convert_glb import empreinte, rendre_obj
+from sauvegarde import ecrire_atomique
+
+
+VERSION     = 2
+FRACTIONS   = (0.5, 0.25, 0.1)     # triangles visés par niveau, relativement à la source
+PLANCHER    = 64                   # triangles minimum d'un niveau
+GAIN_MIN    = 0.25                 # réduction minimale par rapport au niveau précédent
+TEXTURE_MIN = 32                   # côté minimal (px) d'une texture réduite
+RAPPORT     = "rapport_lod.json"
+MOTIF_LOD   = re.compile(r"_lod\d+$")
+
+
+def est_lod(chemin) -> bool:
+    return MOTIF_LOD.search(Path(chemin).stem) is not None
+
+
+def chemin_lod(source: Path, niveau: int) -> Path:
+    return source.with_name(f"{source.stem}_lod{niveau}{source.suffix}")
+
+
+def sources(dossier: Path):
+    """Modèles de `dossier` dans le format que charge le jeu (OBJ, sinon GLB)."""
+    for stem in sorted({p.stem for p in dossier.glob("*.glb")} | {p.stem for p in dossier.glob("*.obj")}):
+        if est_lod(stem):
+            continue
+        if (dossier / f"{stem}.obj").exists():
+            yield dossier / f"{stem}.obj"
+        elif not (dossier / f"{stem}.fbx").exists():    # FBX : illisible par trimesh
+            yield dossier / f"{stem}.glb"
+
+
+def empreinte_source(source: Path) -> str:
+    """Empreinte du modèle ; celle d'un OBJ couvre aussi son MTL (les couleurs)."""
+    mtl = source.with_suffix(".mtl")
+    if source.suffix.lower() != ".obj" or not mtl.exists():
+        return empreinte(source)
+    return empreinte(source) + empreinte(mtl)
+
+
+# ─────────────────────────────────────────────────────────────
+# Décimation
+# ─────────────────────────────────────────────────────────────
+
+def cibles(triangles: int):
+    """Triangles visés pour les niveaux 1, 2, ... d'un modèle de `triangles` triangles."""
+    resultat, precedent = [], triangles
+    for fraction in FRACTIONS:
+        cible = max(PLANCHER, round(triangles * fraction))
+        if cible > precedent * (1 - GAIN_MIN):
+            break
+        resultat.append(cible)
+        precedent = cible
+    return resultat
+
+
+def reduire_materiau(materiau, echelle, cache):
+    """Copie de `materiau` dont les textures sont réduites d'un facteur `echelle`."""
+    copie = materiau.copy()
+    for attribut in ("image", "baseColorTexture", "normalTexture", "emissiveTexture",
+                     "metallicRoughnessTexture", "occlusionTexture"):
+        image = getattr(copie, attribut, None)
+        if image is None or not hasattr(image, "resize"):
+            continue
+        # Une texture partagée par plusieurs pièces n'est réduite (et exportée) qu'une fois
+        if id(image) not in cache:
+            # Par axe : une texture plus petite que TEXTURE_MIN n'est jamais agrandie
+            taille = tuple(min(c, max(TEXTURE_MIN, round(c * echelle))) for c in image.size)
+            if taille != tuple(image.size):
+                # Une image à palette serait réduite au plus proche voisin
+                reduite = (image.convert("RGBA") if image.mode == "P" else image).resize(taille)
+            else:
+                reduite = image
+            cache[id(image)] = reduite
+        setattr(copie, attribut, cache[id(image)])
+    return copie
+
+
+def simplifier(maillage, faces, echelle_texture=1.0, cache=None):
+    """
+    Décime `maillage` à environ `faces` triangles en gardant son apparence,
+    textures réduites d'un facteur `echelle_texture`.
+    """
+    from scipy.spatial import cKDTree
+    from trimesh.visual import ColorVisuals, TextureVisuals
+
+    visuel = maillage.visual
+    if faces >= len(maillage.faces):
+        simple, proches = maillage.copy(), None
+    else:
+        simple = maillage.simplify_quadric_decimation(face_count=faces)
+        # Attributs par sommet repris du sommet source le plus proche
+        _, proches = maillage.kdtree.query(simple.vertices)
+
+    if isinstance(visuel, TextureVisuals):
+        uv = visuel.uv if visuel.uv is None or proches is None else visuel.uv[proches]
+        materiau = visuel.material
+        if materiau is not None and echelle_texture < 1:
+            materiau = reduire_materiau(materiau, echelle_texture, {} if cache is None else cache)
+        simple.visual = TextureVisuals(uv=uv, material=materiau)
+    elif proches is not None and visuel.kind == "vertex":
+        simple.visual = ColorVisuals(simple, vertex_colors=visuel.vertex_colors[proches])
+    elif proches is not None and visuel.kind == "face":
+        # Couleur de la face source la plus proche (centres des triangles)
+        _, faces = cKDTree(maillage.triangles_center).query(simple.triangles_center)
+        simple.visual = ColorVisuals(simple, face_colors=visuel.face_colors[faces])
+    return simple
+
+
+def generer_lods(source: Path) -> dict:
+    """
+    Écrit les niveaux de `source` (processus du pool : aucun affichage).
+    Retourne {"nom", "niveaux": [{"fichier", "triangles"}], "erreur", "duree"}.
+    """
+    debut = time.perf_counter()
+    resultat = {"nom": source.name, "niveaux": [], "erreur": None, "duree": 0.0}
+    try:
+        import trimesh
+
+        scene = trimesh.load(str(source), force="scene")
+        geometries = {nom: g for nom, g in scene.geometry.items()
+                      if isinstance(g, trimesh.Trimesh)}
+        total = sum(len(g.faces) for g in geometries.values())
+        resultat["niveaux"].append({"fichier": source.name, "triangles": total})
+        produits = set()
+
+        for niveau, cible in enumerate(cibles(total), start=1):
+            lod = scene.copy()
+            ratio = cible / total
+            textures = {}    # réduites une fois pour tout le niveau
+            for nom, g in geometries.items():
+                # Répartition proportionnelle ; les petites pièces (yeux, griffes) gardent 4 triangles
+                lod.geometry[nom] = simplifier(g, max(4, round(len(g.faces) * ratio)),
+                                               0.5 ** niveau, textures)
+            chemin = chemin_lod(source, niveau)
+            if chemin.suffix.lower() == ".obj":
+                texte, annexes = rendre_obj(lod, chemin.stem)
+                for nom, octets in annexes.items():
+                    ecrire_atomique(source.parent / nom, octets, garder_secours=False)
+                    produits.add(nom)
+                # OBJ en dernier : sa présence implique celle de son MTL
+                ecrire_atomique(chemin, texte.encode("utf-8"), garder_secours=False)
+            else:
+                ecrire_atomique(chemin, lod.export(file_type="glb"), garder_secours=False)
+            produits.add(chemin.name)
+            resultat["niveaux"].append({
+                "fichier":   chemin.name,
+                "triangles": sum(len(lod.geometry[nom].faces) for nom in geometries),
+            })
+
+        # Niveaux d'une génération précédente devenus superflus (ou d'un autre format)
+        motif = re.compile(rf"{re.escape(source.stem)}_lod\d+[._]")
+        for chemin in source.parent.glob(f"{source.stem}_lod*"):
+            if motif.match(chemin.name) and chemin.name not in produits:
+                chemin.unlink()
+
+    except Exception as e:
+        resultat["erreur"] = str(e) or type(e).__name__
+    resultat["duree"] = time.perf_counter() - debut
+    return resultat
+
+
+# ─────────────────────────────────────────────────────────────
+# Rapport (et manifeste)
+# ─────────────────────────────────────────────────────────────
+
+def lire_rapport(dossier: Path) -> dict:
+    try:
+        donnees = json.loads((dossier / RAPPORT).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if (donnees.get("version") != VERSION or donnees.get("fractions") != list(FRACTIONS)
+            or donnees.get("plancher") != PLANCHER or donnees.get("gain_min") != GAIN_MIN):
+        return {}    # réglages différents : tout est à refaire
+    return donnees.get("modeles", {})
+
+
+def ecrire_rapport(dossier: Path, modeles: dict):
+    donnees = {"version": VERSION, "fractions": list(FRACTIONS), "plancher": PLANCHER,
+               "gain_min": GAIN_MIN, "modeles": dict(sorted(modeles.items()))}
+    ecrire_atomique(dossier / RAPPORT,
+                    json.dumps(donnees, ensure_ascii=False, indent=4).encode("utf-8"),
+                    garder_secours=False)
+
+
+def a_jour(entree, sha256: str, dossier: Path) -> bool:
+    return (entree is not None and entree.get("sha256") == sha256
+            and all((dossier / n["fichier"]).exists() for n in entree["niveaux"]))
+
+
+def afficher_rapport(dossier: Path, modeles: dict):
+    print(f"📐 {dossier}")
+    largeur = max((len(n) for n in modeles), default=10) + 2
+    profondeur = max((len(e["niveaux"]) for e in modeles.values()), default=1)
+    print(f"   {'modèle':<{largeur}}" + "".join(f"{'lod' + str(i):>8}" for i in range(profondeur)))
+    totaux = [0] * profondeur
+    for nom, entree in modeles.items():
+        triangles = [n["triangles"] for n in entree["niveaux"]]
+        for i in range(profondeur):
+            # Un modèle sans niveau i affiche (et compte) son niveau le plus simple
+            totaux[i] += triangles[min(i, len(triangles) - 1)]
+        print(f"   {nom:<{largeur}}" + "".join(f"{t:>8}" for t in triangles))
+    print(f"   {'total':<{largeur}}" + "".join(f"{t:>8}" for t in totaux))
+
+
+# ─────────────────────────────────────────────────────────────
+# Point d'entrée principal
+# ─────────────────────────────────────────────────────────────
+
+def generer(dossiers, jobs, force):
+    debut = time.perf_counter()
+    taches = []    # (dossier, source)
+    etats  = {}    # dossier -> (modèles, empreintes)
+    for dossier in dossiers:
+        ancien, modeles, empreintes = lire_rapport(dossier), {}, {}
+        for source in sources(dossier):
+            sha256 = empreintes[source.name] = empreinte_source(source)
+            if not force and a_jour(ancien.get(source.name), sha256, dossier):
+                modeles[source.name] = ancien[source.name]
+            else:
+                taches.append((dossier, source))
+        etats[dossier] = (modeles, empreintes)
+
+    echecs = 0
+    if taches:
+        if importlib.util.find_spec("trimesh") is None or \
+                importlib.util.find_spec("fast_simplification") is None:
+            print("✗ Modules manquants. Installez-les : pip install trimesh fast-simplification scipy")
+            sys.exit(1)
+        print(f"⚙️  {len(taches)} modèle(s) à simplifier, {min(jobs, len(taches))} processus\n")
+        with ProcessPoolExecutor(max_workers=max(1, min(jobs, len(taches)))) as pool:
+            futurs = {pool.submit(generer_lods, source): dossier for dossier, source in taches}
+            for i, futur in enumerate(as_completed(futurs), start=1):
+                dossier, r = futurs[futur], futur.result()
+                modeles, empreintes = etats[dossier]
+                if r["erreur"]:
+                    echecs += 1
+                    print(f"[{i}/{len(taches)}] ❌ {r['nom']} : {r['erreur']}")
+                    continue
+                print(f"[{i}/{len(taches)}] ✓ {r['nom']} ({r['duree']:.2f} s) : "
+                      + " → ".join(str(n["triangles"]) for n in r["niveaux"]))
+                modeles[r["nom"]] = {"sha256": empreintes[r["nom"]], "niveaux": r["niveaux"]}
+        print()
+
+    for dossier, (modeles, _) in etats.items():
+        ecrire_rapport(dossier, modeles)
+        afficher_rapport(dossier, modeles)
+    print(f"\n✅ {len(taches) - echecs} modèle(s) simplifié(s), "
+          f"{sum(len(m) for m, _ in etats.values()) - len(taches) + echecs} inchangé(s) "
+          f"({time.perf_counter() - debut:.2f} s)")
+    if echecs:
+        print(f"❌ Échecs : {echecs}")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Niveaux de détail des modèles FAUNEX")
+    sous = parser.add_subparsers(dest="commande", required=True)
+
+    p_gen = sous.add_parser("generer", help="Produit les niveaux simplifiés à côté des modèles")
+    p_gen.add_argument("dossiers", type=str, nargs="+", help="Dossiers contenant les modèles")
+    p_gen.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                       help="Processus de simplification (défaut : nombre de cœurs)")
+    p_gen.add_argument("--force", "-f", action="store_true",
+                       help="Régénérer même les modèles inchangés")
+
+    p_rap = sous.add_parser("rapport", help="Triangles par niveau de détail")
+    p_rap.add_argument("dossiers", type=str, nargs="+", help="Dossiers contenant les modèles")
+    args = parser.parse_args()
+
+    dossiers = [Path(d).resolve() for d in args.dossiers]
+    for dossier in dossiers:
+        if not dossier.is_dir():
+            print(f"❌ Dossier introuvable : {dossier}")
+            sys.exit(2)
+
+    if args.commande == "generer":
+        generer(dossiers, args.jobs, args.force)
+        return
+    for dossier in dossiers:
+        modeles = lire_rapport(dossier)
+        if not modeles:
+            print(f"⚠️  {dossier} : pas de {RAPPORT} (lancer « generer »)")
+            continue
+        afficher_rapport(dossier, modeles)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Rapport mémoire FAUNEX
+----------------------
+Parcourt le registre des entités (`scene.entities`) et regroupe par
+`etiquette` (ou « ui » / nom de classe) et par modèle :
+
+- octets de sommets et d'indices des géométries (GeomVertexData et
+  GeomPrimitive), chaque tampon compté une seule fois : un modèle partagé
+  par 120 arbres est attribué au premier groupe qui le référence ;
+- octets de textures (estimation Panda3D de la mémoire vidéo, mipmaps
+  compris), chaque texture comptée une fois ;
+- nombre de solides de collision (un par triangle pour un collider mesh) ;
+- taille Python peu profonde de l'objet et de son `__dict__`.
+
+Lancé avec FAUNEX_MEMOIRE=1, le jeu active tracemalloc avant la
+construction du monde : le rapport contient alors les lignes qui ont le
+plus alloué pendant la construction, et depuis.
+
+Les rapports sont des JSON à clés triées, comparables d'une version à
+l'autre (ou avant / après des cycles d'ouverture de menus) :
+    python memoire.py comparer memoire_avant.json memoire_apres.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+
+VERSION       = 1
+NB_LIGNES     = 15       # lignes d'allocation conservées par section tracemalloc
+CHAMPS        = ("instances", "sommets_octets", "indices_octets", "textures_octets",
+                 "solides", "python_octets")
+SUIVI_DEMANDE = os.environ.get("FAUNEX_MEMOIRE") == "1"
+
+
+# ─────────────────────────────────────────────────────────────
+# Mesure des entités
+# ─────────────────────────────────────────────────────────────
+
+def groupe_entite(entite, ui):
+    etiquette = getattr(entite, "etiquette", None)
+    if etiquette is None:
+        etiquette = "ui" if ui is not None and entite.has_ancestor(ui) else type(entite).__name__
+    modele = entite.model.name if entite.model is not None else "-"
+    return f"{etiquette}|{modele or 'mesh'}"
+
+
+def _mesurer_modele(modele, totaux, vus):
+    for chemin in modele.findAllMatches("**/+GeomNode"):
+        noeud = chemin.node()
+        for i in range(noeud.getNumGeoms()):
+            geom    = noeud.getGeom(i)
+            sommets = geom.getVertexData()
+            if hash(sommets) not in vus:
+                vus.add(hash(sommets))
+                totaux["sommets_octets"] += sum(
+                    sommets.getArray(j).getDataSizeBytes() for j in range(sommets.getNumArrays())
+                )
+            for j in range(geom.getNumPrimitives()):
+                primitive = geom.getPrimitive(j)
+                if primitive.isIndexed() and hash(primitive) not in vus:
+                    vus.add(hash(primitive))
+                    totaux["indices_octets"] += primitive.getDataSizeBytes()
+    for texture in modele.findAllTextures():
+        if hash(texture) not in vus:
+            vus.add(hash(texture))
+            totaux["textures_octets"] += texture.estimateTextureMemory()
+
+
+def mesurer_entites(entites, ui=None):
+    """{groupe: {champ: valeur}} pour les entités données."""
+    groupes = {}
+    vus     = set()    # tampons et textures déjà comptés (pointeurs C++)
+    for e in entites:
+        cle = groupe_entite(e, ui)
+        g = groupes.get(cle)
+        if g is None:
+            g = groupes[cle] = dict.fromkeys(CHAMPS, 0)
+        g["instances"]     += 1
+        g["python_octets"] += sys.getsizeof(e) + sys.getsizeof(getattr(e, "__dict__", {}))
+        # Niveaux simplifiés masqués compris (maillages[0] est e.model)
+        for maillage in getattr(e, "maillages", None) or ([e.model] if e.model is not None else []):
+            _mesurer_modele(maillage, g, vus)
+        collider = getattr(e, "collider", None)
+        if collider is not None and getattr(collider, "node_path", None) is not None:
+            g["solides"] += collider.node_path.node().getNumSolids()
+    return groupes
+
+
+# ─────────────────────────────────────────────────────────────
+# Allocations Python (tracemalloc)
+# ─────────────────────────────────────────────────────────────
+
+class SuiviPython:
+    """Instantanés tracemalloc autour de la construction du monde."""
+
+    def __init__(self):
+        self.avant = None
+        self.apres = None
+
+    def debut_construction(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.avant = tracemalloc.take_snapshot()
+
+    def fin_construction(self):
+        if self.avant is not None:
+            self.apres = tracemalloc.take_snapshot()
+
+    @staticmethod
+    def _section(instantane, reference):
+        ecarts = instantane.compare_to(reference, "lineno")
+        ecarts.sort(key=lambda s: -s.size_diff)
+        return {
+            "total_octets": sum(s.size_diff for s in ecarts),
+            "lignes": [
+                {"ligne": f"{s.traceback[0].filename}:{s.traceback[0].lineno}",
+                 "octets": s.size_diff, "blocs": s.count_diff}
+                for s in ecarts[:NB_LIGNES] if s.size_diff > 0
+            ],
+        }
+
+    def donnees(self):
+        if self.apres is None:
+            return None
+        return {
+            "construction_monde":  self._section(self.apres, self.avant),
+            "depuis_construction": self._section(tracemalloc.take_snapshot(), self.apres),
+        }
+
+
+# ─────────────────────────────────────────────────────────────
+# Rapport
+# ─────────────────────────────────────────────────────────────
+
+def rapport(entites, ui=None, suivi=None):
+    groupes = mesurer_entites(entites, ui)
+    totaux  = dict.fromkeys(CHAMPS, 0)
+    for g in groupes.values():
+        for champ in CHAMPS:
+            totaux[champ] += g[champ]
+    return {
+        "version": VERSION,
+        "date":    time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "totaux":  totaux,
+        "groupes": groupes,
+        "python":  suivi.donnees() if suivi is not None else None,
+    }
+
+
+def ecrire(donnees, dossier):
+    """Écrit `memoire_<date>.json` dans `dossier` ; retourne le chemin."""
+    dossier = Path(dossier)
+    dossier.mkdir(parents=True, exist_ok=True)
+    chemin = dossier / time.strftime("memoire_%Y%m%d_%H%M%S.json")
+    chemin.write_text(json.dumps(donnees, ensure_ascii=False, indent=4, sort_keys=True),
+                      encoding="utf-8")
+    return chemin
+
+
+def _ko(octets):
+    return f"{octets / 1024:+.1f} Ko"
+
+
+def comparer(avant, apres):
+    """Affiche les écarts par groupe ; retourne False si des instances se sont accumulées."""
+    vides  = dict.fromkeys(CHAMPS, 0)
+    fuites = 0
+    print(f"📊 {avant['date']} → {apres['date']}")
+    for cle in sorted(set(avant["groupes"]) | set(apres["groupes"])):
+        a = avant["groupes"].get(cle, vides)
+        b = apres["groupes"].get(cle, vides)
+        ecarts = {c: b[c] - a[c] for c in CHAMPS}
+        if not any(ecarts.values()):
+            continue
+        details = (f"instances {ecarts['instances']:+d}, "
+                   f"géométrie {_ko(ecarts['sommets_octets'] + ecarts['indices_octets'])}, "
+                   f"textures {_ko(ecarts['textures_octets'])}, "
+                   f"solides {ecarts['solides']:+d}, python {_ko(ecarts['python_octets'])}")
+        if ecarts["instances"] > 0:
+            fuites += 1
+            print(f"   ⚠️  {cle} : {details}")
+        else:
+            print(f"   {cle} : {details}")
+
+    ta, tb = avant["totaux"], apres["totaux"]
+    print(f"   Total : instances {tb['instances'] - ta['instances']:+d}, "
+          f"géométrie {_ko(tb['sommets_octets'] + tb['indices_octets'] - ta['sommets_octets'] - ta['indices_octets'])}, "
+          f"textures {_ko(tb['textures_octets'] - ta['textures_octets'])}")
+    pa, pb = avant.get("python"), apres.get("python")
+    if pa and pb:
+        for section in ("construction_monde", "depuis_construction"):
+            print(f"   Python ({section}) : "
+                  f"{_ko(pb[section]['total_octets'] - pa[section]['total_octets'])}")
+    if fuites:
+        print(f"⚠️  {fuites} groupe(s) avec plus d'instances qu'avant")
+        return False
+    print("✅ Aucune instance accumulée")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rapport mémoire FAUNEX")
+    sous = parser.add_subparsers(dest="commande", required=True)
+    p_comp = sous.add_parser("comparer", help="Écarts entre deux rapports mémoire")
+    p_comp.add_argument("avant", type=str, help="Rapport de référence")
+    p_comp.add_argument("apres", type=str, help="Rapport à comparer")
+    args = parser.parse_args()
+
+    try:
+        avant, apres = (json.loads(Path(c).read_text(encoding="utf-8"))
+                        for c in (args.avant, args.apres))
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+    for chemin, donnees in ((args.avant, avant), (args.apres, apres)):
+        if donnees.get("version") != VERSION:
+            print(f"❌ {chemin} : version {donnees.get('version')!r} inconnue")
+            sys.exit(2)
+    sys.exit(0 if comparer(avant, apres) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Moteur de dialogue FAUNEX
+-------------------------
+Les conversations des PNJ sont décrites dans des fichiers JSON (un par PNJ,
+dossier `dialogues/`) au lieu d'être codées en dur dans le menu. Au
+chargement, chaque graphe est validé puis compilé en tables indexées par
+entier : afficher une étape ne fait qu'un accès de liste, sans recherche
+par nom ni reconstruction de structure.
+
+Format d'un graphe :
+    {
+        "version": 1,
+        "nom":     "Garde Forestier",        # titre affiché
+        "depart":  "accueil",
+        "noeuds": {
+            "accueil": {"texte": "...", "choix": [["Libellé", "noeud suivant"], ...]},
+            "appat":   {"texte": "...", "effet": "donner_appat", "suite": "fin"},
+            "fin":     {"texte": "...", "suite": null}
+        }
+    }
+
+`"suite": "x"` est un raccourci pour un unique choix « Continuer » vers x ;
+`"suite": null` (ou un choix vers null) termine le dialogue.
+
+Usage (vérification des fichiers de dialogue) :
+    python moteur_dialogue.py verifier dialogues/
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+MAX_CHOIX = 4      # boutons de choix du menu (réutilisés d'une étape à l'autre)
+FIN       = -1     # index de « nœud suivant » qui ferme le dialogue
+
+LIBELLE_CONTINUER = "Continuer"
+LIBELLE_FIN       = "Au revoir"
+
+CLES_NOEUD = {"texte", "choix", "suite", "effet"}
+
+# Effets que le jeu sait exécuter (clé "effet" d'un nœud, voir creer_menu_dialogue)
+EFFETS_CONNUS = ("donner_appat",)
+
+
+# ─────────────────────────────────────────────────────────────
+# Validation & compilation
+# ─────────────────────────────────────────────────────────────
+
+def _choix_du_noeud(nom, noeud):
+    """Liste [(libellé, nom du nœud suivant ou None)] d'un nœud, raccourci `suite` déplié."""
+    if "choix" in noeud and "suite" in noeud:
+        raise ValueError(f"{nom} : `choix` et `suite` sont exclusifs")
+    if "choix" not in noeud:
+        suite = noeud.get("suite")
+        return [(LIBELLE_CONTINUER if suite is not None else LIBELLE_FIN, suite)]
+    choix = noeud["choix"]
+    if not isinstance(choix, list) or not choix:
+        raise ValueError(f"{nom} : `choix` doit être une liste non vide")
+    if len(choix) > MAX_CHOIX:
+        raise ValueError(f"{nom} : {len(choix)} choix, {MAX_CHOIX} au plus")
+    resultat = []
+    for c in choix:
+        if not isinstance(c, list) or len(c) != 2 or not isinstance(c[0], str):
+            raise ValueError(f"{nom} : choix [libellé, nœud suivant] attendu, reçu {c!r}")
+        resultat.append((c[0], c[1]))
+    return resultat
+
+
+class GrapheDialogue:
+    """
+    Graphe compilé : nœuds numérotés, tables parallèles.
+
+    - `textes[i]`   : texte du nœud i
+    - `effets[i]`   : nom de l'effet déclenché à l'entrée du nœud (ou None)
+    - `choix[i]`    : tuple de (libellé, index du nœud suivant ou FIN)
+    """
+
+    def __init__(self, donnees, effets_connus=None, source="<graphe>"):
+        if donnees.get("version", 1) != 1:
+            raise ValueError(f"{source} : version {donnees.get('version')!r} inconnue")
+        noeuds = donnees.get("noeuds")
+        if not isinstance(noeuds, dict) or not noeuds:
+            raise ValueError(f"{source} : `noeuds` doit être un dictionnaire non vide")
+
+        self.nom    = donnees.get("nom", Path(source).stem)
+        self.ids    = list(noeuds)
+        index       = {nom: i for i, nom in enumerate(self.ids)}
+        self.textes = []
+        self.effets = []
+        self.choix  = []
+
+        depart = donnees.get("depart", self.ids[0])
+        if depart not in index:
+            raise ValueError(f"{source} : nœud de départ inconnu {depart!r}")
+        self.depart = index[depart]
+
+        for nom, noeud in noeuds.items():
+            contexte = f"{source}:{nom}"
+            inconnues = set(noeud) - CLES_NOEUD
+            if inconnues:
+                raise ValueError(f"{contexte} : clé(s) inconnue(s) {', '.join(sorted(inconnues))}")
+            if not isinstance(noeud.get("texte"), str):
+                raise ValueError(f"{contexte} : `texte` manquant")
+            effet = noeud.get("effet")
+            if effet is not None and effets_connus is not None and effet not in effets_connus:
+                raise ValueError(f"{contexte} : effet inconnu {effet!r}")
+
+            choix = []
+            for libelle, suite in _choix_du_noeud(contexte, noeud):
+                if suite is not None and suite not in index:
+                    raise ValueError(f"{contexte} : nœud suivant inconnu {suite!r}")
+                choix.append((libelle, FIN if suite is None else index[suite]))
+
+            self.textes.append(noeud["texte"])
+            self.effets.append(effet)
+            self.choix.append(tuple(choix))
+
+        self.inaccessibles = self._inaccessibles()
+
+    def _inaccessibles(self):
+        vus, pile = {self.depart}, [self.depart]
+        while pile:
+            for _, suite in self.choix[pile.pop()]:
+                if suite != FIN and suite not in vus:
+                    vus.add(suite)
+                    pile.append(suite)
+        return [self.ids[i] for i in range(len(self.ids)) if i not in vus]
+
+    @classmethod
+    def charger(cls, chemin, effets_connus=None):
+        with open(chemin, "r", encoding="utf-8") as f:
+            return cls(json.load(f), effets_connus, source=Path(chemin).name)
+
+
+def charger_dialogues(dossier, effets_connus=None):
+    """Compile tous les graphes `<pnj>.json` du dossier ; {pnj: GrapheDialogue}."""
+    dossier = Path(dossier)
+    if not dossier.is_dir():
+        raise FileNotFoundError(f"dossier de dialogues introuvable : {dossier}")
+    return {
+        chemin.stem: GrapheDialogue.charger(chemin, effets_connus)
+        for chemin in sorted(dossier.glob("*.json"))
+    }
+
+
+# ─────────────────────────────────────────────────────────────
+# Vérification en ligne de commande
+# ─────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Moteur de dialogue FAUNEX")
+    sous = parser.add_subparsers(dest="commande", required=True)
+    p_verif = sous.add_parser("verifier", help="Valide et compile les fichiers de dialogue")
+    p_verif.add_argument(
+        "dossier", type=str, nargs="?",
+        default=str(Path(__file__).parent / "dialogues"),
+        help="Dossier des graphes JSON (défaut : dialogues/)",
+    )
+    args = parser.parse_args()
+
+    tous_ok = True
+    for chemin in sorted(Path(args.dossier).glob("*.json")):
+        try:
+            graphe = GrapheDialogue.charger(chemin, EFFETS_CONNUS)
+        except (OSError, ValueError) as e:
+            print(f"❌ {e}")
+            tous_ok = False
+            continue
+        print(f"✅ {chemin.name} : {graphe.nom}, {len(graphe.ids)} nœuds")
+        for nom in graphe.inaccessibles:
+            print(f"   ⚠️  nœud inaccessible : {nom}")
+    sys.exit(0 if tous_ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Moteur de score FAUNEX
+----------------------
+Le barème des photos est décrit dans un fichier de règles (JSON ou TOML)
+au lieu d'être codé en dur dans `prendre_photo`. Au chargement, les règles
+sont validées puis compilées en une fonction Python : l'évaluation d'un
+cliché ne parcourt aucune structure de données.
+
+Variables disponibles dans les règles :
+    rarete, mise_au_point, distance, premiere_fois
+
+Usage (outil de rejeu) :
+    # Recalcule les scores du catalogue avec les règles actuelles (aperçu)
+    python moteur_score.py rejouer faunex_photos.db
+
+    # Avec un autre barème, en écrivant les nouveaux scores
+    python moteur_score.py rejouer faunex_photos.db --regles regles.toml --appliquer
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+
+VARIABLES  = ("rarete", "mise_au_point", "distance", "premiere_fois")
+OPERATEURS = ("<", "<=", ">", ">=", "==", "!=")
+ACTIONS    = {
+    "ajouter":    "s += {}",
+    "multiplier": "s *= {}",
+    "diviser":    "s //= {}",
+}
+
+# Barème historique de FAUNEX (utilisé si aucun fichier de règles n'est trouvé)
+REGLES_PAR_DEFAUT = {
+    "version": 1,
+    "base":    {"variable": "rarete", "facteur": 20},
+    "regles": [
+        {"nom": "nettete",   "si": ["mise_au_point", ">", 0.8],     "ajouter": 50},
+        {"nom": "flou",      "si": ["mise_au_point", "<", 0.4],     "ajouter": -20},
+        {"nom": "proximite", "si": ["distance", "<", 10],           "ajouter": 30},
+        {"nom": "deja_vu",   "si": ["premiere_fois", "==", False],  "diviser": 5},
+    ],
+    "minimum": 1,
+}
+
+
+# ─────────────────────────────────────────────────────────────
+# Validation & compilation
+# ─────────────────────────────────────────────────────────────
+
+def _litteral(valeur, contexte):
+    # Seuls des nombres et booléens peuvent apparaître dans le code généré
+    if isinstance(valeur, bool) or isinstance(valeur, (int, float)):
+        return repr(valeur)
+    raise ValueError(f"{contexte} : valeur numérique ou booléenne attendue, reçu {valeur!r}")
+
+
+def _compiler_corps(regles):
+    """Traduit le barème en lignes de code Python (une par règle)."""
+    base = regles.get("base", {})
+    variable = base.get("variable", "rarete")
+    if variable not in VARIABLES:
+        raise ValueError(f"base : variable inconnue {variable!r}")
+    lignes = [f"s = {_litteral(base.get('facteur', 1), 'base.facteur')} * {variable}"]
+
+    for i, regle in enumerate(regles.get("regles", [])):
+        nom = regle.get("nom", f"regle_{i}")
+        condition = regle.get("si")
+        if condition is not None:
+            if len(condition) != 3:
+                raise ValueError(f"{nom} : condition [variable, opérateur, valeur] attendue")
+            var, op, seuil = condition
+            if var not in VARIABLES:
+                raise ValueError(f"{nom} : variable inconnue {var!r}")
+            if op not in OPERATEURS:
+                raise ValueError(f"{nom} : opérateur inconnu {op!r}")
+            test = f"{var} {op} {_litteral(seuil, nom)}"
+        else:
+            test = None
+
+        actions = [a for a in ACTIONS if a in regle]
+        if len(actions) != 1:
+            raise ValueError(f"{nom} : une action parmi {', '.join(ACTIONS)} est attendue")
+        action = ACTIONS[actions[0]].format(_litteral(regle[actions[0]], nom))
+        if actions[0] == "diviser" and regle["diviser"] == 0:
+            raise ValueError(f"{nom} : division par zéro")
+
+        lignes.append(f"if {test}: {action}" if test else action)
+
+    minimum = _litteral(regles.get("minimum", 1), "minimum")
+    lignes.append("s = int(s)")
+    lignes.append(f"s = s if s >= {minimum} else {minimum}")
+    return lignes
+
+
+class MoteurScore:
+    def __init__(self, regles):
+        self.regles = regles
+        corps = _compiler_corps(regles)
+        params = ", ".join(VARIABLES)
+
+        source  = f"def evaluer({params}):\n"
+        source += "".join(f"    {l}\n" for l in corps)
+        source += "    return s\n"
+        # Évaluation par lot : la boucle est dans le code compilé, pas d'appel par sujet
+        source += "def evaluer_lot(sujets):\n"
+        source += "    resultats = []\n"
+        source += "    ajouter = resultats.append\n"
+        source += f"    for {params} in sujets:\n"
+        source += "".join(f"        {l}\n" for l in corps)
+        source += "        ajouter(s)\n"
+        source += "    return resultats\n"
+
+        espace = {}
+        exec(compile(source, "<regles_score>", "exec"), espace)
+        self.source       = source
+        self.evaluer      = espace["evaluer"]
+        self.evaluer_lot  = espace["evaluer_lot"]
+
+    @classmethod
+    def charger(cls, chemin):
+        """Charge un barème JSON ou TOML ; barème par défaut si le fichier manque."""
+        chemin = Path(chemin)
+        if not chemin.exists():
+            return cls(REGLES_PAR_DEFAUT)
+        if chemin.suffix.lower() == ".toml":
+            import tomllib
+            with open(chemin, "rb") as f:
+                return cls(tomllib.load(f))
+        with open(chemin, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+
+# ─────────────────────────────────────────────────────────────
+# Rejeu d'un catalogue de photos
+# ─────────────────────────────────────────────────────────────
+
+COLONNES_REJEU = ("id", "score", "rarete", "mise_au_point", "distance", "premiere_fois")
+
+
+def rejouer(chemin_catalogue, moteur, appliquer=False):
+    """
+    Recalcule le score de chaque photo du catalogue.
+    Retourne (nb rejouées, nb modifiées, écart total, nb ignorées) : les
+    photos antérieures aux colonnes rarete/premiere_fois (NULL) sont
+    ignorées. ValueError si la base n'est pas un catalogue à jour.
+    """
+    connexion = sqlite3.connect(str(chemin_catalogue))
+    try:
+        colonnes   = {ligne[1] for ligne in connexion.execute("PRAGMA table_info(photos)")}
+        manquantes = [c for c in COLONNES_REJEU if c not in colonnes]
+        if manquantes:
+            raise ValueError("pas de table photos" if not colonnes else
+                             f"colonne(s) manquante(s) : {', '.join(manquantes)} "
+                             "(catalogue antérieur : lancer la partie une fois pour le migrer)")
+        return _rejouer(connexion, moteur, appliquer)
+    finally:
+        connexion.close()
+
+
+def _rejouer(connexion, moteur, appliquer):
+    lignes = connexion.execute(
+        f"SELECT {', '.join(COLONNES_REJEU)} FROM photos "
+        "WHERE rarete IS NOT NULL AND premiere_fois IS NOT NULL"
+    ).fetchall()
+    (ignorees,) = connexion.execute(
+        "SELECT COUNT(*) FROM photos WHERE rarete IS NULL OR premiere_fois IS NULL"
+    ).fetchone()
+
+    nouveaux = moteur.evaluer_lot(
+        (rarete, focus, distance, bool(premiere)) for _, _, rarete, focus, distance, premiere in lignes
+    )
+    changements = [
+        (nouveau, ligne[0]) for ligne, nouveau in zip(lignes, nouveaux) if nouveau != ligne[1]
+    ]
+    delta = sum(nouveau for nouveau in nouveaux) - sum(ligne[1] for ligne in lignes)
+
+    if appliquer and changements:
+        with connexion:
+            connexion.executemany("UPDATE photos SET score = ? WHERE id = ?", changements)
+    return len(lignes), len(changements), delta, ignorees
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Moteur de score FAUNEX")
+    sous = parser.add_subparsers(dest="commande", required=True)
+
+    p_rejeu = sous.add_parser("rejouer", help="Recalcule les scores d'un catalogue de photos")
+    p_rejeu.add_argument("catalogue", type=str, help="Base SQLite du catalogue (faunex_photos.db)")
+    p_rejeu.add_argument(
+        "--regles", "-r",
+        type=str,
+        default=str(Path(__file__).parent / "regles_score.json"),
+        help="Fichier de règles JSON/TOML (défaut : regles_score.json)",
+    )
+    p_rejeu.add_argument(
+        "--appliquer",
+        action="store_true",
+        help="Écrire les nouveaux scores dans le catalogue (sinon simple aperçu)",
+    )
+    args = parser.parse_args()
+
+    catalogue = Path(args.catalogue)
+    if not catalogue.exists():
+        print(f"✗ Catalogue introuvable : {catalogue}")
+        sys.exit(1)
+
+    try:
+        moteur = MoteurScore.charger(args.regles)
+    except ValueError as e:
+        print(f"✗ Règles invalides : {e}")
+        sys.exit(1)
+
+    try:
+        total, modifiees, delta, ignorees = rejouer(catalogue, moteur, args.appliquer)
+    except (ValueError, sqlite3.DatabaseError) as e:
+        print(f"✗ Catalogue illisible : {e}")
+        sys.exit(1)
+    print(f"📸 Photos rejouées  : {total}")
+    print(f"✏️  Scores modifiés : {modifiees}")
+    print(f"Σ  Écart total     : {delta:+d} pts")
+    if ignorees:
+        print(f"⚠️  Photos ignorées : {ignorees} (antérieures à la rareté, valeurs inconnues)")
+    if modifiees and not args.appliquer:
+        print("ℹ️  Aperçu uniquement — relancez avec --appliquer pour écrire les scores")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Profileur par sous-système FAUNEX
+---------------------------------
+Portées de chronométrage nommées autour de chaque partie de la boucle de
+jeu (IA, notifications, autosauvegarde, ...) :
+
+    with PROFILEUR.portee("ia"):
+        ...
+
+Chaque portée garde ses FENETRE dernières mesures dans un tampon
+circulaire ; les percentiles (p50/p95/p99) ne sont calculés qu'à la
+demande (superposition, export).
+
+Désactivé, `portee` retourne toujours le même objet inerte : le coût se
+limite à un appel de méthode et un `with` vide par portée.
+"""
+
+import csv
+import json
+import time
+from array import array
+from pathlib import Path
+
+
+FENETRE = 600        # mesures conservées par portée (~10 s à 60 FPS)
+
+
+class _PorteeInerte:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_INERTE = _PorteeInerte()
+
+
+class Portee:
+    """Chronomètre réutilisable d'un sous-système (aucune allocation par mesure)."""
+    __slots__ = ("nom", "mesures", "position", "total", "_debut")
+
+    def __init__(self, nom, fenetre=FENETRE):
+        self.nom      = nom
+        self.mesures  = array("d", bytes(8 * fenetre))   # millisecondes
+        self.position = 0
+        self.total    = 0          # mesures prises depuis la remise à zéro
+        self._debut   = 0.0
+
+    def __enter__(self):
+        self._debut = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.mesures[self.position] = (time.perf_counter() - self._debut) * 1000
+        self.position = (self.position + 1) % len(self.mesures)
+        self.total   += 1
+        return False
+
+    def statistiques(self):
+        n = min(self.total, len(self.mesures))
+        if not n:
+            return None
+        tries = sorted(self.mesures[:n]) if n < len(self.mesures) else sorted(self.mesures)
+
+        def centile(p):
+            return tries[min(n - 1, int(p / 100 * n))]
+
+        return {
+            "portee":  self.nom,
+            "mesures": n,
+            "moyenne": sum(tries) / n,
+            "p50":     centile(50),
+            "p95":     centile(95),
+            "p99":     centile(99),
+            "max":     tries[-1],
+        }
+
+
+class Profileur:
+    def __init__(self, fenetre=FENETRE):
+        self.fenetre = fenetre
+        self.actif   = False
+        self.portees = {}          # nom -> Portee, dans l'ordre de première mesure
+
+    def portee(self, nom):
+        if not self.actif:
+            return _INERTE
+        p = self.portees.get(nom)
+        if p is None:
+            p = self.portees[nom] = Portee(nom, self.fenetre)
+        return p
+
+    def basculer(self):
+        self.actif = not self.actif
+        return self.actif
+
+    def reinitialiser(self):
+        self.portees.clear()
+
+    def statistiques(self):
+        return [s for s in (p.statistiques() for p in self.portees.values()) if s]
+
+    def resume(self):
+        """Tableau texte (ms) pour la superposition."""
+        lignes = [f"{'portee':<14}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        for s in self.statistiques():
+            lignes.append(f"{s['portee']:<14}{s['p50']:>7.2f}{s['p95']:>7.2f}{s['p99']:>7.2f}")
+        return "\n".join(lignes)
+
+    # ------------------------------------------------------------------
+    #  Export
+    # ------------------------------------------------------------------
+    def exporter_csv(self, chemin):
+        stats = self.statistiques()
+        with open(chemin, "w", newline="", encoding="utf-8") as f:
+            ecrivain = csv.DictWriter(
+                f, fieldnames=["portee", "mesures", "moyenne", "p50", "p95", "p99", "max"]
+            )
+            ecrivain.writeheader()
+            for s in stats:
+                ecrivain.writerow({k: round(v, 4) if isinstance(v, float) else v
+                                   for k, v in s.items()})
+
+    def exporter_json(self, chemin):
+        donnees = {
+            "unite":    "ms",
+            "fenetre":  self.fenetre,
+            "date":     time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "portees":  self.statistiques(),
+        }
+        Path(chemin).write_text(json.dumps(donnees, ensure_ascii=False, indent=4), encoding="utf-8")
+
+    def exporter(self, dossier):
+        """Écrit `profil_<date>.csv` et `.json` dans `dossier`. Retourne le chemin sans extension."""
+        dossier = Path(dossier)
+        dossier.mkdir(parents=True, exist_ok=True)
+        base = dossier / time.strftime("profil_%Y%m%d_%H%M%S")
+        self.exporter_csv(base.with_suffix(".csv"))
+        self.exporter_json(base.with_suffix(".json"))
+        return base
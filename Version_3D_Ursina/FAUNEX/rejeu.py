@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Enregistrement et rejeu des entrées FAUNEX
+------------------------------------------
+Pour des mesures de performance reproductibles et des rapports de bug
+rejouables : une session enregistrée contient les graines (générateur
+global et monde), l'emplacement joué, puis chaque entrée horodatée en
+temps de jeu :
+
+- touches et boutons de la souris, tels que reçus par `JeuFaunex.input` ;
+- déplacements de la souris (`mouse.velocity`), lus par le
+  FirstPersonController.
+
+Le rejeu avance à pas fixe (horloge Panda3D forcée) : chaque frame dure
+exactement `pas` secondes et reçoit les entrées dont l'horodatage est
+atteint. La même session se déroule donc à l'identique sur toute machine,
+quelle que soit sa vitesse. La position du pointeur n'est pas rejouée :
+les menus ouverts au clavier le sont, les clics sur les boutons non.
+Le rejeu ignore le clavier et la souris réels, et refuse de démarrer sur
+un emplacement déjà sauvegardé : il part toujours d'un monde neuf.
+
+Format : JSON Lines, en-tête puis une entrée par ligne, écrit au fil de
+l'eau (une session interrompue reste lisible jusqu'à la dernière ligne
+complète) :
+    {"version": 1, "graine": 123, "graine_monde": 42, "emplacement": 1, "pas": 0.016666}
+    [0.512, "k", "w"]
+    [0.528, "m", 0.0123, -0.004]
+    [61.2, "fin"]
+
+Usage (jeu) :
+    FAUNEX_ENREGISTRER=session.jsonl python version_dev.py
+    FAUNEX_REJOUER=session.jsonl FAUNEX_SAUVEGARDES=/tmp/vide python version_dev.py
+Usage (résumé d'une session) :
+    python rejeu.py info session.jsonl
+"""
+
+import argparse
+import atexit
+import json
+import sys
+from pathlib import Path
+
+
+VERSION  = 1
+PAS      = 1 / 60       # pas du rejeu (s)
+TOUCHE   = "k"
+SOURIS   = "m"
+FIN      = "fin"        # dernière ligne : durée de la session
+DECIMALES_SOURIS = 6
+
+
+class Enregistreur:
+    def __init__(self, chemin, graine, graine_monde, emplacement, pas=PAS):
+        self.chemin  = Path(chemin)
+        self.temps   = 0.0
+        self._f      = open(self.chemin, "w", encoding="utf-8")
+        self._ecrire({"version": VERSION, "graine": graine, "graine_monde": graine_monde,
+                      "emplacement": emplacement, "pas": pas})
+        atexit.register(self.fermer)
+
+    def _ecrire(self, objet):
+        self._f.write(json.dumps(objet, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def avancer(self, dt):
+        self.temps += dt
+
+    def touche(self, key):
+        self._ecrire([round(self.temps, 6), TOUCHE, key])
+
+    def souris(self, dx, dy):
+        if dx or dy:
+            self._ecrire([round(self.temps, 6), SOURIS,
+                          round(dx, DECIMALES_SOURIS), round(dy, DECIMALES_SOURIS)])
+
+    def fermer(self):
+        if not self._f.closed:
+            self._ecrire([round(self.temps, 6), FIN])
+            self._f.close()
+
+
+def lire_session(chemin):
+    """(en-tête, entrées) ; une dernière ligne tronquée est ignorée."""
+    lignes = Path(chemin).read_text(encoding="utf-8").splitlines()
+    if not lignes:
+        raise ValueError(f"{chemin} : session vide")
+    entete = json.loads(lignes[0])
+    if entete.get("version") != VERSION:
+        raise ValueError(f"{chemin} : version {entete.get('version')!r} inconnue")
+    entrees = []
+    for numero, ligne in enumerate(lignes[1:], start=2):
+        try:
+            entrees.append(json.loads(ligne))
+        except ValueError:
+            if numero != len(lignes):
+                raise ValueError(f"{chemin}:{numero} : ligne illisible")
+    return entete, entrees
+
+
+class Lecteur:
+    """Restitue les entrées d'une session, frame par frame."""
+
+    def __init__(self, chemin):
+        self.entete, self.entrees = lire_session(chemin)
+        self.graine       = self.entete["graine"]
+        self.graine_monde = self.entete["graine_monde"]
+        self.emplacement  = self.entete["emplacement"]
+        self.pas          = self.entete["pas"]
+        self.duree        = self.entrees[-1][0] if self.entrees else 0.0
+        self.temps        = 0.0
+        self._position    = 0
+
+    @property
+    def fini(self):
+        return self._position >= len(self.entrees) and self.temps >= self.duree
+
+    def avancer(self, dt):
+        """Touches et déplacement de souris cumulé (dx, dy) atteints après `dt`."""
+        self.temps += dt
+        touches, dx, dy = [], 0.0, 0.0
+        entrees = self.entrees
+        while self._position < len(entrees) and entrees[self._position][0] <= self.temps:
+            e = entrees[self._position]
+            if e[1] == TOUCHE:
+                touches.append(e[2])
+            elif e[1] == SOURIS:
+                dx += e[2]
+                dy += e[3]
+            self._position += 1
+        return touches, dx, dy
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Enregistrement et rejeu des entrées FAUNEX")
+    sous = parser.add_subparsers(dest="commande", required=True)
+    p_info = sous.add_parser("info", help="Résumé d'une session enregistrée")
+    p_info.add_argument("session", type=str, help="Fichier .jsonl")
+    args = parser.parse_args()
+
+    try:
+        entete, entrees = lire_session(args.session)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    touches = [e for e in entrees if e[1] == TOUCHE]
+    souris  = [e for e in entrees if e[1] == SOURIS]
+    duree   = entrees[-1][0] if entrees else 0.0
+    print(f"🎬 {args.session}")
+    print(f"   Emplacement   : {entete['emplacement']}")
+    print(f"   Graines       : {entete['graine']} (monde {entete['graine_monde']})")
+    print(f"   Durée         : {duree:.1f} s, {round(duree / entete['pas'])} frames au pas fixe")
+    print(f"   Touches       : {len(touches)}")
+    print(f"   Mouvements    : {len(souris)}")
+    if not entrees or entrees[-1][1] != FIN:
+        print("   ⚠️  Session interrompue (pas de ligne de fin)")
+
+
+if __name__ == "__main__":
+    main()
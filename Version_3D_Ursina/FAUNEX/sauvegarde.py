@@ -0,0 +1,411 @@
+"""
+Persistance FAUNEX
+------------------
+Écriture atomique des sauvegardes et journal des mutations.
+
+- `ecrire_atomique` écrit dans un fichier temporaire, le synchronise sur
+  disque (fsync) puis le renomme à la place de la sauvegarde : un crash
+  pendant l'écriture ne peut plus corrompre la seule sauvegarde. Les
+  générations précédentes sont conservées en `.bak`, `.bak2`, ...
+- `encadrer` préfixe un contenu de sa longueur et de son CRC32 ;
+  `lire_generations` vérifie ce cadre en lisant le fichier par blocs (le
+  contenu n'est décodé qu'une fois, après validation) et se replie sur la
+  génération valide la plus récente.
+- `JournalSauvegarde` n'écrit que les changements : chaque mutation
+  (delta de crédits, espèce découverte, badge, ...) est ajoutée au journal
+  par un thread dédié, qui replie périodiquement le journal dans un nouvel
+  instantané. Le coût d'une autosauvegarde ne dépend plus de la taille de
+  l'encyclopédie.
+- `EcrivainAtomique` sérialise les écritures d'un même fichier dans un
+  thread : deux sauvegardes rapprochées ne se disputent ni le temporaire
+  ni la rotation des générations de secours.
+"""
+
+import json
+import os
+import queue
+import struct
+import threading
+import zlib
+from pathlib import Path
+
+from evenements import EVENEMENTS
+
+
+LOG = EVENEMENTS.categorie("sauvegarde")
+
+GENERATIONS_CONSERVEES = 3       # sauvegarde courante + 2 générations de secours
+
+MAGIC_CADRE = b"FXCK"
+CADRE       = struct.Struct("<4sII")   # magic, longueur du contenu, CRC32 du contenu
+TAILLE_BLOC = 64 * 1024
+
+
+def chemin_secours(chemin, rang=1):
+    """Génération de secours n°`rang` : `.bak`, puis `.bak2`, `.bak3`, ..."""
+    chemin = Path(chemin)
+    return chemin.with_name(chemin.name + (".bak" if rang == 1 else f".bak{rang}"))
+
+
+def chemins_generations(chemin):
+    """Du plus récent au plus ancien."""
+    return [Path(chemin)] + [chemin_secours(chemin, r) for r in range(1, GENERATIONS_CONSERVEES)]
+
+
+def _synchroniser_dossier(dossier):
+    # Rend le renommage durable (POSIX uniquement, sans effet sous Windows)
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(str(dossier), os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def ecrire_atomique(chemin, octets, garder_secours=True):
+    chemin = Path(chemin)
+    temporaire = chemin.with_name(chemin.name + ".tmp")
+    with open(temporaire, "wb") as f:
+        f.write(octets)
+        f.flush()
+        os.fsync(f.fileno())
+    if garder_secours:
+        generations = chemins_generations(chemin)
+        # Décalage : .bak2 <- .bak <- courant (la plus ancienne est écrasée)
+        for plus_ancienne, plus_recente in zip(generations[:0:-1], generations[-2::-1]):
+            if plus_recente.exists():
+                os.replace(plus_recente, plus_ancienne)
+    os.replace(temporaire, chemin)
+    _synchroniser_dossier(chemin.parent if str(chemin.parent) else Path("."))
+
+
+def encoder_json(donnees):
+    return json.dumps(donnees, ensure_ascii=False, indent=4).encode("utf-8")
+
+
+def lire_json(chemin):
+    """Lit une sauvegarde JSON ; en cas d'échec, essaie les générations de secours."""
+    for candidat in chemins_generations(chemin):
+        if not candidat.exists():
+            continue
+        try:
+            with open(candidat, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            continue
+    return None
+
+
+# ─────────────────────────────────────────────────────────────
+# Cadre longueur + somme de contrôle
+# ─────────────────────────────────────────────────────────────
+
+def encadrer(octets):
+    return CADRE.pack(MAGIC_CADRE, len(octets), zlib.crc32(octets)) + octets
+
+
+def lire_encadre(chemin):
+    """
+    Contenu d'un fichier encadré, ou None s'il est absent, tronqué ou corrompu.
+    Le CRC est calculé au fil de la lecture : aucune seconde passe.
+    """
+    try:
+        with open(chemin, "rb") as f:
+            entete = f.read(CADRE.size)
+            if len(entete) < CADRE.size:
+                return None
+            magic, longueur, crc_attendu = CADRE.unpack(entete)
+            if magic != MAGIC_CADRE:
+                return None
+            blocs, crc, reste = [], 0, longueur
+            while reste:
+                bloc = f.read(min(reste, TAILLE_BLOC))
+                if not bloc:
+                    return None                     # tronqué
+                crc = zlib.crc32(bloc, crc)
+                blocs.append(bloc)
+                reste -= len(bloc)
+            if f.read(1):
+                return None                         # octets en trop après le contenu
+    except OSError:
+        return None
+    return b"".join(blocs) if crc == crc_attendu else None
+
+
+def lire_generations(chemin, decodeur, erreurs=(ValueError,)):
+    """Décode la génération valide la plus récente ; None si aucune ne l'est."""
+    for candidat in chemins_generations(chemin):
+        if not candidat.exists():
+            continue
+        contenu = lire_encadre(candidat)
+        if contenu is not None:
+            try:
+                return decodeur(contenu)
+            except erreurs:
+                pass
+        LOG.attention("generation_endommagee", fichier=candidat.name)
+    return None
+
+
+# ─────────────────────────────────────────────────────────────
+# Écriture hors du thread de rendu
+# ─────────────────────────────────────────────────────────────
+
+class EcrivainAtomique:
+    """
+    Écrit `chemin` avec `ecrire_atomique` depuis un unique thread. Les
+    demandes arrivées pendant une écriture sont regroupées : seule la plus
+    récente est écrite ensuite (une rafale de F5 ne fait pas défiler les
+    générations de secours).
+    """
+
+    def __init__(self, chemin, garder_secours=True):
+        self.chemin         = Path(chemin)
+        self.garder_secours = garder_secours
+        self.erreur         = None          # dernière erreur d'écriture (lue par le jeu)
+        self._file          = queue.Queue()
+        self._thread        = threading.Thread(target=self._boucle, name="ecriture-" + self.chemin.name,
+                                               daemon=True)
+        self._thread.start()
+
+    def ecrire(self, octets):
+        self._file.put(octets)
+
+    def attendre(self):
+        """Bloque jusqu'à ce que toutes les écritures demandées soient faites."""
+        self._file.join()
+
+    def _boucle(self):
+        while True:
+            octets, nb = self._file.get(), 1
+            while not self._file.empty():       # seul consommateur : get() ne bloque pas
+                octets, nb = self._file.get(), nb + 1
+            try:
+                ecrire_atomique(self.chemin, octets, self.garder_secours)
+            except OSError as e:
+                self.erreur = e
+            finally:
+                for _ in range(nb):
+                    self._file.task_done()
+
+
+# ─────────────────────────────────────────────────────────────
+# Journal des mutations
+# ─────────────────────────────────────────────────────────────
+
+# Comment chaque champ du journal s'applique à l'état
+MODES = {
+    "credits":          "ajouter",   # delta
+    "appats_restants":  "ajouter",
+    "dechets_ramasses": "ajouter",
+    "encyclopedie":     "inserer",   # nom ajouté à la liste s'il n'y est pas
+    "badges":           "inserer",
+    "capacite_sd":      "fixer",     # nouvelle valeur
+    "photos_sd":        "fixer",
+    "pnj_rencontre":    "fixer",
+    "appat_pnj_donne":  "fixer",
+}
+REINITIALISATION = "reinit"
+
+SEUIL_COMPACTION = 256   # enregistrements avant de replier le journal dans un instantané
+
+
+def copier_etat(etat):
+    return {cle: list(v) if isinstance(v, list) else v for cle, v in etat.items()}
+
+
+def appliquer(etat, enregistrement, etat_initial):
+    """Applique une mutation `[champ, valeur]` (ou `["reinit"]`) à un état."""
+    champ = enregistrement[0]
+    if champ == REINITIALISATION:
+        etat.clear()
+        etat.update(copier_etat(etat_initial))
+        return
+    mode = MODES.get(champ)
+    if mode is None:
+        return                          # champ inconnu (version plus récente) : ignoré
+    valeur = enregistrement[1]
+    if mode == "ajouter":
+        etat[champ] = etat.get(champ, etat_initial.get(champ, 0)) + valeur
+    elif mode == "inserer":
+        liste = etat.setdefault(champ, [])
+        if valeur not in liste:
+            liste.append(valeur)
+    else:
+        etat[champ] = valeur
+
+
+_FIN = object()
+
+
+class JournalSauvegarde:
+    """
+    Instantané `<chemin>` (génération g) + journaux `<chemin>.journal.<g>`.
+
+    Chaque autosauvegarde ajoute seulement les mutations depuis la précédente
+    (une ligne par mutation : CRC32 puis JSON, quelques octets). Le thread
+    d'écriture tient une copie de l'état à jour ; après `SEUIL_COMPACTION`
+    enregistrements, il écrit un nouvel instantané encadré (génération g+1).
+
+    Les journaux des générations de secours sont conservés : si l'instantané
+    courant est endommagé, la génération précédente plus ses journaux
+    redonnent exactement le même état. Le rejeu s'arrête au premier
+    enregistrement invalide (ou journal manquant) : l'état chargé est
+    toujours un état réellement atteint par le passé.
+    """
+
+    def __init__(self, chemin, etat_initial, seuil_compaction=SEUIL_COMPACTION,
+                 decodeur=json.loads, encodeur=encoder_json, reprise=None):
+        self.chemin       = Path(chemin)
+        self.decodeur     = decodeur      # octets de l'instantané -> état
+        self.encodeur     = encodeur      # état -> octets de l'instantané
+        self.reprise      = reprise       # () -> état d'un ancien format, si aucun instantané
+        self.etat_initial = copier_etat(etat_initial)
+        self.seuil        = seuil_compaction
+        self.erreur       = None          # dernière erreur d'écriture (lue par le jeu)
+        self.generation   = 0
+        self._etat        = copier_etat(etat_initial)
+        self._nb_journal  = 0
+        self._fichier     = None
+        self._file        = queue.Queue()
+        self._thread      = threading.Thread(target=self._boucle, name="journal-sauvegarde", daemon=True)
+        self._thread.start()
+
+    def chemin_journal(self, generation):
+        return self.chemin.with_name(f"{self.chemin.name}.journal.{generation}")
+
+    def _journaux(self):
+        """[(génération, chemin)] triés des journaux présents sur disque."""
+        prefixe = self.chemin.name + ".journal."
+        journaux = []
+        dossier = self.chemin.parent if str(self.chemin.parent) else Path(".")
+        for candidat in dossier.glob(prefixe + "*"):
+            suffixe = candidat.name[len(prefixe):]
+            if suffixe.isdigit():
+                journaux.append((int(suffixe), candidat))
+        return sorted(journaux)
+
+    # ------------------------------------------------------------------
+    #  Chargement (thread principal, avant toute écriture)
+    # ------------------------------------------------------------------
+    def charger(self):
+        """Instantané + rejeu des journaux. Retourne l'état, ou None sans sauvegarde."""
+        instantane = lire_generations(self.chemin, self.decodeur)
+        if instantane is None and self.reprise is not None:
+            instantane = self.reprise()
+        journaux   = self._journaux()
+        if instantane is None and not journaux:
+            return None
+
+        etat = copier_etat(self.etat_initial)
+        etat.update(instantane or {})
+        generation = etat.pop("generation", 0)
+        attendue   = generation
+        for g, chemin in journaux:
+            if g < generation:
+                continue                # déjà replié dans l'instantané
+            if g != attendue or not self._rejouer(chemin, etat):
+                LOG.attention("journal_interrompu", fichier=chemin.name)
+                break
+            generation = g
+            attendue   = g + 1
+
+        self.generation = generation
+        self._etat      = copier_etat(etat)
+        if journaux:
+            # Repart d'un instantané propre (et d'un journal sans ligne tronquée)
+            self._file.put(("compacter", True))
+        return etat
+
+    def _rejouer(self, chemin, etat):
+        """Applique un journal ligne à ligne. False au premier enregistrement invalide."""
+        with open(chemin, "rb") as f:
+            for ligne in f:
+                # "<crc32 en hexa> <json>\n" — une ligne sans \n a été coupée par un crash
+                if len(ligne) < 10 or ligne[8:9] != b" " or not ligne.endswith(b"\n"):
+                    return False
+                contenu = ligne[9:-1]
+                try:
+                    if int(ligne[:8], 16) != zlib.crc32(contenu):
+                        return False
+                    enregistrement = json.loads(contenu)
+                except ValueError:
+                    return False
+                appliquer(etat, enregistrement, self.etat_initial)
+        return True
+
+    # ------------------------------------------------------------------
+    #  Écriture (thread dédié)
+    # ------------------------------------------------------------------
+    def enregistrer(self, mutations):
+        """Met en file une liste de mutations `[champ, valeur]`. Ne bloque pas."""
+        if mutations:
+            self._file.put(("journal", list(mutations)))
+
+    def compacter(self, forcer=False):
+        """Replie le journal dans un nouvel instantané (s'il contient quelque chose)."""
+        self._file.put(("compacter", forcer))
+
+    def _ajouter_au_journal(self, mutations):
+        if self._fichier is None:
+            self._fichier = open(self.chemin_journal(self.generation), "ab")
+        lignes = []
+        for m in mutations:
+            contenu = json.dumps(m, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            lignes.append(b"%08x %s\n" % (zlib.crc32(contenu), contenu))
+        self._fichier.write(b"".join(lignes))
+        self._fichier.flush()
+        os.fsync(self._fichier.fileno())
+        for m in mutations:
+            appliquer(self._etat, m, self.etat_initial)
+        self._nb_journal += len(mutations)
+
+    def _compacter(self):
+        if self._fichier is not None:
+            self._fichier.close()
+            self._fichier = None
+        suivante = self.generation + 1
+        # Après un rejeu interrompu, les journaux au-delà de l'état chargé
+        # ne doivent jamais être rejoués par-dessus le nouvel instantané
+        for g, chemin in self._journaux():
+            if g > self.generation:
+                chemin.unlink()
+        instantane = copier_etat(self._etat)
+        instantane["generation"] = suivante
+        ecrire_atomique(self.chemin, encadrer(self.encodeur(instantane)))
+        # Journal (même vide) de la nouvelle génération : un trou dans la
+        # suite des journaux signale alors un fichier perdu
+        self.chemin_journal(suivante).touch()
+        # Seuls les journaux des générations encore conservées restent utiles
+        for g, chemin in self._journaux():
+            if g <= suivante - GENERATIONS_CONSERVEES:
+                chemin.unlink()
+        self.generation  = suivante
+        self._nb_journal = 0
+
+    def _boucle(self):
+        while True:
+            travail = self._file.get()
+            if travail is _FIN:
+                break
+            action, contenu = travail
+            try:
+                if action == "journal":
+                    self._ajouter_au_journal(contenu)
+                    compacter = self._nb_journal >= self.seuil
+                else:
+                    compacter = contenu or self._nb_journal > 0
+                if compacter:
+                    self._compacter()
+            except OSError as e:
+                self.erreur = e
+        if self._fichier is not None:
+            self._fichier.close()
+
+    def fermer(self, compacter=True):
+        """Écrit les mutations en file (et un instantané) puis arrête le thread."""
+        if compacter:
+            self.compacter()
+        self._file.put(_FIN)
+        self._thread.join()
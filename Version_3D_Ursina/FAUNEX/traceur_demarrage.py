@@ -0,0 +1,142 @@
+"""
+Traceur de démarrage FAUNEX
+---------------------------
+Découpe le lancement en étapes successives (imports, fenêtre, sélecteur,
+chargement de la partie, construction du monde, première frame, ...) et
+cumule les opérations répétées (chargement des modèles) :
+
+    TRACEUR.etape("imports.ursina")        # ferme l'étape en cours, ouvre la suivante
+    with TRACEUR.cumul("assets"):
+        ...
+    TRACEUR.etape("premiere_frame", frames=2, fin=True)
+    ...
+    if TRACEUR.frame():                    # à chaque update
+        TRACEUR.ecrire(dossier)
+
+Le temps passé à attendre le joueur (sélecteur d'emplacement) est exclu :
+`pause()` ferme l'étape en cours sans en ouvrir d'autre. Le rapport est
+écrit une seule fois, à la fin du démarrage ; ensuite `frame()` ne coûte
+qu'un test.
+
+Le traceur doit être importé avant tout le reste pour que l'étape
+« imports » parte du début du script.
+"""
+
+import json
+import time
+from pathlib import Path
+
+
+class _Cumul:
+    __slots__ = ("compte", "total", "_debut")
+
+    def __init__(self):
+        self.compte = 0
+        self.total  = 0.0
+        self._debut = 0.0
+
+    def __enter__(self):
+        self._debut = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.total  += time.perf_counter() - self._debut
+        self.compte += 1
+        return False
+
+
+class TraceurDemarrage:
+    def __init__(self):
+        self.origine  = time.perf_counter()
+        self.phases   = []          # (nom, début, durée) en secondes depuis l'origine
+        self.cumuls   = {}          # nom -> _Cumul
+        self.termine  = False
+        self._courante = None       # (nom, début)
+        self._frames   = 0          # frames restantes avant fermeture automatique
+        self._fin      = False
+
+    def _fermer(self):
+        if self._courante is not None:
+            nom, debut = self._courante
+            self.phases.append((nom, debut, time.perf_counter() - self.origine - debut))
+            self._courante = None
+
+    def etape(self, nom, frames=0, fin=False):
+        """
+        Ferme l'étape en cours et ouvre `nom`. Avec `frames`, l'étape se
+        ferme d'elle-même après autant d'appels à `frame()` (puis termine
+        le démarrage si `fin`).
+        """
+        if self.termine:
+            return
+        self._fermer()
+        self._courante = (nom, time.perf_counter() - self.origine)
+        self._frames   = frames
+        self._fin      = fin
+
+    def pause(self):
+        self._fermer()
+        self._frames = 0
+
+    def frame(self):
+        """À appeler à chaque frame ; True à la frame qui termine le démarrage."""
+        if not self._frames:
+            return False
+        self._frames -= 1
+        if self._frames:
+            return False
+        if self._fin:
+            self.terminer()
+            return True
+        self.pause()
+        return False
+
+    def cumul(self, nom):
+        c = self.cumuls.get(nom)
+        if c is None:
+            c = self.cumuls[nom] = _Cumul()
+        return c
+
+    def terminer(self):
+        self._fermer()
+        self._frames = 0
+        self.termine = True
+
+    # ------------------------------------------------------------------
+    #  Rapport
+    # ------------------------------------------------------------------
+    def donnees(self):
+        return {
+            "unite":  "ms",
+            "date":   time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "total":  round(sum(d for _, _, d in self.phases) * 1000, 2),
+            "phases": [
+                {"nom": nom, "debut": round(debut * 1000, 2), "duree": round(duree * 1000, 2)}
+                for nom, debut, duree in self.phases
+            ],
+            "cumuls": {
+                nom: {"compte": c.compte, "total": round(c.total * 1000, 2)}
+                for nom, c in self.cumuls.items()
+            },
+        }
+
+    def resume(self):
+        d = self.donnees()
+        lignes = [f"{'etape':<26}{'debut':>9}{'duree':>9}"]
+        for p in d["phases"]:
+            lignes.append(f"{p['nom']:<26}{p['debut']:>9.1f}{p['duree']:>9.1f}")
+        for nom, c in d["cumuls"].items():
+            lignes.append(f"{nom + ' (x' + str(c['compte']) + ')':<26}{'':>9}{c['total']:>9.1f}")
+        lignes.append(f"{'total (hors attente)':<26}{'':>9}{d['total']:>9.1f}")
+        return "\n".join(lignes)
+
+    def ecrire(self, dossier):
+        """Écrit `demarrage_<date>.json` dans `dossier` ; retourne le chemin."""
+        dossier = Path(dossier)
+        dossier.mkdir(parents=True, exist_ok=True)
+        chemin = dossier / time.strftime("demarrage_%Y%m%d_%H%M%S.json")
+        chemin.write_text(json.dumps(self.donnees(), ensure_ascii=False, indent=4), encoding="utf-8")
+        return chemin
+
+
+TRACEUR = TraceurDemarrage()
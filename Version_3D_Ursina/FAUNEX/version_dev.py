@@ -1,24 +1,47 @@
+from traceur_demarrage import TRACEUR
+TRACEUR.etape("imports.panda3d")
 from panda3d.core import loadPrcFileData
+# OpenGL, puis DirectX 9 (Windows) et le rendu logiciel en secours ; pandadx8 n'existe plus depuis Panda3D 1.8
 loadPrcFileData('', '\n'.join([
     'load-display pandagl',
     'aux-display pandadx9',
-    'aux-display pandadx8',
     'aux-display tinydisplay',
 ]))
+TRACEUR.etape("imports.ursina")
 from ursina import *
+from ursina.main import keyboard_keys
 from ursina.prefabs.first_person_controller import FirstPersonController
 from ursina.shaders import lit_with_shadows_shader
 import time
-import json
 import os
 import random
-from math import sin
+import atexit
+from math import exp, tan, cos, radians, sqrt
 from collections import deque
 from pathlib import Path
 from ursina import PointLight, DirectionalLight, AmbientLight
 import sys
-from direct.showbase.ShowBase import ShowBase
-from panda3d.core import MovieTexture, AudioSound
+TRACEUR.etape("imports.jeu")
+from catalogue_photos import CataloguePhotos
+from moteur_score import MoteurScore
+from profileur import Profileur
+from evenements import EVENEMENTS
+from ia_animaux import ComportementAnimal, OrdonnanceurIA, distance_2d
+from lod_modeles import chemin_lod
+from moteur_dialogue import (charger_dialogues, EFFETS_CONNUS, MAX_CHOIX as MAX_CHOIX_DIALOGUE,
+                             FIN as FIN_DIALOGUE)
+from encodeur_photos import EncodeurAsynchrone
+from sauvegarde import (JournalSauvegarde, EcrivainAtomique, MODES, REINITIALISATION, copier_etat,
+                        encadrer, chemins_generations, lire_generations)
+from format_sauvegarde import lire_ancienne, encoder as encoder_sauvegarde, decoder as decoder_sauvegarde
+import instantane_monde
+import memoire
+import rejeu
+from instantane_monde import OBJET_DECHET, OBJET_APPAT
+from emplacements import GestionnaireEmplacements, dossier_utilisateur, NOM_MINIATURE
+from panda3d.core import (Camera as PandaCamera, Texture as PandaTexture, PNMImage, Filename,
+                          TransparencyAttrib, ClockObject)
+from ursina.texture import Texture as UrsinaTexture
 
 
 # ─────────────────────────────────────────
@@ -30,12 +53,48 @@ else:
     BASE_DIR = Path(__file__).parent
 
 ASSETS_DIR  = BASE_DIR / "assets_add"
+PHOTOS_DIR  = dossier_utilisateur() / "photos"
+
+# Fichiers d'un emplacement de sauvegarde (voir emplacements.py)
+NOM_SAUVEGARDE          = "sauvegarde_faunex.sav"
+NOM_ANCIENNE_SAUVEGARDE = "sauvegarde_faunex.json"   # reprise des sauvegardes JSON
+NOM_MONDE               = "monde_faunex.bin"
+NOM_CATALOGUE           = "faunex_photos.db"
 ANIMALS_DIR = ASSETS_DIR / "3d" / "animals"
 GROUND_DIR  = ASSETS_DIR / "3d" / "ground"
 FARMER_DIR  = ASSETS_DIR / "3d" / "farmer"
 
 application.asset_folder = ASSETS_DIR
 
+TRACEUR.etape("configuration")
+# Barème des photos (compilé une fois au lancement)
+MOTEUR_SCORE = MoteurScore.charger(BASE_DIR / "regles_score.json")
+# Journal d'événements (faunex.log) : niveaux par catégorie via FAUNEX_LOG
+for entree in EVENEMENTS.configurer(os.environ.get("FAUNEX_LOG", "")):
+    EVENEMENTS.categorie("journal").attention("niveau_ignore", entree=entree)
+# Dossier non inscriptible : les événements restent sur la console (demarrer retourne False)
+EVENEMENTS.demarrer(dossier_utilisateur() / "journaux")
+atexit.register(EVENEMENTS.arreter)
+LOG_MODELES    = EVENEMENTS.categorie("modeles")
+LOG_ANIMAUX    = EVENEMENTS.categorie("animaux")
+LOG_INTRO      = EVENEMENTS.categorie("intro")
+LOG_MONDE      = EVENEMENTS.categorie("monde")
+LOG_DIALOGUES  = EVENEMENTS.categorie("dialogues")
+LOG_SAUVEGARDE = EVENEMENTS.categorie("sauvegarde")
+LOG_REJEU      = EVENEMENTS.categorie("rejeu")
+LOG_DEMARRAGE  = EVENEMENTS.categorie("demarrage")
+
+# Temps par sous-système de la boucle de jeu (F3) — inerte tant qu'il est masqué
+PROFILEUR = Profileur()
+
+# Graphes de dialogue des PNJ (validés et compilés une fois au lancement)
+try:
+    DIALOGUES = charger_dialogues(BASE_DIR / "dialogues", EFFETS_CONNUS)
+except (OSError, ValueError) as e:
+    LOG_DIALOGUES.erreur("dialogues_invalides", erreur=str(e))
+    sys.exit(1)
+
+TRACEUR.etape("fenetre")
 app = Ursina(title='FAUNEX', borderless=True, fullscreen=True)
 window.exit_button.enabled = False
 window.fps_counter.enabled = False
@@ -45,10 +104,6 @@ window.collider_counter.enabled = False
 # ─────────────────────────────────────────
 #  Classe d'intro vidéo (version corrigée)
 # ─────────────────────────────────────────
-import cv2
-import numpy as np
-from panda3d.core import Texture, PNMImage
-
 class IntroVideo:
     def __init__(self, video_path, on_finish_callback):
         self.on_finish    = on_finish_callback
@@ -65,13 +120,21 @@ class IntroVideo:
 
         video_path = Path(video_path)
         if not video_path.exists():
-            print(f"❌ Vidéo non trouvée : {video_path}")
+            LOG_INTRO.erreur("video_absente", chemin=str(video_path))
             self.skip()
             return
 
+        try:
+            import cv2   # OpenCV n'est chargé que si l'intro est jouée
+        except ImportError:
+            LOG_INTRO.erreur("opencv_absent")
+            self.skip()
+            return
+        self.cv2 = cv2
+
         self.cap = cv2.VideoCapture(str(video_path.absolute()))
         if not self.cap.isOpened():
-            print(f"❌ OpenCV ne peut pas ouvrir : {video_path}")
+            LOG_INTRO.erreur("video_illisible", chemin=str(video_path))
             self.skip()
             return
 
@@ -81,13 +144,13 @@ class IntroVideo:
 
         ret, frame = self.cap.read()
         if not ret:
-            print(f"❌ Impossible de lire la première frame")
+            LOG_INTRO.erreur("premiere_frame_illisible", chemin=str(video_path))
             self.skip()
             return
 
         h, w  = frame.shape[:2]
         ratio = w / h
-        print(f"📹 Vidéo ouverte : {w}x{h} @ {self.fps:.1f} fps")
+        LOG_INTRO.info("video_ouverte", largeur=w, hauteur=h, fps=round(self.fps, 1))
 
         # Texture Panda3D brute
         from panda3d.core import Texture as PandaTexture
@@ -113,15 +176,15 @@ class IntroVideo:
         for ext in ('.mp3', '.wav', '.ogg'):
             audio_path = video_path.with_suffix(ext)
             if audio_path.exists():
-                print(f"🔊 Audio : {audio_path.name}")
+                LOG_INTRO.info("audio", fichier=audio_path.name)
                 try:
                     rel = audio_path.relative_to(ASSETS_DIR).as_posix()
                     self.sound = Audio(rel, loop=False, autoplay=True)
                 except Exception as e:
-                    print(f"⚠️ Impossible de charger l'audio : {e}")
+                    LOG_INTRO.attention("audio_illisible", fichier=audio_path.name, erreur=str(e))
                 break
         if not self.sound:
-            print("ℹ️ Aucun fichier audio trouvé")
+            LOG_INTRO.info("audio_absent")
 
         self.skip_text = Text(
             "Cliquez pour passer",
@@ -133,12 +196,12 @@ class IntroVideo:
 
         self.alpha     = 160
         self.alpha_dir = 50
-        print("🎬 Intro vidéo démarrée (OpenCV)")
+        LOG_INTRO.info("intro_demarree")
 
     # ------------------------------------------------------------------
     def _push_frame(self, frame):
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        frame_rgb = np.flipud(frame_rgb)
+        frame_rgb = self.cv2.cvtColor(frame, self.cv2.COLOR_BGR2RGB)
+        frame_rgb = frame_rgb[::-1]   # image retournée verticalement pour Panda3D
         self.tex.setRamImage(frame_rgb.tobytes())
 
     # ------------------------------------------------------------------
@@ -166,7 +229,7 @@ class IntroVideo:
         ret, frame = self.cap.read()
 
         if not ret:
-            print("🎬 Vidéo terminée.")
+            LOG_INTRO.info("video_terminee")
             self.skip()
             return
 
@@ -183,7 +246,7 @@ class IntroVideo:
             return
 
         self.playing = False
-        print("🎮 Fin de l'intro, démarrage du jeu...")
+        LOG_INTRO.info("intro_terminee")
 
         if self.cap:
             self.cap.release()
@@ -229,14 +292,50 @@ class Couleurs:
 #  Paramètres globaux
 # ─────────────────────────────────────────
 class ParametresJeu:
-    VITESSE_MISE_AU_POINT   = 8
     DIST_MAX_MISE_AU_POINT  = 100
-    VITESSE_ANIMAL          = 2
-    DIST_ATTRACTION_APPAT   = 20
-    DIST_CONSOMMATION_APPAT = 1.5
+    FREQUENCE_RAYON_FOCUS   = 12      # mesures de profondeur par seconde (raycast)
+    VITESSE_AUTOFOCUS       = 4.0     # convergence de l'objectif vers le sujet (1/s)
+    TOLERANCE_NETTETE       = 0.35    # écart relatif de mise au point => netteté nulle
+    SEUIL_REDESSIN_FOCUS    = 0.005   # variation minimale visible sur la barre
     DIST_SALUTATION_PNJ     = 5
     DUREE_NOTIFICATION      = 3.0
     ESPACEMENT_NOTIFICATION = 0.08
+    NB_NOTIFICATIONS        = 6       # emplacements Text pré-créés
+    GLISSEMENT_NOTIFICATION = 0.12    # décalage d'entrée (glissé depuis la gauche)
+    VITESSE_NOTIFICATION    = 14.0    # glissé / fondu (1/s)
+
+    # Zoom optique & niveaux de détail
+    FOV_LARGE               = 90
+    FOV_TELE                = 20
+    PAS_ZOOM                = 10
+    VITESSE_ZOOM            = 8.0                 # interpolation du FOV (1/s)
+    SEUILS_DETAIL           = (30, 70, 150)       # distances effectives des niveaux 0→1→2→3
+    PERIODES_IA             = (1, 2, 4, 8)        # une mise à jour IA toutes les N frames, par niveau
+    SEUILS_MAILLAGE         = (0.25, 0.1, 0.04)   # part de la largeur d'écran des maillages 0→1→2→3
+    INTERVALLE_DETAIL       = 0.25                # recalcul des niveaux (s)
+    CHARGEMENT_LODS         = 3.0                 # s après le démarrage, maillages simplifiés (None : modèles complets)
+
+    # Menus
+    PRECHAUFFAGE_MENUS      = 3.0                 # s après le démarrage (None : désactivé)
+    BUDGET_FRAME_CREUSE     = 1 / 50              # frame assez rapide pour construire un menu ou charger un LOD
+
+    # Monde
+    GRAINE_MONDE            = 42                  # placement des arbres (carte reproductible)
+
+    # Carte
+    TAILLE_CARTE_PX         = 128                 # résolution de la texture du fond
+    RAYON_DENSITE_CARTE     = 6                   # étalement d'un arbre sur la carte (unités)
+    NB_MARQUEURS_CARTE      = 40                  # joueur, PNJ, appâts, animaux découverts
+    FREQUENCE_CARTE         = 6                   # rafraîchissements des marqueurs par seconde
+
+    # Profileur
+    INTERVALLE_PROFILEUR    = 0.5                 # rafraîchissement de la superposition (s)
+
+    # Wiki-Dex
+    GRILLE_WIKIDEX          = (4, 2)              # colonnes, lignes d'une page de cartes
+
+    # Emplacements de sauvegarde
+    TAILLE_MINIATURE        = (160, 90)           # aperçu affiché dans le sélecteur (px)
 
     # Génération aléatoire des arbres/éléments
     NB_ARBRES_GRANDS  = 60
@@ -245,6 +344,7 @@ class ParametresJeu:
     NB_ROCHERS_PETITS = 10
     NB_BUISSONS       = 12
     RAYON_MONDE       = 120   # demi-côté de la zone de spawn (en unités)
+    TAILLE_TERRAIN    = 300   # côté du plan de terrain (en unités)
     DIST_MIN_SPAWN    = 6     # distance minimale au joueur (origine) pour éviter les chevauchements
 
 
@@ -323,8 +423,9 @@ MODELES_ARBRES = {
 # ─────────────────────────────────────────
 #  Utilitaires
 # ─────────────────────────────────────────
-def distance_2d(a, b):
-    return ((a[0] - b[0]) ** 2 + (a[2] - b[2]) ** 2) ** 0.5
+def horloge():
+    """Temps de frame (s) : contrairement à time.time(), il avance à pas fixe pendant un rejeu."""
+    return globalClock.getFrameTime()
 
 
 def chemin_modele_ursina(chemin: Path):
@@ -349,22 +450,93 @@ def charger_modele(nom, base_dir, mapping):
         chemin_complet = chemin_base
 
     if not chemin_complet.exists():
-        print(f"⚠️  Modèle non trouvé : {chemin_complet}")
+        LOG_MODELES.attention("modele_absent", nom=nom, chemin=str(chemin_complet))
         return None
 
     try:
         chemin_relatif = chemin_modele_ursina(chemin_complet)
-        if chemin_complet.suffix.lower() == '.obj':
-            mtl = chemin_complet.with_suffix('.mtl')
-            print(f"✓ OBJ+MTL : {chemin_relatif}" if mtl.exists() else f"⚠️  MTL manquant : {chemin_complet}")
-        else:
-            print(f"✓ GLB : {chemin_relatif}")
+        if chemin_complet.suffix.lower() == '.obj' and not chemin_complet.with_suffix('.mtl').exists():
+            LOG_MODELES.attention("mtl_absent", nom=nom, chemin=chemin_relatif)
+        elif LOG_MODELES.detail:
+            LOG_MODELES.detail("modele_trouve", nom=nom, chemin=chemin_relatif)
         return chemin_relatif
     except Exception as e:
-        print(f"❌ Erreur chargement {nom} : {e}")
+        LOG_MODELES.erreur("modele_erreur", nom=nom, erreur=str(e))
         return None
 
 
+class ChargeurLods:
+    """
+    Niveaux simplifiés des modèles du monde (<modèle>_lod1.obj/.glb, ...,
+    voir lod_modeles.py), tirés du fichier même que charge charger_modele :
+    OBJ et glTF ne s'importent pas avec la même orientation. Les entités
+    sont déclarées à la construction ; les fichiers sont chargés ensuite,
+    un par frame creuse comme les menus : le parseur glTF coûterait ~0,8 s
+    de plus au démarrage. D'ici là, l'entité garde son modèle complet.
+    GestionnaireDetail n'affiche qu'un maillage à la fois, selon la taille
+    de l'entité à l'écran.
+    """
+
+    def __init__(self):
+        self.modeles  = {}          # chemin du modèle -> {"chemins", "rayon", "charges", "entites"}
+        self._attente = deque()     # (chemin du modèle, niveau - 1) à charger
+
+    @staticmethod
+    def _attacher(entite, lod):
+        copie = lod.copyTo(entite)      # nœuds copiés, géométrie partagée
+        copie.setTransparency(TransparencyAttrib.M_dual)
+        copie.hide()
+        entite.maillages.append(copie)
+
+    def declarer(self, entite, model_path):
+        m = self.modeles.get(model_path)
+        if m is None:
+            source, chemins, n = ASSETS_DIR / model_path, [], 1
+            while chemin_lod(source, n).exists():
+                chemins.append(chemin_modele_ursina(chemin_lod(source, n)))
+                n += 1
+            bornes = entite.model.getTightBounds() if chemins else None
+            m = self.modeles[model_path] = {
+                "chemins": chemins,
+                "rayon":   (bornes[1] - bornes[0]).length() / 2 if bornes else 0.0,
+                "charges": [],
+                "entites": [],
+            }
+            self._attente.extend((model_path, i) for i in range(len(chemins)))
+        if not m["chemins"]:
+            return
+        entite.maillages = [entite.model]
+        entite.rayon_lod = m["rayon"] * max(entite.scale)
+        for lod in m["charges"]:
+            self._attacher(entite, lod)
+        m["entites"].append(entite)
+
+    def prechauffer(self):
+        """Charge un niveau en attente pour toutes ses entités. Retourne False s'il n'en reste aucun."""
+        while self._attente:
+            model_path, i = self._attente.popleft()
+            m = self.modeles[model_path]
+            if i >= len(m["chemins"]):
+                continue        # niveau précédent illisible
+            try:
+                lod = load_model(m["chemins"][i])
+            except Exception:       # OBJ que l'importeur d'Ursina refuse
+                lod = None
+            if lod is None:
+                LOG_MODELES.attention("lod_illisible", chemin=m["chemins"][i])
+                del m["chemins"][i:]
+                continue
+            m["charges"].append(lod)
+            m["entites"] = [e for e in m["entites"] if not e.isEmpty()]   # entités détruites
+            for entite in m["entites"]:
+                self._attacher(entite, lod)
+            return True
+        return False
+
+
+LODS = ChargeurLods()
+
+
 def creer_bouton(texte, parent, pos, taille=(0.62, 0.09), au_clic=None,
                  couleur_fond=Couleurs.BOUTON,
                  survol=Couleurs.BOUTON_SURVOL,
@@ -418,7 +590,7 @@ def positions_aleatoires(nb, rayon, dist_min, positions_existantes=None, seed=No
         positions.append((x, z))
 
     if len(positions) < nb:
-        print(f"⚠️  Seulement {len(positions)}/{nb} positions générées (zone trop dense ?)")
+        LOG_MONDE.attention("positions_manquantes", generees=len(positions), demandees=nb)
 
     return positions
 
@@ -426,7 +598,11 @@ def positions_aleatoires(nb, rayon, dist_min, positions_existantes=None, seed=No
 # ─────────────────────────────────────────
 #  Entités du monde
 # ─────────────────────────────────────────
-class Animal(Entity):
+class Animal(ComportementAnimal, Entity):
+    maillages       = ()      # [modèle, lod1, ...] si des niveaux simplifiés existent
+    niveau_maillage = 0
+    rayon_lod       = 0.0
+
     def __init__(self, nom, espece, valeur_couleur, position, comportement, rarete):
         taille     = TAILLES_ANIMAUX.get(nom, 1.5)
         model_path = charger_modele(nom, ANIMALS_DIR, MODELES_ANIMAUX)
@@ -442,17 +618,20 @@ class Animal(Entity):
 
         if model_path:
             try:
-                super().__init__(model=model_path, position=position, scale=taille, collider='mesh')
+                with TRACEUR.cumul("assets"):
+                    super().__init__(model=model_path, position=position, scale=taille, collider='mesh')
                 self.shader = lit_with_shadows_shader
+                LODS.declarer(self, model_path)
             except Exception as e:
-                print(f"⚠️  Fallback cube {nom} : {e}")
+                LOG_MODELES.attention("modele_remplace", nom=nom, erreur=str(e))
                 super().__init__(model='cube', color=valeur_couleur, position=position,
                                  scale=taille, collider='mesh')
         else:
             super().__init__(model='cube', color=valeur_couleur, position=position,
                              scale=taille, collider='mesh')
 
-        print(f"[Animal] {nom} — model: {self.model}, texture: {self.texture}")
+        if LOG_ANIMAUX.detail:
+            LOG_ANIMAUX.detail("animal_cree", nom=nom, modele=str(self.model), texture=str(self.texture))
 
         self.nom          = nom
         self.espece       = espece
@@ -461,62 +640,27 @@ class Animal(Entity):
         self.decouvert    = False
         self.etiquette    = 'animal'
         self.base_y       = position[1]
-
-    # appats est passé directement — plus de filtrage coûteux à chaque frame
-    def mettre_a_jour_ia(self, joueur, entites, appats):
-        # Animation de vol
-        if self.base_y > 1.5:
-            self.y = self.base_y + sin(time.time() * 2 + self.x) * 1.5
-
-        if self.comportement == 'sommeil':
-            return
-
-        move_dir = None
-        speed    = ParametresJeu.VITESSE_ANIMAL
-
-        # Attraction vers les appâts (liste pré-filtrée)
-        if appats:
-            le_plus_proche  = min(appats, key=lambda b: distance_2d(self.position, b.position))
-            dist_vers_appat = distance_2d(self.position, le_plus_proche.position)
-
-            if dist_vers_appat < ParametresJeu.DIST_ATTRACTION_APPAT:
-                move_dir = Vec3(
-                    le_plus_proche.x - self.x, 0,
-                    le_plus_proche.z - self.z
-                ).normalized()
-
-                if dist_vers_appat < ParametresJeu.DIST_CONSOMMATION_APPAT:
-                    entites.remove(le_plus_proche)
-                    appats.remove(le_plus_proche)  # retirer des deux listes
-                    destroy(le_plus_proche)
-
-        # Interaction joueur
-        dist_vers_joueur = distance_2d(self.position, joueur.position)
-
-        if self.comportement == 'fuit' and dist_vers_joueur < 15:
-            move_dir = Vec3(self.x - joueur.x, 0, self.z - joueur.z).normalized()
-            speed   *= 3
-        elif self.comportement == 'curieux' and dist_vers_joueur < 25:
-            self.look_at(Vec3(joueur.x, self.y, joueur.z))
-
-        # Déplacement + orientation
-        if move_dir:
-            self.look_at(self.position + move_dir)
-            self.rotation_y = (self.rotation_y + self.rotation_offset) % 360
-            self.position  += move_dir * time.dt * speed
+        self.niveau_detail = 0
+        self.dt_ia         = 0.0   # temps accumulé depuis la dernière mise à jour IA
 
 
 class Arbre(Entity):
+    maillages       = ()
+    niveau_maillage = 0
+    rayon_lod       = 0.0
+
     def __init__(self, position, type_arbre="arbre_grand"):
         taille     = TAILLES_ELEMENTS.get(type_arbre, 1.0)
         model_path = charger_modele(type_arbre, GROUND_DIR, MODELES_ARBRES) if type_arbre in MODELES_ARBRES else None
 
         if model_path:
             try:
-                super().__init__(model=model_path, position=position, scale=taille, collider='mesh')
+                with TRACEUR.cumul("assets"):
+                    super().__init__(model=model_path, position=position, scale=taille, collider='mesh')
                 self.shader = lit_with_shadows_shader
+                LODS.declarer(self, model_path)
             except Exception as e:
-                print(f"⚠️  Fallback arbre : {e}")
+                LOG_MODELES.attention("modele_remplace", nom=type_arbre, erreur=str(e))
                 super().__init__(model='cube', color=color.green, position=position,
                                  scale=taille, collider='mesh')
         else:
@@ -524,13 +668,15 @@ class Arbre(Entity):
                              scale=taille, collider='mesh')
 
         self.etiquette = 'arbre'
+        self.niveau_detail = 0
 
 
 class Dechet(Entity):
-    def __init__(self, position):
+    def __init__(self, position, ident=0):
         super().__init__(model='cube', color=color.dark_gray, scale=0.5,
                          position=position, collider='mesh')
         self.etiquette = 'dechet'
+        self.ident     = ident   # stable d'un lancement à l'autre (instantané du monde)
 
 
 class PNJ(Entity):
@@ -538,10 +684,11 @@ class PNJ(Entity):
         model_path = charger_modele(nom, FARMER_DIR, {"Garde Forestier": "00_farmer.fbx"})
         if model_path:
             try:
-                super().__init__(model=model_path, position=position, scale=1.5, collider='box')
+                with TRACEUR.cumul("assets"):
+                    super().__init__(model=model_path, position=position, scale=1.5, collider='box')
                 self.shader = lit_with_shadows_shader
             except Exception as e:
-                print(f"⚠️  Fallback cube PNJ : {e}")
+                LOG_MODELES.attention("modele_remplace", nom=nom, erreur=str(e))
                 super().__init__(model='cube', color=valeur_couleur,
                                  position=position, scale=(1, 2, 1), collider='box')
         else:
@@ -557,6 +704,7 @@ class Appat(Entity):
     def __init__(self, position):
         super().__init__(model='sphere', color=color.red, scale=0.35, position=position)
         self.etiquette = 'appat'
+        self.ident     = 0
 
 
 class Empreinte(Entity):
@@ -571,124 +719,330 @@ class Empreinte(Entity):
         self.etiquette = 'empreinte'
 
 
+# ─────────────────────────────────────────
+#  Niveaux de détail & ordonnancement IA
+#  Les deux utilisent la distance effective publiée par le zoom
+# ─────────────────────────────────────────
+class GestionnaireDetail:
+    def __init__(self, appareil_photo, entites_lod):
+        self.appareil_photo = appareil_photo
+        self.entites_lod    = entites_lod
+        self._chrono        = ParametresJeu.INTERVALLE_DETAIL
+
+    def distances(self, entite, cam, avant, cos_champ, facteur):
+        """
+        (distance effective pour l'IA, distance pour l'affichage). Zoomé, les
+        sujets dans le champ se rapprochent ; le reste s'éloigne pour l'IA
+        seulement : masqué, il reparaîtrait en retard quand la caméra tourne.
+        """
+        dx = entite.x - cam[0]
+        dy = entite.y - cam[1]
+        dz = entite.z - cam[2]
+        d  = sqrt(dx * dx + dy * dy + dz * dz)
+        if facteur > 1.001 and d > 0:
+            if (dx * avant[0] + dy * avant[1] + dz * avant[2]) / d >= cos_champ:
+                return d / facteur, d / facteur
+            return d * facteur, d
+        return d, d
+
+    @staticmethod
+    def niveau(d):
+        for niveau, seuil in enumerate(ParametresJeu.SEUILS_DETAIL):
+            if d < seuil:
+                return niveau
+        return len(ParametresJeu.SEUILS_DETAIL)
+
+    @staticmethod
+    def niveau_maillage(taille_ecran, nb_maillages):
+        for niveau, seuil in enumerate(ParametresJeu.SEUILS_MAILLAGE):
+            if taille_ecran >= seuil:
+                return min(niveau, nb_maillages - 1)
+        return nb_maillages - 1
+
+    def mettre_a_jour(self, dt, zoom_change=False):
+        self._chrono += dt
+        if not zoom_change and self._chrono < ParametresJeu.INTERVALLE_DETAIL:
+            return
+        self._chrono = 0.0
+
+        cam       = camera.world_position
+        avant     = camera.forward
+        demi      = min(89.0, self.appareil_photo.champ_vision * window.aspect_ratio / 2)
+        cos_champ = cos(radians(demi))
+        facteur   = self.appareil_photo.facteur_zoom
+        portee    = ParametresJeu.SEUILS_DETAIL[-1]
+        # camera.fov est horizontal (Lens.setFov) : demi-largeur visible à distance 1
+        tan_large = tan(radians(ParametresJeu.FOV_LARGE / 2))
+
+        for e in self.entites_lod:
+            d, d_vue = self.distances(e, cam, avant, cos_champ, facteur)
+            n = self.niveau(d)
+            if n != e.niveau_detail:        # Entity.__setattr__ est coûteux : seulement au changement
+                e.niveau_detail = n
+            visible = d_vue < portee
+            if visible != e.visible:
+                e.visible = visible
+            if e.maillages:
+                # Diamètre rapporté à la largeur d'écran (le zoom est déjà dans d_vue)
+                m = self.niveau_maillage(e.rayon_lod / (max(d_vue, 0.01) * tan_large), len(e.maillages))
+                if m != e.niveau_maillage:
+                    e.maillages[e.niveau_maillage].hide()
+                    e.maillages[m].show()
+                    e.niveau_maillage = m
+
+
+# ─────────────────────────────────────────
+#  État observable
+#  Les widgets s'abonnent à un champ et ne sont redessinés qu'à son changement
+# ─────────────────────────────────────────
+class Observable:
+    CHAMPS_OBSERVES = ()
+
+    def abonner(self, champ, rappel):
+        """`rappel(valeur)` à chaque changement de `champ` (et une fois tout de suite)."""
+        self.__dict__.setdefault("_abonnes", {}).setdefault(champ, []).append(rappel)
+        rappel(self.__dict__[champ])
+
+    def emettre(self, champ):
+        for rappel in self.__dict__.get("_abonnes", {}).get(champ, ()):
+            rappel(self.__dict__[champ])
+
+    def __setattr__(self, nom, valeur):
+        if nom in self.CHAMPS_OBSERVES:
+            ancienne = self.__dict__.get(nom)
+            object.__setattr__(self, nom, valeur)
+            if valeur != ancienne:
+                self.emettre(nom)
+        else:
+            object.__setattr__(self, nom, valeur)
+
+
 # ─────────────────────────────────────────
 #  Appareil photo
 # ─────────────────────────────────────────
-class AppareilPhoto:
+class AppareilPhoto(Observable):
+    CHAMPS_OBSERVES = ("capacite", "photos_prises")
+
     def __init__(self):
-        self.champ_vision         = 90
+        self.champ_vision         = ParametresJeu.FOV_LARGE
+        self.champ_vision_cible   = ParametresJeu.FOV_LARGE
+        # Grossissement publié pour le LOD et l'IA : distance effective = distance / facteur
+        self.facteur_zoom         = 1.0
         self.capacite             = 5
         self.photos_prises        = 0
         self.en_mise_au_point     = False
         self.valeur_mise_au_point = 0.0
+        # Autofocus : l'objectif garde sa dernière distance entre deux cadrages
+        self.distance_focus       = 10.0
+        self.profondeur_sujet     = ParametresJeu.DIST_MAX_MISE_AU_POINT
+        self._chrono_rayon        = 0.0
 
     def zoomer(self, direction):
-        self.champ_vision = max(20, min(90, self.champ_vision - direction * 10))
+        self.champ_vision_cible = max(ParametresJeu.FOV_TELE, min(ParametresJeu.FOV_LARGE,
+                                      self.champ_vision_cible - direction * ParametresJeu.PAS_ZOOM))
+
+    def mettre_a_jour_zoom(self, dt):
+        """Interpole le FOV vers la cible. Retourne True si le zoom a changé."""
+        ecart = self.champ_vision_cible - self.champ_vision
+        if ecart == 0:
+            return False
+        if abs(ecart) < 0.05:
+            self.champ_vision = self.champ_vision_cible
+        else:
+            self.champ_vision += ecart * (1 - exp(-ParametresJeu.VITESSE_ZOOM * dt))
         camera.fov = self.champ_vision
+        self.facteur_zoom = (tan(radians(ParametresJeu.FOV_LARGE) / 2)
+                             / tan(radians(self.champ_vision) / 2))
+        return True
 
-    def demarrer_mise_au_point(self):
+    def demarrer_mise_au_point(self, profondeur):
         self.en_mise_au_point = True
+        self.profondeur_sujet = profondeur
+        self._chrono_rayon    = 0.0
 
     def arreter_mise_au_point(self):
         self.en_mise_au_point = False
 
-    def mettre_a_jour_mise_au_point(self):
-        if self.en_mise_au_point:
-            self.valeur_mise_au_point = (sin(time.time() * ParametresJeu.VITESSE_MISE_AU_POINT) + 1) / 2
+    def _mesurer_profondeur(self, joueur):
+        touche_ray = raycast(
+            camera.world_position, camera.forward,
+            distance=ParametresJeu.DIST_MAX_MISE_AU_POINT,
+            ignore=[joueur]
+        )
+        return touche_ray.distance if touche_ray.hit else ParametresJeu.DIST_MAX_MISE_AU_POINT
+
+    def mettre_a_jour_mise_au_point(self, joueur, dt):
+        if not self.en_mise_au_point:
+            return
+
+        # Profondeur sous le réticule : raycast limité à FREQUENCE_RAYON_FOCUS
+        self._chrono_rayon += dt
+        if self._chrono_rayon >= 1 / ParametresJeu.FREQUENCE_RAYON_FOCUS:
+            self._chrono_rayon    = 0.0
+            self.profondeur_sujet = self._mesurer_profondeur(joueur)
 
-    def prendre_photo(self, cible, etat_jeu):
+        # L'objectif converge exponentiellement vers la profondeur du sujet
+        alpha = 1 - exp(-ParametresJeu.VITESSE_AUTOFOCUS * dt)
+        self.distance_focus += (self.profondeur_sujet - self.distance_focus) * alpha
+
+        ecart = abs(self.profondeur_sujet - self.distance_focus) / max(self.profondeur_sujet, 0.5)
+        self.valeur_mise_au_point = max(0.0, 1 - ecart / ParametresJeu.TOLERANCE_NETTETE)
+
+    def prendre_photo(self, cible, etat_jeu, catalogue, chemin=None):
         if self.photos_prises >= self.capacite:
             return False, False, 0
 
-        score = 20 * cible.rarete
-        if self.valeur_mise_au_point > 0.8:
-            score += 50
-        elif self.valeur_mise_au_point < 0.4:
-            score -= 20
-        if distance_2d(etat_jeu.joueur.position, cible.position) < 10:
-            score += 30
+        distance      = distance_2d(etat_jeu.joueur.position, cible.position)
+        premiere_fois = not catalogue.deja_photographie(cible.nom)
+        score = MOTEUR_SCORE.evaluer(cible.rarete, self.valeur_mise_au_point, distance, premiere_fois)
 
-        premiere_fois = cible.nom not in etat_jeu.encyclopedie
         if premiere_fois:
-            etat_jeu.encyclopedie.append(cible.nom)
+            etat_jeu.decouvrir(cible.nom)
             etat_jeu.verifier_badges()
-        else:
-            score //= 5
 
-        score = max(1, int(score))
         etat_jeu.credits   += score
         self.photos_prises += 1
         cible.decouvert     = True
+        catalogue.ajouter(cible.nom, cible.espece, score, self.valeur_mise_au_point,
+                          distance, cible.position, chemin=chemin,
+                          rarete=cible.rarete, premiere_fois=premiere_fois)
         return True, premiere_fois, score
 
 
 # ─────────────────────────────────────────
 #  État du jeu & sauvegarde
 # ─────────────────────────────────────────
-class EtatJeu:
+class EtatJeu(Observable):
+    # Valeurs d'une nouvelle partie (et de la réinitialisation)
+    DEFAUTS = {
+        "credits":          50,
+        "appats_restants":  2,
+        "encyclopedie":     [],
+        "badges":           [],
+        "dechets_ramasses": 0,
+        "pnj_rencontre":    False,
+        "appat_pnj_donne":  False,   # anti-exploit : appât offert une seule fois
+    }
+    DEFAUTS_SAUVEGARDE = {**DEFAUTS, "capacite_sd": 5, "photos_sd": 0}
+    CHAMPS_OBSERVES    = tuple(DEFAUTS)
+
     def __init__(self):
-        self.credits          = 50
-        self.appats_restants  = 2
-        self.encyclopedie     = []
-        self.badges           = []
-        self.dechets_ramasses = 0
-        self.joueur           = None
-        self.pnj_rencontre    = False
-        self.appat_pnj_donne  = False   # anti-exploit : appât offert une seule fois
+        self.__dict__.update(copier_etat(EtatJeu.DEFAUTS))
+        self.joueur            = None
+        self._mutations        = []     # mutations depuis la dernière autosauvegarde
+        self._dernier_appareil = (5, 0) # (capacité, photos) déjà journalisés
+
+    def __setattr__(self, nom, valeur):
+        # Chaque affectation d'un champ sauvegardé devient une mutation du journal
+        mode = MODES.get(nom)
+        if mode == "ajouter":
+            delta = valeur - self.__dict__[nom]
+            if delta:
+                self._mutations.append([nom, delta])
+        elif mode == "fixer" and valeur != self.__dict__.get(nom):
+            self._mutations.append([nom, valeur])
+        super().__setattr__(nom, valeur)
+
+    def decouvrir(self, nom):
+        self.encyclopedie.append(nom)
+        self._mutations.append(["encyclopedie", nom])
+        self.emettre("encyclopedie")
+
+    def _obtenir_badge(self, badge):
+        self.badges.append(badge)
+        self._mutations.append(["badges", badge])
+        self.emettre("badges")
+        return badge
+
+    def _emettre_tout(self):
+        for champ in EtatJeu.CHAMPS_OBSERVES:
+            self.emettre(champ)
+
+    def reinitialiser(self):
+        self.__dict__.update(copier_etat(EtatJeu.DEFAUTS))
+        self._mutations.append([REINITIALISATION])
+        self._emettre_tout()
 
     def verifier_badges(self):
         if len(self.encyclopedie) >= 3 and "Photographe Debutant" not in self.badges:
-            self.badges.append("Photographe Debutant")
-            return "Photographe Debutant"
+            return self._obtenir_badge("Photographe Debutant")
         if self.dechets_ramasses >= 5 and "Ami de la Nature" not in self.badges:
-            self.badges.append("Ami de la Nature")
-            return "Ami de la Nature"
+            return self._obtenir_badge("Ami de la Nature")
         return None
 
-    def sauvegarder(self, appareil_photo):
-        donnees = {
-            "credits":          self.credits,
-            "appats_restants":  self.appats_restants,
-            "encyclopedie":     self.encyclopedie,
-            "badges":           self.badges,
-            "dechets_ramasses": self.dechets_ramasses,
-            "capacite_sd":      appareil_photo.capacite,
-            "photos_sd":        appareil_photo.photos_prises,
-            "pnj_rencontre":    self.pnj_rencontre,
-            "appat_pnj_donne":  self.appat_pnj_donne,
-        }
-        with open("sauvegarde_faunex.json", "w", encoding="utf-8") as f:
-            json.dump(donnees, f, ensure_ascii=False, indent=4)
-
-    def charger(self, appareil_photo):
-        if not os.path.exists("sauvegarde_faunex.json"):
+    def instantane(self, appareil_photo):
+        """Copie complète de l'état à sauvegarder."""
+        etat = copier_etat({cle: getattr(self, cle) for cle in EtatJeu.DEFAUTS})
+        etat["capacite_sd"] = appareil_photo.capacite
+        etat["photos_sd"]   = appareil_photo.photos_prises
+        return etat
+
+    def sauvegarder(self, appareil_photo, journal):
+        """Journalise les mutations depuis la dernière fois. Retourne True s'il y en avait."""
+        capacite, photos = appareil_photo.capacite, appareil_photo.photos_prises
+        if capacite != self._dernier_appareil[0]:
+            self._mutations.append(["capacite_sd", capacite])
+        if photos != self._dernier_appareil[1]:
+            self._mutations.append(["photos_sd", photos])
+        self._dernier_appareil = (capacite, photos)
+        if not self._mutations:
+            return False
+        journal.enregistrer(self._mutations)
+        self._mutations = []
+        return True
+
+    def charger(self, appareil_photo, journal):
+        donnees = journal.charger()
+        if donnees is None:
             return
-        with open("sauvegarde_faunex.json", "r", encoding="utf-8") as f:
-            donnees = json.load(f)
-        self.credits          = donnees.get("credits",          50)
-        self.appats_restants  = donnees.get("appats_restants",  2)
-        self.encyclopedie     = donnees.get("encyclopedie",     [])
-        self.badges           = donnees.get("badges",           [])
-        self.dechets_ramasses = donnees.get("dechets_ramasses", 0)
-        self.pnj_rencontre    = donnees.get("pnj_rencontre",    False)
-        self.appat_pnj_donne  = donnees.get("appat_pnj_donne",  False)
-        appareil_photo.capacite      = donnees.get("capacite_sd", 5)
-        appareil_photo.photos_prises = donnees.get("photos_sd",   0)
+        # Affectation directe : l'état chargé n'est pas une mutation
+        self.__dict__.update({cle: donnees[cle] for cle in EtatJeu.DEFAUTS})
+        self._emettre_tout()
+        appareil_photo.capacite      = donnees["capacite_sd"]
+        appareil_photo.photos_prises = donnees["photos_sd"]
+        self._dernier_appareil = (appareil_photo.capacite, appareil_photo.photos_prises)
 
 
 # ─────────────────────────────────────────
 #  Gestionnaire de menus
 # ─────────────────────────────────────────
-class GestionnaireMenu:
+class GestionnaireMenu(Observable):
+    # `bloque` ne change (et n'émet) qu'aux transitions ouverture / fermeture
+    CHAMPS_OBSERVES = ("bloque",)
+
     def __init__(self, joueur):
         self.joueur       = joueur
         self.menus_actifs = set()
         self.menus        = {}
+        self.fabriques    = {}   # menus déclarés, pas encore construits
+        self.objets       = {}   # nom -> objet retourné par la fabrique
+        self.bloque       = False
 
     def enregistrer(self, nom, panneau, bloquant=True):
         self.menus[nom] = (panneau, bloquant)
 
+    def declarer(self, nom, fabrique):
+        """
+        Menu construit à sa première utilisation : `fabrique()` crée le
+        panneau, appelle `enregistrer` et retourne l'objet du menu.
+        """
+        self.fabriques[nom] = fabrique
+
+    def obtenir(self, nom):
+        """Objet du menu `nom`, construit au besoin."""
+        if nom in self.fabriques:
+            self.objets[nom] = self.fabriques.pop(nom)()
+        return self.objets.get(nom)
+
+    def prechauffer(self):
+        """Construit un seul menu en attente. Retourne False s'il n'en reste aucun."""
+        if not self.fabriques:
+            return False
+        self.obtenir(next(iter(self.fabriques)))
+        return True
+
     def ouvrir(self, nom):
+        self.obtenir(nom)
         if nom not in self.menus:
             return
         panneau, bloquant = self.menus[nom]
@@ -702,6 +1056,7 @@ class GestionnaireMenu:
             self.joueur.enabled = False
             mouse.locked  = False
             mouse.visible = True
+        self.bloque = self.est_bloque()
 
     def fermer(self, nom):
         if nom not in self.menus_actifs:
@@ -713,6 +1068,7 @@ class GestionnaireMenu:
             self.joueur.enabled = True
             mouse.locked  = True
             mouse.visible = False
+        self.bloque = self.est_bloque()
 
     def basculer(self, nom):
         if nom in self.menus_actifs:
@@ -729,49 +1085,147 @@ class GestionnaireMenu:
 
 
 # ─────────────────────────────────────────
-#  Notifications — dirty flag
-#  Reconstruit l'UI seulement si nécessaire
+#  Notifications — rendu retenu
+#  Emplacements Text créés une fois, jamais détruits
 # ─────────────────────────────────────────
+class EmplacementNotification:
+    """Un Text et son fond, réutilisés d'un message à l'autre."""
+    MARGE = 0.012
+
+    def __init__(self, parent):
+        self.texte = Text(
+            " ", parent=parent, origin=(-0.5, 0.5), scale=0.9, color=color.white
+        )
+        self.fond = Entity(
+            parent=self.texte, model='quad', origin=(-0.5, 0.5),
+            color=Couleurs.NOTIF_FOND, z=0.01
+        )
+        self.texte.setTransparency(TransparencyAttrib.MAlpha)
+        self.contenu  = None
+        self.couleur  = None
+        self.alpha    = 0.0
+        self.texte.enabled = False
+
+    def afficher(self, contenu, couleur):
+        # Ne touche aux nœuds de texte que si le contenu change vraiment
+        if contenu != self.contenu:
+            self.texte.text = contenu
+            self.contenu    = contenu
+            marge = EmplacementNotification.MARGE
+            self.fond.position = (-marge, marge)
+            self.fond.scale    = (self.texte.width + 2 * marge, self.texte.height + 2 * marge)
+        if couleur != self.couleur:
+            self.texte.color = couleur
+            self.couleur     = couleur
+
+    def placer(self, x, y, alpha):
+        self.texte.setPos(x, 0, y)
+        if alpha != self.alpha:
+            self.texte.setAlphaScale(alpha)
+            self.alpha = alpha
+
+
+class Notification:
+    """Un message affiché : contenu, échéance et position animée de son emplacement."""
+    __slots__ = ("texte", "couleur", "expiration", "compte", "emplacement", "x", "y", "alpha", "sortie")
+
+    def __init__(self, texte, couleur, expiration, emplacement):
+        self.texte       = texte
+        self.couleur     = couleur
+        self.expiration  = expiration
+        self.compte      = 1
+        self.emplacement = emplacement
+        self.x           = -ParametresJeu.GLISSEMENT_NOTIFICATION   # entre par la gauche
+        self.y           = 0.0
+        self.alpha       = 0.0
+        self.sortie      = False         # en train de disparaître
+
+
+def _approcher(valeur, cible, k):
+    """(valeur rapprochée de `cible` d'une fraction k, encore en mouvement ?)"""
+    ecart = cible - valeur
+    if abs(ecart) > 0.002:
+        return valeur + ecart * k, True
+    return cible, False
+
+
 class GestionnaireNotification:
+    """
+    NB_NOTIFICATIONS emplacements pré-créés : ajouter ou expirer un message ne
+    change que le texte, la couleur et la position cible d'un emplacement.
+    Un message identique encore affiché est fusionné (compteur xN) au lieu
+    d'occuper une nouvelle ligne. Entrée / sortie en glissé-fondu.
+    """
+
     def __init__(self):
-        self.notifications = deque()
-        self.etiquettes    = []
+        self.notifications = deque()     # Notification, de la plus ancienne à la plus récente
         self.conteneur     = Entity(parent=camera.ui, position=(-0.85, -0.45), z=-0.5)
-        self._dirty        = False
+        self.emplacements  = [EmplacementNotification(self.conteneur)
+                              for _ in range(ParametresJeu.NB_NOTIFICATIONS)]
+        self._libres       = list(self.emplacements)
+        self._anime        = False
 
     def ajouter(self, texte, couleur=color.white, duree=ParametresJeu.DUREE_NOTIFICATION):
-        self.notifications.append((texte, couleur, time.time() + duree))
-        self._dirty = True  # marquer, ne pas reconstruire immédiatement
-
-    def mettre_a_jour(self):
-        maintenant = time.time()
-        avant      = len(self.notifications)
-        while self.notifications and self.notifications[0][2] <= maintenant:
-            self.notifications.popleft()
-        if len(self.notifications) != avant:
-            self._dirty = True
-        if self._dirty:
-            self._rafraichir()
-            self._dirty = False  # une seule reconstruction par changement
-
-    def _rafraichir(self):
-        for etiq in self.etiquettes:
-            destroy(etiq)
-        self.etiquettes.clear()
-        decalage_y = 0.0
-        for texte, couleur, _ in reversed(self.notifications):
-            etiq = Text(
-                texte,
-                parent=self.conteneur,
-                position=(0, decalage_y),
-                origin=(-0.5, 0.5),
-                scale=0.9,
-                color=couleur,
-                background=True,
-                background_color=Couleurs.NOTIF_FOND
-            )
-            self.etiquettes.append(etiq)
-            decalage_y += ParametresJeu.ESPACEMENT_NOTIFICATION
+        expiration = horloge() + duree
+        for notif in self.notifications:
+            if notif.texte == texte:
+                if notif.sortie:
+                    notif.sortie = False      # en train de disparaître : on la ravive
+                else:
+                    notif.compte += 1
+                notif.couleur    = couleur
+                notif.expiration = max(notif.expiration, expiration)
+                self._afficher(notif)
+                self._anime = True
+                return
+        if not self._libres:
+            # Plus d'emplacement : la plus ancienne notification cède le sien
+            self._liberer(self.notifications.popleft())
+        emplacement = self._libres.pop()
+        emplacement.texte.enabled = True
+        notif = Notification(texte, couleur, expiration, emplacement)
+        self.notifications.append(notif)
+        self._afficher(notif)
+        emplacement.placer(notif.x, notif.y, notif.alpha)
+        self._anime = True
+
+    def _afficher(self, notif):
+        texte = notif.texte if notif.compte == 1 else f"{notif.texte}  x{notif.compte}"
+        notif.emplacement.afficher(texte, notif.couleur)
+
+    def _liberer(self, notif):
+        notif.emplacement.texte.enabled = False
+        self._libres.append(notif.emplacement)
+
+    def mettre_a_jour(self, dt=0.0):
+        maintenant = horloge()
+        for notif in self.notifications:
+            if not notif.sortie and notif.expiration <= maintenant:
+                notif.sortie = True
+                self._anime  = True
+        if not self._anime:
+            return                              # rien ne bouge : aucun travail
+
+        k = 1 - exp(-ParametresJeu.VITESSE_NOTIFICATION * dt)
+        encore = False
+        rang   = 0
+        for notif in reversed(self.notifications):   # la plus récente en bas
+            notif.x,     bouge_x = _approcher(notif.x, 0.0, k)
+            notif.y,     bouge_y = _approcher(notif.y, rang * ParametresJeu.ESPACEMENT_NOTIFICATION, k)
+            notif.alpha, bouge_a = _approcher(notif.alpha, 0.0 if notif.sortie else 1.0, k)
+            encore = encore or bouge_x or bouge_y or bouge_a
+            notif.emplacement.placer(notif.x, notif.y, notif.alpha)
+            if not notif.sortie:
+                rang += 1
+
+        # Libère les notifications complètement effacées (rotation, sans copie)
+        for _ in range(len(self.notifications)):
+            notif = self.notifications.popleft()
+            if notif.sortie and notif.alpha == 0.0:
+                self._liberer(notif)
+            else:
+                self.notifications.append(notif)
+        self._anime = encore
 
 
 # ─────────────────────────────────────────
@@ -785,17 +1239,25 @@ class AffichageTeteHaute:
             parent=camera.ui, model='quad', color=Couleurs.HUD_FOND,
             scale=(0.35, 0.15), position=(-0.7, 0.40), z=-0.5
         )
-        self.texte = Text(
-            parent=camera.ui, position=(-0.85, 0.46),
-            scale=1.2, color=Couleurs.TEXTE, z=-0.6
-        )
+        # Une ligne par Text : un changement ne régénère que sa propre ligne
+        interligne = Text.size * 1.2
+        self.lignes = [
+            Text(parent=camera.ui, position=(-0.85, 0.46 - i * interligne),
+                 scale=1.2, color=Couleurs.TEXTE, z=-0.6)
+            for i in range(3)
+        ]
+        etat_jeu.abonner("credits", lambda v: self._ecrire(0, f"Credits {v} cr"))
+        etat_jeu.abonner("appats_restants", lambda v: self._ecrire(1, f"Appats  {v}"))
+        appareil_photo.abonner("photos_prises", lambda v: self._ecrire_sd())
+        appareil_photo.abonner("capacite", lambda v: self._ecrire_sd())
 
-    def mettre_a_jour(self):
-        self.texte.text = (
-            f"Credits {self.jeu.credits} cr\n"
-            f"Appats  {self.jeu.appats_restants}\n"
-            f"SD      {self.camera_equipement.photos_prises}/{self.camera_equipement.capacite}"
-        )
+    def _ecrire(self, ligne, texte):
+        if self.lignes[ligne].text != texte:
+            self.lignes[ligne].text = texte
+
+    def _ecrire_sd(self):
+        self._ecrire(2, f"SD      {self.camera_equipement.photos_prises}/"
+                        f"{self.camera_equipement.capacite}")
 
 
 class Viseur:
@@ -807,6 +1269,9 @@ class Viseur:
         self.point = Entity(parent=camera.ui, model='quad', scale=0.006,
                             color=color.rgba(255/255, 255/255, 200/255, 200/255), z=z)
 
+    def afficher(self, visible):
+        self.h.enabled = self.v.enabled = self.point.enabled = visible
+
 
 class BarreMiseAuPoint:
     def __init__(self):
@@ -817,16 +1282,24 @@ class BarreMiseAuPoint:
                                 scale=(0.001, 0.022), position=(-0.25, -0.32), z=-0.6, enabled=False)
         self.etiquette = Text('MISE AU POINT', parent=camera.ui, position=(0, -0.28),
                               origin=(0, 0), scale=1.4, color=color.yellow, z=-0.6, enabled=False)
+        self._valeur_affichee = None
 
     def mettre_a_jour(self, valeur):
         if not self.fond.enabled:
             return
+        # Redessin seulement si la barre bouge de façon visible
+        if (self._valeur_affichee is not None
+                and abs(valeur - self._valeur_affichee) < ParametresJeu.SEUIL_REDESSIN_FOCUS
+                and (valeur > 0.8) == (self._valeur_affichee > 0.8)):
+            return
+        self._valeur_affichee = valeur
         l = max(0.001, valeur * 0.50)
         self.barre.scale_x = l
         self.barre.x       = -0.25 + l / 2
         self.barre.color   = color.green if valeur > 0.8 else color.orange
 
     def afficher(self):
+        self._valeur_affichee  = None
         self.fond.enabled      = True
         self.barre.enabled     = True
         self.etiquette.enabled = True
@@ -837,10 +1310,271 @@ class BarreMiseAuPoint:
         self.etiquette.enabled = False
 
 
+# ─────────────────────────────────────────
+#  Profileur — superposition des temps par sous-système
+# ─────────────────────────────────────────
+class SuperpositionProfileur:
+    def __init__(self, profileur):
+        self.profileur = profileur
+        self.texte = Text("", parent=camera.ui, position=(-0.86, 0.30), font='VeraMono.ttf',
+                          scale=0.8, color=color.white, z=-0.7, enabled=False,
+                          background=True, background_color=Couleurs.NOTIF_FOND)
+        self._chrono = 0.0
+
+    def basculer(self):
+        actif = self.profileur.basculer()
+        if actif:
+            self.profileur.reinitialiser()
+            self._chrono = 0.0
+        self.texte.enabled = actif
+
+    def mettre_a_jour(self, dt):
+        if not self.texte.enabled:
+            return
+        # Percentiles recalculés deux fois par seconde, pas à chaque frame
+        self._chrono += dt
+        if self._chrono < ParametresJeu.INTERVALLE_PROFILEUR:
+            return
+        self._chrono = 0.0
+        self.texte.text = "Profil (ms)  F4 : exporter\n" + self.profileur.resume()
+        self.texte.create_background(color=Couleurs.NOTIF_FOND)
+
+
+# ─────────────────────────────────────────
+#  Carte — fond rastérisé une fois, marqueurs réutilisés
+# ─────────────────────────────────────────
+def rasteriser_carte(vegetation, demi_cote, taille_px):
+    """
+    Image du terrain vu de dessus : herbe assombrie selon la densité de
+    végétation (arbres étalés sur un disque), zone de spawn soulignée.
+    Calculée une seule fois, à partir des positions du générateur du monde.
+    """
+    pixels_par_unite = taille_px / (2 * demi_cote)
+    rayon   = max(1, round(ParametresJeu.RAYON_DENSITE_CARTE * pixels_par_unite))
+    densite = [0.0] * (taille_px * taille_px)
+    for x, z in vegetation:
+        cx = int((x + demi_cote) * pixels_par_unite)
+        cy = int((z + demi_cote) * pixels_par_unite)
+        for dy in range(-rayon, rayon + 1):
+            for dx in range(-rayon, rayon + 1):
+                d2 = (dx * dx + dy * dy) / (rayon * rayon)
+                px, py = cx + dx, cy + dy
+                if d2 <= 1 and 0 <= px < taille_px and 0 <= py < taille_px:
+                    densite[py * taille_px + px] += 1 - d2
+
+    herbe, foret = (0.36, 0.55, 0.25), (0.10, 0.25, 0.10)
+    bord = int((demi_cote - ParametresJeu.RAYON_MONDE) * pixels_par_unite)
+    image = PNMImage(taille_px, taille_px, 3)
+    for py in range(taille_px):
+        ligne = densite[py * taille_px:(py + 1) * taille_px]
+        # PNMImage : y vers le bas ; la carte : +z vers le haut
+        y_image = taille_px - 1 - py
+        for px, d in enumerate(ligne):
+            t = min(1.0, d * 0.6)
+            r, g, b = (herbe[k] + (foret[k] - herbe[k]) * t for k in range(3))
+            if px in (bord, taille_px - 1 - bord) or py in (bord, taille_px - 1 - bord):
+                r, g, b = r + 0.25, g + 0.25, b + 0.2      # limite de la zone explorée
+            image.setXel(px, y_image, min(r, 1.0), min(g, 1.0), min(b, 1.0))
+    return image
+
+
+class Carte:
+    """
+    Minicarte (coin supérieur droit) ou carte plein écran (touche M).
+    Le fond est une texture calculée une fois ; chaque rafraîchissement
+    (FREQUENCE_CARTE par seconde) ne fait que replacer un pool de
+    marqueurs, et seulement ceux dont la position a changé à l'écran.
+    """
+    COULEURS = {
+        "joueur": color.white,
+        "pnj":    color.rgb(70, 200, 110),
+        "appat":  color.rgb(255, 205, 45),
+        "animal": color.rgb(220, 70, 50),
+    }
+
+    def __init__(self, vegetation, demi_cote):
+        self.demi_cote = demi_cote
+        texture_panda  = PandaTexture("carte")
+        texture_panda.load(rasteriser_carte(vegetation, demi_cote, ParametresJeu.TAILLE_CARTE_PX))
+        self.fond = Entity(parent=camera.ui, model='quad', texture=UrsinaTexture(texture_panda),
+                           z=-0.4)
+        # Marqueurs en coordonnées normalisées du fond (-0.5..0.5) : la taille
+        # de la carte ne change que l'échelle du fond
+        self.marqueurs = []
+        for _ in range(ParametresJeu.NB_MARQUEURS_CARTE):
+            m = Entity(parent=self.fond, model='quad', scale=0.035, z=-0.01, enabled=False)
+            m.cle = None            # (x, y) arrondis affichés
+            m.categorie = None
+            self.marqueurs.append(m)
+        # Le joueur : un triangle orienté selon son cap
+        self.marqueurs[0].model = Mesh(vertices=[(0, 0.5, 0), (0.35, -0.5, 0), (-0.35, -0.5, 0)])
+        self.marqueurs[0].double_sided = True
+        self.marqueurs[0].scale = 0.06
+        self._chrono  = 0.0
+        self._actifs  = 0
+        self.grande   = False
+        self._disposer()
+
+    def _disposer(self):
+        if self.grande:
+            self.fond.scale, self.fond.position = (0.8, 0.8), (0, 0)
+        else:
+            self.fond.scale, self.fond.position = (0.3, 0.3), (0.72, 0.32)
+
+    def basculer_taille(self):
+        self.grande = not self.grande
+        self._disposer()
+
+    def _placer(self, m, categorie, x, z):
+        # Quantifié au demi-pixel de la texture : en dessous, rien ne bouge à l'écran
+        pas = 2 * self.demi_cote / (2 * ParametresJeu.TAILLE_CARTE_PX)
+        cle = (round(x / pas), round(z / pas))
+        if cle != m.cle:
+            m.cle = cle
+            m.position = (x / (2 * self.demi_cote), z / (2 * self.demi_cote), -0.01)
+        if categorie != m.categorie:
+            m.categorie = categorie
+            m.color     = Carte.COULEURS[categorie]
+        if not m.enabled:
+            m.enabled = True
+
+    def mettre_a_jour(self, dt, joueur, pnj, appats, animaux):
+        if not self.fond.enabled:
+            return
+        self._chrono += dt
+        if self._chrono < 1 / ParametresJeu.FREQUENCE_CARTE:
+            return
+        self._chrono = 0.0
+
+        marqueurs = self.marqueurs
+        self._placer(marqueurs[0], "joueur", joueur.x, joueur.z)
+        if marqueurs[0].rotation_z != joueur.rotation_y:
+            marqueurs[0].rotation_z = joueur.rotation_y
+        self._placer(marqueurs[1], "pnj", pnj.x, pnj.z)
+        i = 2
+        for appat in appats:
+            if i == len(marqueurs):
+                break
+            self._placer(marqueurs[i], "appat", appat.x, appat.z)
+            i += 1
+        for animal in animaux:
+            if i == len(marqueurs):
+                break
+            if animal.decouvert:
+                self._placer(marqueurs[i], "animal", animal.x, animal.z)
+                i += 1
+        # Les marqueurs devenus inutiles sont masqués une seule fois
+        for m in marqueurs[i:self._actifs]:
+            m.enabled = False
+            m.cle     = None
+        self._actifs = i
+
+
+# ─────────────────────────────────────────
+#  Mode photo — rendu haute résolution hors écran
+# ─────────────────────────────────────────
+def capturer_ecran():
+    """Dernière image affichée, en PNMImage ; None si la fenêtre ne la fournit pas."""
+    ecran = base.win.getScreenshot()
+    if ecran is None:
+        return None
+    image = PNMImage()
+    return image if ecran.store(image) else None
+
+
+def rendu_haute_resolution(facteur):
+    """
+    Re-rend la vue courante en facteur × la résolution de l'écran.
+    La scène est rendue tuile par tuile dans un tampon de la taille de la
+    fenêtre (décalage du film de l'objectif), la mémoire graphique reste
+    donc bornée quel que soit le facteur.
+    """
+    base = application.base
+    l, h = base.win.get_x_size(), base.win.get_y_size()
+
+    tex    = PandaTexture()
+    tampon = base.win.make_texture_buffer("photo_haute_res", l, h, tex, to_ram=True)
+    if tampon is None:
+        return None
+    tampon.set_clear_color(base.win.get_clear_color())
+
+    lentille = camera.perspective_lens.make_copy()
+    largeur_film, hauteur_film = lentille.get_film_size()
+    focale   = lentille.get_focal_length()
+    lentille.set_film_size(largeur_film / facteur, hauteur_film / facteur)
+    lentille.set_focal_length(focale)
+
+    cam_photo = base.cam.attach_new_node(PandaCamera("camera_photo", lentille))
+    tampon.make_display_region().set_camera(cam_photo)
+
+    image = PNMImage(l * facteur, h * facteur)
+    tuile = PNMImage()
+    for j in range(facteur):          # lignes de tuiles, du haut vers le bas
+        for i in range(facteur):
+            lentille.set_film_offset(
+                -largeur_film / 2 + (i + 0.5) * largeur_film / facteur,
+                 hauteur_film / 2 - (j + 0.5) * hauteur_film / facteur
+            )
+            base.graphics_engine.render_frame()
+            tex.store(tuile)
+            image.copy_sub_image(tuile, i * l, j * h)
+
+    cam_photo.remove_node()
+    base.graphics_engine.remove_window(tampon)
+    return image
+
+
+class ModePhoto:
+    FACTEURS = (2, 3, 4)
+
+    def __init__(self, gest_menus, gest_notifs, appareil_photo, encodeur):
+        self.gest_notifs    = gest_notifs
+        self.appareil_photo = appareil_photo
+        self.encodeur       = encodeur
+        self.facteur        = 2
+
+        # Panneau bloquant : l'IA et le joueur sont figés tant qu'il est ouvert
+        self.panneau = Entity(parent=camera.ui, enabled=False)
+        Text("MODE PHOTO", parent=self.panneau, y=0.45, origin=(0, 0),
+             scale=2.0, color=Couleurs.TITRE, z=-0.1)
+        self.aide = Text("", parent=self.panneau, y=-0.45, origin=(0, 0),
+                         scale=1.2, color=Couleurs.TEXTE, z=-0.1,
+                         background=True, background_color=Couleurs.NOTIF_FOND)
+        self._rafraichir_aide()
+        gest_menus.enregistrer('photo', self.panneau, bloquant=True)
+
+    def _rafraichir_aide(self):
+        self.aide.text = (f"Resolution x{self.facteur} [2/3/4]   Molette : zoom   "
+                          f"[Entree] Capturer   [Echap] Quitter")
+
+    def entree(self, key):
+        if key in ('2', '3', '4'):
+            self.facteur = int(key)
+            self._rafraichir_aide()
+        elif key == 'scroll up':
+            self.appareil_photo.zoomer(1)
+        elif key == 'scroll down':
+            self.appareil_photo.zoomer(-1)
+        elif key == 'enter':
+            self.capturer()
+
+    def capturer(self):
+        image = rendu_haute_resolution(self.facteur)
+        if image is None:
+            self.gest_notifs.ajouter("Rendu hors ecran indisponible.", Couleurs.ATTENTION)
+            return
+        chemin = PHOTOS_DIR / f"faunex_{time.strftime('%Y%m%d_%H%M%S')}_x{self.facteur}.png"
+        self.encodeur.encoder(image, chemin)
+        self.gest_notifs.ajouter(
+            f"Capture {image.get_x_size()}x{image.get_y_size()} en cours...", Couleurs.TEXTE
+        )
+
+
 # ─────────────────────────────────────────
 #  Menus
 # ─────────────────────────────────────────
-def creer_menu_pause(gest_menus, etat_jeu, appareil_photo, entites, gest_notifs):
+def creer_menu_pause(gest_menus, etat_jeu, appareil_photo, gest_notifs, catalogue, encodeur,
+                     journal, fermer_emplacement, reinitialiser_monde):
     superposition = Entity(parent=camera.ui, model='quad',
                            color=color.rgba(0, 0, 0, 160/255),
                            scale=(3, 3), z=0.5, enabled=False)
@@ -854,7 +1588,11 @@ def creer_menu_pause(gest_menus, etat_jeu, appareil_photo, entites, gest_notifs)
         superposition.enabled = False
 
     def sauvegarder_et_quitter():
-        etat_jeu.sauvegarder(appareil_photo)
+        etat_jeu.sauvegarder(appareil_photo, journal)
+        journal.fermer()
+        fermer_emplacement()
+        catalogue.fermer()
+        encodeur.fermer()
         application.quit()
 
     def demander_reset():
@@ -874,20 +1612,11 @@ def creer_menu_pause(gest_menus, etat_jeu, appareil_photo, entites, gest_notifs)
         btn_non.enabled       = False
 
     def executer_reset():
-        etat_jeu.credits          = 50
-        etat_jeu.appats_restants  = 2
-        etat_jeu.encyclopedie.clear()
-        etat_jeu.badges.clear()
-        etat_jeu.dechets_ramasses = 0
-        etat_jeu.pnj_rencontre    = False
-        etat_jeu.appat_pnj_donne  = False
+        etat_jeu.reinitialiser()
         appareil_photo.capacite      = 5
         appareil_photo.photos_prises = 0
-        for e in entites:
-            if hasattr(e, 'decouvert'):
-                e.decouvert = False
-        if os.path.exists("sauvegarde_faunex.json"):
-            os.remove("sauvegarde_faunex.json")
+        reinitialiser_monde()
+        catalogue.effacer()
         reprendre()
         gest_notifs.ajouter("Progression reinitialisee !", color.red)
 
@@ -911,13 +1640,18 @@ def creer_menu_pause(gest_menus, etat_jeu, appareil_photo, entites, gest_notifs)
     return superposition
 
 
-def creer_menu_dialogue(gest_menus, gest_notifs, etat_jeu, appareil_photo):
+def creer_menu_dialogue(gest_menus, gest_notifs, etat_jeu, appareil_photo, graphes):
+    """
+    Rendu des graphes compilés par `moteur_dialogue` : MAX_CHOIX boutons
+    créés une fois ; une étape ne change que leurs libellés, positions et
+    visibilité. Les rappels sont liés une seule fois, à l'index du bouton.
+    """
     panneau = Entity(
         parent=camera.ui, model='quad', color=Couleurs.PANNEAU,
         scale=(0.80, 0.48), position=(0, -0.28), z=0.4, enabled=False
     )
-    Text("Garde Forestier", parent=panneau, position=(-0.36, 0.17),
-         scale=1.8, color=Couleurs.TITRE, z=-0.1)
+    titre = Text("", parent=panneau, position=(-0.36, 0.17),
+                 scale=1.8, color=Couleurs.TITRE, z=-0.1)
 
     # wordwrap retiré (bug Ursina) — retours à la ligne explicites dans les textes
     texte_dialogue = Text(
@@ -935,77 +1669,62 @@ def creer_menu_dialogue(gest_menus, gest_notifs, etat_jeu, appareil_photo):
         else:
             gest_notifs.ajouter("Je n'ai plus rien a te donner.", Couleurs.TEXTE)
 
-    DIALOGUES = [
-        {
-            "texte": "Bienvenue, jeune photographe !\nLa faune ici est riche.\nQue puis-je faire pour toi ?",
-            "choix": [
-                ("Donne-moi un appat gratuit",   "appat"),
-                ("Parle-moi de la faune locale", "info"),
-                ("Au revoir",                    "quitter"),
-            ]
-        },
-        {
-            "appat": {
-                "texte": "Tiens, prends ca.\nUtilise-le bien, les animaux\nmeritent le respect !",
-                "effet": donner_appat,
-                "suite": "fin"
-            },
-            "info": {
-                "texte": "On recense 21 especes dans cette zone.\nLes oiseaux volent haut, leve les yeux !\nLes insectes se cachent au sud.",
-                "suite": "fin"
-            },
-            "fin": {
-                "texte": "Bonne chance !\nEt ramasse les dechets que tu croises,\nla nature te remerciera.",
-                "suite": None
-            }
-        }
-    ]
+    # Effets appelables depuis les fichiers de dialogue : un par nom de EFFETS_CONNUS,
+    # seuls noms que les graphes ont pu utiliser (vérifié à leur chargement)
+    EFFETS = {"donner_appat": donner_appat}
 
-    boutons_choix  = []
-    panneau._etape = "accueil"
-
-    def afficher_etape(etape_id):
-        panneau._etape = etape_id
-        for btn in boutons_choix:
-            destroy(btn)
-        boutons_choix.clear()
-
-        if etape_id == "accueil":
-            data = DIALOGUES[0]
-            texte_dialogue.text = data["texte"]
-            for i, (label, cle) in enumerate(data["choix"]):
-                b = creer_bouton(
-                    label, panneau,
-                    pos=(0.05, 0.00 - i * 0.12),
-                    taille=(0.56, 0.10),
-                    au_clic=lambda c=cle: reagir(c)
-                )
-                boutons_choix.append(b)
-        else:
-            reponse = DIALOGUES[1].get(etape_id)
-            if not reponse:
-                gest_menus.fermer('dialogue')
-                return
-            texte_dialogue.text = reponse["texte"]
-            if "effet" in reponse:
-                reponse["effet"]()
-            suite     = reponse.get("suite")
-            label_btn = "Continuer" if suite else "Au revoir"
-            b = creer_bouton(
-                label_btn, panneau,
-                pos=(0.05, -0.18),
-                taille=(0.38, 0.10),
-                au_clic=lambda s=suite: afficher_etape(s) if s else gest_menus.fermer('dialogue')
-            )
-            boutons_choix.append(b)
+    # Disposition historique : plusieurs choix empilés, choix unique plus bas
+    TAILLE_LISTE, TAILLE_SEUL = (0.56, 0.10), (0.38, 0.10)
+    boutons = [
+        creer_bouton(" ", panneau, pos=(0.05, -i * 0.12), taille=TAILLE_LISTE,
+                     au_clic=lambda i=i: choisir(i), enabled=False)
+        for i in range(MAX_CHOIX_DIALOGUE)
+    ]
+    courant = {"graphe": None, "noeud": 0, "seul": None}
 
-    def reagir(cle):
-        if cle == "quitter":
+    def disposer(seul):
+        # Ne change la géométrie des boutons qu'au passage liste <-> choix unique
+        if courant["seul"] == seul:
+            return
+        courant["seul"] = seul
+        taille = TAILLE_SEUL if seul else TAILLE_LISTE
+        for i, btn in enumerate(boutons):
+            btn.scale = taille
+            btn.position = (0.05, -0.18 if seul else -i * 0.12)
+            btn.text_entity.scale = (1.3 / taille[0], 1.3 / taille[1])
+
+    def afficher_noeud(index):
+        if index == FIN_DIALOGUE:
             gest_menus.fermer('dialogue')
-        else:
-            afficher_etape(cle)
+            return
+        graphe = courant["graphe"]
+        courant["noeud"] = index
+        texte_dialogue.text = graphe.textes[index]
+        effet = graphe.effets[index]
+        if effet is not None:
+            EFFETS[effet]()
+        choix = graphe.choix[index]
+        disposer(len(choix) == 1)
+        for i, btn in enumerate(boutons):
+            if i < len(choix):
+                if btn.text != choix[i][0]:
+                    btn.text = choix[i][0]
+                btn.enabled = True
+            else:
+                btn.enabled = False
+
+    def choisir(i):
+        graphe = courant["graphe"]
+        afficher_noeud(graphe.choix[courant["noeud"]][i][1])
 
-    panneau.demarrer = lambda: afficher_etape("accueil")
+    def demarrer(pnj="garde_forestier"):
+        graphe = graphes[pnj]
+        courant["graphe"] = graphe
+        if titre.text != graphe.nom:
+            titre.text = graphe.nom
+        afficher_noeud(graphe.depart)
+
+    panneau.demarrer = demarrer
     gest_menus.enregistrer('dialogue', panneau, bloquant=True)
     return panneau
 
@@ -1026,9 +1745,12 @@ def creer_menu_commandes(gest_menus):
         ("P",                  "Poser un appat"),
         ("E",                  "Encyclopedie"),
         ("B",                  "Boutique"),
+        ("C",                  "Mode photo (haute resolution)"),
+        ("F5 / F9",            "Sauvegarde / chargement rapide"),
+        ("M",                  "Carte (agrandir / reduire)"),
     ]
     for i, (touche, desc) in enumerate(commandes):
-        y = 0.28 - i * 0.08
+        y = 0.28 - i * 0.055
         Text(touche, parent=panneau, position=(-0.44, y), scale=1.5, color=Couleurs.ACCENT, z=-0.1)
         Text(desc,   parent=panneau, position=(-0.08, y), scale=1.5, color=color.white,    z=-0.1)
 
@@ -1038,7 +1760,15 @@ def creer_menu_commandes(gest_menus):
     return panneau
 
 
-def creer_menu_encyclopedie(gest_menus, etat_jeu, entites):
+def creer_menu_encyclopedie(gest_menus, etat_jeu, entites, catalogue):
+    """
+    Grille virtualisée : une page de cartes créée une fois, puis seulement
+    re-liée aux données (texte, couleur) à l'ouverture et au changement de
+    page. Le coût d'ouverture ne dépend pas du nombre d'espèces découvertes.
+    """
+    colonnes, lignes = ParametresJeu.GRILLE_WIKIDEX
+    par_page = colonnes * lignes
+
     panneau = Entity(parent=camera.ui, model='quad', color=Couleurs.PANNEAU,
                      scale=(0.90, 0.88), z=0.4, enabled=False)
     Text("Wiki-Dex", parent=panneau, y=0.44, origin=(0, 0),
@@ -1046,41 +1776,72 @@ def creer_menu_encyclopedie(gest_menus, etat_jeu, entites):
 
     texte_info    = Text("", parent=panneau, position=(-0.42, 0.35),
                          scale=1.5, color=color.white, z=-0.1)
-    cartes_photos = []
+    texte_page    = Text("", parent=panneau, position=(0, -0.33), origin=(0, 0),
+                         scale=1.5, color=color.white, z=-0.1)
 
-    def rafraichir():
-        nonlocal cartes_photos
-        for e in cartes_photos:
-            destroy(e)
-        cartes_photos.clear()
+    # Espèce -> couleur, construit une fois (plus de parcours de `entites` par carte)
+    couleurs = {a.nom: getattr(a, 'color', color.white) for a in entites if hasattr(a, 'nom')}
+
+    cartes = []
+    for idx in range(par_page):
+        carte     = Entity(parent=panneau, model='quad',
+                           color=color.rgba(200/255, 200/255, 200/255, 1),
+                           scale=(0.19, 0.20), z=-0.1,
+                           position=(-0.34 + (idx % colonnes) * 0.225,
+                                      0.10 - (idx // colonnes) * 0.24))
+        interieur = Entity(parent=carte, model='quad', color=color.white,
+                           scale=(0.85, 0.62), position=(0, 0.10), z=-0.2)
+        etiquette = Text("", parent=carte, scale=4.0, color=color.black,
+                         position=(-0.46, -0.30), z=-0.3)
+        carte.enabled = False
+        cartes.append((carte, interieur, etiquette))
+
+    page = 0
+
+    def nb_pages():
+        return max(1, -(-len(etat_jeu.encyclopedie) // par_page))
+
+    def lier_page():
+        encyclopedie = etat_jeu.encyclopedie
+        debut = page * par_page
+        # Une seule requête (nom IN ...) pour les cartes visibles de la page
+        photos = catalogue.meilleures_photos(encyclopedie[debut:debut + par_page])
+        for i, (carte, interieur, etiquette) in enumerate(cartes):
+            if debut + i >= len(encyclopedie):
+                carte.enabled = False
+                continue
+            nom = encyclopedie[debut + i]
+            photo   = photos.get(nom)
+            legende = f"{nom}\n{photo['score']} pts" if photo else nom
+            if etiquette.text != legende:
+                etiquette.text = legende
+            interieur.color = couleurs.get(nom, color.white)
+            carte.enabled   = True
+        texte_page.text = f"Page {page + 1}/{nb_pages()}" if nb_pages() > 1 else ""
 
+    def rafraichir():
+        nonlocal page
+        page = min(page, nb_pages() - 1)
         chaine_badges   = ", ".join(etat_jeu.badges) if etat_jeu.badges else "Aucun"
         nb_dec          = len(etat_jeu.encyclopedie)
         mot             = "animal" if nb_dec <= 1 else "animaux"
         texte_info.text = f"Badges : {chaine_badges}\nDecouvertes : {nb_dec} {mot}"
+        lier_page()
 
-        for idx, nom in enumerate(etat_jeu.encyclopedie):
-            col = color.white
-            for a in entites:
-                if hasattr(a, 'nom') and a.nom == nom:
-                    col = a.color if hasattr(a, 'color') else color.white
-                    break
-            col_x = -0.34 + (idx % 4) * 0.225
-            col_y =  0.10 - (idx // 4) * 0.24
-
-            carte     = Entity(parent=panneau, model='quad',
-                               color=color.rgba(200/255, 200/255, 200/255, 1),
-                               scale=(0.19, 0.20), position=(col_x, col_y), z=-0.1)
-            interieur = Entity(parent=carte, model='quad', color=col,
-                               scale=(0.85, 0.62), position=(0, 0.10), z=-0.2)
-            etiquette = Text(nom, parent=carte, scale=4.0, color=color.black,
-                             position=(-0.46, -0.38), z=-0.3)
-            cartes_photos.extend([carte, interieur, etiquette])
+    def defiler(sens):
+        nonlocal page
+        nouvelle = max(0, min(nb_pages() - 1, page + sens))
+        if nouvelle != page:
+            page = nouvelle
+            lier_page()
 
+    creer_bouton("Prec.", panneau, (-0.30, -0.33), (0.14, 0.06), au_clic=lambda: defiler(-1))
+    creer_bouton("Suiv.", panneau, ( 0.30, -0.33), (0.14, 0.06), au_clic=lambda: defiler(1))
     creer_bouton("Fermer (E)", panneau, (0, -0.42), (0.38, 0.075),
                  au_clic=lambda: gest_menus.fermer('encyclo'))
     gest_menus.enregistrer('encyclo', panneau, bloquant=True)
     panneau.rafraichir = rafraichir
+    panneau.defiler    = defiler
     return panneau
 
 
@@ -1154,6 +1915,62 @@ def creer_menu_quiz(gest_menus, gest_notifs, etat_jeu):
     return panneau
 
 
+def creer_selecteur_emplacements(emplacements, au_choix):
+    """Écran de choix de la partie — n'affiche que l'index des emplacements."""
+    panneau = Entity(parent=camera.ui, model='quad', color=Couleurs.PANNEAU,
+                     scale=(0.95, 0.80), z=0.4)
+    Text("FAUNEX - Choisir une partie", parent=panneau, y=0.42, origin=(0, 0),
+         scale=2.2, color=Couleurs.TITRE, z=-0.1)
+    lignes = []
+
+    def choisir(numero):
+        destroy(panneau)
+        au_choix(numero)
+
+    def effacer(numero, bouton):
+        # Deux clics : la partie est supprimée définitivement
+        if bouton.text != "Confirmer ?":
+            bouton.text = "Confirmer ?"
+            return
+        emplacements.effacer(numero)
+        rafraichir()
+
+    def rafraichir():
+        for e in lignes:
+            destroy(e)
+        lignes.clear()
+        for i, (numero, resume) in enumerate(emplacements.lister()):
+            y = 0.22 - i * 0.27
+            miniature = emplacements.chemin_miniature(numero)
+            apercu = Entity(parent=panneau, model='quad', position=(-0.34, y), z=-0.1,
+                            scale=(0.22, 0.22 * 9 / 16 * 0.95 / 0.80), color=Couleurs.HUD_FOND)
+            if miniature is not None:
+                apercu.texture = UrsinaTexture(miniature)
+                apercu.color   = color.white
+            if resume:
+                minutes = int(resume["temps_jeu"] // 60)
+                details = (f"{resume['credits']} cr - {resume['especes']} especes - "
+                           f"{minutes // 60}h{minutes % 60:02d}")
+            else:
+                details = "Vide"
+            lignes.append(apercu)
+            lignes.append(Text(f"Emplacement {numero}", parent=panneau, position=(-0.20, y + 0.05),
+                               scale=1.6, color=Couleurs.ACCENT, z=-0.1))
+            lignes.append(Text(details, parent=panneau, position=(-0.20, y - 0.02),
+                               scale=1.3, color=color.white, z=-0.1))
+            lignes.append(creer_bouton("Jouer" if resume else "Nouvelle partie", panneau,
+                                       (0.33, y + 0.03), (0.22, 0.08),
+                                       au_clic=lambda n=numero: choisir(n)))
+            if resume:
+                bouton = creer_bouton("Effacer", panneau, (0.33, y - 0.06), (0.22, 0.06),
+                                      couleur_fond=color.rgba(110/255, 30/255, 30/255, 1))
+                bouton.on_click = lambda n=numero, b=bouton: effacer(n, b)
+                lignes.append(bouton)
+
+    rafraichir()
+    return panneau
+
+
 # ─────────────────────────────────────────
 #  Jeu principal
 # ─────────────────────────────────────────
@@ -1162,9 +1979,33 @@ class JeuFaunex:
         # Variable pour l'intro
         self.intro = None
         self.jeu_initialise = False
+
+        # Entrées enregistrées (FAUNEX_ENREGISTRER) ou rejouées à pas fixe (FAUNEX_REJOUER)
+        self.enregistreur = None
+        self.lecteur      = None
+        self.emplacements = GestionnaireEmplacements()
+        if os.environ.get("FAUNEX_REJOUER"):
+            self.lecteur = rejeu.Lecteur(os.environ["FAUNEX_REJOUER"])
+            # Le rejeu part d'un monde neuf : une partie sauvegardée le ferait diverger
+            if not self.emplacements.est_vide(self.lecteur.emplacement):
+                # Relancer avec FAUNEX_SAUVEGARDES=<dossier vide>
+                LOG_REJEU.erreur("emplacement_non_vide", emplacement=self.lecteur.emplacement,
+                                 dossier=str(self.emplacements.dossier))
+                sys.exit(1)
+            self._ignorer_entrees_reelles()
         
-        # Charger et démarrer l'intro
-        self.demarrer_jeu()
+        # Choix de la partie, puis démarrage du jeu
+        self.selecteur    = creer_selecteur_emplacements(self.emplacements, self.demarrer_jeu)
+
+    @staticmethod
+    def _ignorer_entrees_reelles():
+        """Pendant un rejeu, clavier et souris n'atteignent plus app.input (ni held_keys)."""
+        for touche in keyboard_keys:
+            for suffixe in ("", "-up", "-repeat"):
+                app.ignore(f"raw-{touche}{suffixe}")
+        for evenement in ("buttonDown", "buttonUp", "buttonHold", "keystroke"):
+            app.ignore(evenement)
+        held_keys.clear()
     
     # def demarrer_intro(self):
     #     """Démarre l'intro vidéo"""
@@ -1180,21 +2021,58 @@ class JeuFaunex:
     #         print("   Placez votre fichier intro.mp4 dans assets_add/video/")
     #         self.demarrer_jeu()
     
-    def demarrer_jeu(self):
-        """Initialise le jeu après l'intro"""
+    def demarrer_jeu(self, emplacement=1):
+        """Initialise le jeu sur l'emplacement de sauvegarde choisi"""
         if self.jeu_initialise:
             return
         
         self.jeu_initialise = True
-        print("🎮 Démarrage du jeu...")
-        
+        LOG_DEMARRAGE.info("partie_demarree", emplacement=emplacement)
+        TRACEUR.etape("partie.sauvegarde")
+        # Graines : celles de la session rejouée, sinon tirées (et enregistrées si demandé)
+        if self.lecteur:
+            graine, self.graine_monde = self.lecteur.graine, self.lecteur.graine_monde
+            # Pas fixe depuis t = 0 : chaque frame dure exactement `pas`, quelle que soit la machine
+            globalClock.setMode(ClockObject.MForced)
+            globalClock.setFrameRate(1 / self.lecteur.pas)
+            globalClock.setFrameTime(0.0)
+        else:
+            graine, self.graine_monde = random.randrange(2 ** 32), ParametresJeu.GRAINE_MONDE
+
+        # Les sauvegardes d'avant les emplacements (dossier courant) vont dans le premier
+        if emplacement == 1 and not self.lecteur and self.emplacements.resume(1) is None:
+            self.emplacements.reprendre_anciens(1, [
+                Path(NOM_ANCIENNE_SAUVEGARDE), Path(NOM_SAUVEGARDE),
+                *Path(".").glob(NOM_SAUVEGARDE + ".journal.*"),
+                Path(NOM_MONDE), Path(NOM_CATALOGUE),
+            ])
+        dossier = self.emplacements.chemin(emplacement)
+        resume  = self.emplacements.resume(emplacement) or {}
+        self.emplacement   = emplacement
+        self.fichier_monde = dossier / NOM_MONDE
+        self.ecriture_monde = EcrivainAtomique(self.fichier_monde)   # F5 et fermeture, dans l'ordre
+        self.temps_jeu     = resume.get("temps_jeu", 0.0)
+        self.miniature     = None   # vue du jeu à la dernière pause, écrite à la fermeture
+
         self.etat_jeu        = EtatJeu()
         self.appareil_photo  = AppareilPhoto()
+        self.catalogue       = CataloguePhotos(dossier / NOM_CATALOGUE)
+        self.encodeur        = EncodeurAsynchrone()
+        # Photos en file écrites quelle que soit la sortie (fenêtre fermée, fin de rejeu, ...)
+        atexit.register(self.catalogue.fermer)
+        atexit.register(self.encodeur.fermer)
+        self.journal         = JournalSauvegarde(
+            dossier / NOM_SAUVEGARDE, EtatJeu.DEFAUTS_SAUVEGARDE,
+            decodeur=decoder_sauvegarde,
+            encodeur=encoder_sauvegarde,
+            reprise=lambda: lire_ancienne(dossier / NOM_ANCIENNE_SAUVEGARDE),
+        )
         self.entites         = []
         self.appats          = []   # liste dédiée appâts — évite le filtrage à chaque frame
-        self.temps_derniere_sauvegarde = time.time()
+        self.temps_derniere_sauvegarde = horloge()
         self._temps_derniere_notif_pnj = 0.0
 
+        TRACEUR.etape("partie.scene")
         self.joueur          = FirstPersonController(position=(0, 2, 0), speed=10)
         self.etat_jeu.joueur = self.joueur
 
@@ -1203,7 +2081,7 @@ class JeuFaunex:
             model='plane',
             texture='grass',
             texture_scale=(100, 100),
-            scale=300,
+            scale=ParametresJeu.TAILLE_TERRAIN,
             collider='box',
             shader=lit_with_shadows_shader
         )
@@ -1225,29 +2103,93 @@ class JeuFaunex:
             shadows=False   # ← désactivé pour les performances
         )
 
-        self.etat_jeu.charger(self.appareil_photo)
+        self.etat_jeu.charger(self.appareil_photo, self.journal)
+        self.catalogue.marquer_connus(self.etat_jeu.encyclopedie)
+        TRACEUR.etape("partie.monde")
+        # FAUNEX_MEMOIRE=1 : allocations Python de la construction du monde (rapport F6)
+        self.suivi_memoire = memoire.SuiviPython() if memoire.SUIVI_DEMANDE else None
+        if self.suivi_memoire:
+            self.suivi_memoire.debut_construction()
         self._creer_entites_monde()
 
+        self.animaux         = [e for e in self.entites if isinstance(e, Animal)]
+        self.gest_detail     = GestionnaireDetail(
+            self.appareil_photo, [e for e in self.entites if isinstance(e, (Animal, Arbre))]
+        )
+        self.ordonnanceur_ia = OrdonnanceurIA(ParametresJeu.PERIODES_IA)
+
+        # Monde tel que créé : sert à la réinitialisation sans tout reconstruire
+        self.dechets_collectes  = set()   # idents ramassés depuis le lancement
+        self.instantane_rapide  = None
+        self.monde_initial      = self.capturer_monde()
+        # Génération valide la plus récente (cadre vérifié puis décodage complet, une seule fois)
+        monde = lire_generations(self.fichier_monde, instantane_monde.decoder,
+                                 (instantane_monde.InstantaneInvalide,))
+        if monde is not None:
+            self.restaurer_monde(monde)
+        if self.suivi_memoire:
+            self.suivi_memoire.fin_construction()
+        # Session enregistrée ou rejouée seulement : une partie ordinaire garde l'état du
+        # générateur que la restauration vient de rétablir
+        if self.lecteur or os.environ.get("FAUNEX_ENREGISTRER"):
+            random.seed(graine)
+
+        TRACEUR.etape("partie.interface")
         self.gest_notifs = GestionnaireNotification()
         self.gest_menus  = GestionnaireMenu(self.joueur)
         self.ath         = AffichageTeteHaute(self.etat_jeu, self.appareil_photo)
         self.viseur      = Viseur()
         self.barre_focus = BarreMiseAuPoint()
-
-        self.pause_overlay = creer_menu_pause(
-            self.gest_menus, self.etat_jeu, self.appareil_photo, self.entites, self.gest_notifs
-        )
-        creer_menu_commandes(self.gest_menus)
-        self.dialogue_menu = creer_menu_dialogue(
-            self.gest_menus, self.gest_notifs, self.etat_jeu, self.appareil_photo
-        )
-        self.encyclo_menu = creer_menu_encyclopedie(self.gest_menus, self.etat_jeu, self.entites)
-        self.shop_menu    = creer_menu_boutique(
-            self.gest_menus, self.etat_jeu, self.appareil_photo, self.gest_notifs
-        )
-        self.quiz_menu = creer_menu_quiz(self.gest_menus, self.gest_notifs, self.etat_jeu)
+        self.gest_menus.abonner("bloque", lambda bloque: self.viseur.afficher(not bloque))
+        self.carte       = Carte(self.vegetation, ParametresJeu.TAILLE_TERRAIN / 2)
+        self.superposition_profil = SuperpositionProfileur(PROFILEUR)
+        self.gest_menus.abonner("bloque", lambda bloque: setattr(self.carte.fond, 'enabled', not bloque))
+
+        # Menus construits à leur première ouverture (ou pendant les frames creuses)
+        gm = self.gest_menus
+        gm.declarer('pause', lambda: creer_menu_pause(
+            gm, self.etat_jeu, self.appareil_photo, self.gest_notifs,
+            self.catalogue, self.encodeur, self.journal,
+            self.fermer_emplacement, self.reinitialiser_monde
+        ))
+        gm.declarer('commandes', lambda: creer_menu_commandes(gm))
+        gm.declarer('dialogue', lambda: creer_menu_dialogue(
+            gm, self.gest_notifs, self.etat_jeu, self.appareil_photo, DIALOGUES
+        ))
+        gm.declarer('encyclo', lambda: creer_menu_encyclopedie(
+            gm, self.etat_jeu, self.entites, self.catalogue
+        ))
+        gm.declarer('shop', lambda: creer_menu_boutique(
+            gm, self.etat_jeu, self.appareil_photo, self.gest_notifs
+        ))
+        gm.declarer('quiz', lambda: creer_menu_quiz(gm, self.gest_notifs, self.etat_jeu))
+        gm.declarer('photo', lambda: ModePhoto(
+            gm, self.gest_notifs, self.appareil_photo, self.encodeur
+        ))
+        self._prechauffage = ParametresJeu.PRECHAUFFAGE_MENUS
+        self._chargement_lods = ParametresJeu.CHARGEMENT_LODS
 
         self.gest_menus.ouvrir('commandes')
+
+        if self.lecteur:
+            PROFILEUR.actif = True
+            LOG_REJEU.info("rejeu_demarre", entrees=len(self.lecteur.entrees),
+                           duree=round(self.lecteur.duree, 1))
+        elif os.environ.get("FAUNEX_ENREGISTRER"):
+            self.enregistreur = rejeu.Enregistreur(
+                os.environ["FAUNEX_ENREGISTRER"], graine, self.graine_monde, emplacement
+            )
+            LOG_REJEU.info("enregistrement_demarre", chemin=str(self.enregistreur.chemin))
+        TRACEUR.etape("partie.premiere_frame", frames=2, fin=True)
+
+    def _ecrire_trace_demarrage(self):
+        try:
+            chemin = TRACEUR.ecrire(dossier_utilisateur() / "profils")
+        except OSError as e:
+            LOG_DEMARRAGE.attention("trace_non_ecrite", erreur=str(e))
+            return
+        # Détail par étape dans le fichier (TRACEUR.resume() pour un tableau lisible)
+        LOG_DEMARRAGE.info("trace_ecrite", total_ms=TRACEUR.donnees()["total"], chemin=str(chemin))
     
     # ------------------------------------------------------------------
     def _creer_entites_monde(self):
@@ -1281,8 +2223,8 @@ class JeuFaunex:
         for d in donnees_animaux:
             self.entites.append(Animal(*d))
 
-        for pos in [(5, 0.5, 5), (-15, 0.5, 20), (60, 0.5, 5)]:
-            self.entites.append(Dechet(pos))
+        for ident, pos in enumerate([(5, 0.5, 5), (-15, 0.5, 20), (60, 0.5, 5)]):
+            self.entites.append(Dechet(pos, ident))
 
         # ── Génération aléatoire des éléments du monde ──────────────────
         # On récupère les positions des entités déjà placées pour éviter
@@ -1291,6 +2233,8 @@ class JeuFaunex:
             (e.x, e.y, e.z) for e in self.entites if hasattr(e, 'x')
         ]
 
+        self.vegetation = []   # (x, z) des arbres, pour le fond de la carte
+
         # Catalogue : (type_arbre, nb_instances, graine_rng)
         catalogue_elements = [
             ("arbre_grand",  ParametresJeu.NB_ARBRES_GRANDS,  0),
@@ -1303,18 +2247,98 @@ class JeuFaunex:
                 rayon=ParametresJeu.RAYON_MONDE,
                 dist_min=ParametresJeu.DIST_MIN_SPAWN,
                 positions_existantes=positions_occupees,
-                seed=42 + seed_offset,  # graine fixe → carte reproductible ;
-                                        # retirez `seed=` pour une carte différente à chaque lancement
+                seed=self.graine_monde + seed_offset,   # graine fixe → carte reproductible
             )
             for x, z in positions:
                 arbre = Arbre((x, 0, z), type_elem)
                 self.entites.append(arbre)
                 positions_occupees.append((x, 0, z))
+                self.vegetation.append((x, z))
 
         self.pnj = PNJ("Garde Forestier", (10, 1, 10), color.green)
         self.entites.append(self.pnj)
         self.entites.append(Empreinte((5, 0.1, 10)))
 
+    # ------------------------------------------------------------------
+    #  Instantané du monde (sauvegarde/chargement rapide, réinitialisation)
+    # ------------------------------------------------------------------
+    def capturer_monde(self):
+        objets = [
+            (OBJET_DECHET if e.etiquette == 'dechet' else OBJET_APPAT, e.ident, e)
+            for e in self.entites if getattr(e, 'etiquette', None) in ('dechet', 'appat')
+        ]
+        return instantane_monde.capturer(
+            self.joueur, self.joueur.camera_pivot, self.animaux, objets,
+            self.ordonnanceur_ia._trame, self.etat_jeu.appats_restants
+        )
+
+    def restaurer_monde(self, donnees):
+        objets, self.ordonnanceur_ia._trame, appats = instantane_monde.restaurer(
+            donnees, self.joueur, self.joueur.camera_pivot, self.animaux
+        )
+        if appats is not None:      # les appâts posés et ceux en poche vont ensemble
+            self.etat_jeu.appats_restants = appats
+        for e in [e for e in self.entites if getattr(e, 'etiquette', None) in ('dechet', 'appat')]:
+            self.entites.remove(e)
+            destroy(e)
+        self.appats.clear()
+        for code, ident, position in objets:
+            if code == OBJET_APPAT:
+                appat = Appat(position)
+                self.entites.append(appat)
+                self.appats.append(appat)
+            elif ident not in self.dechets_collectes:
+                # Un déchet ramassé ne réapparaît pas au chargement rapide (crédits déjà gagnés)
+                self.entites.append(Dechet(position, ident))
+
+    def fermer_emplacement(self):
+        """À la fermeture : monde, miniature et résumé de l'emplacement."""
+        self.ecriture_monde.ecrire(encadrer(self.capturer_monde()))
+        self.ecriture_monde.attendre()
+        if self.ecriture_monde.erreur:
+            LOG_SAUVEGARDE.erreur("monde_non_sauvegarde", erreur=str(self.ecriture_monde.erreur))
+        avec_miniature = False
+        if self.miniature is not None:
+            chemin = self.emplacements.chemin(self.emplacement) / NOM_MINIATURE
+            avec_miniature = self.miniature.write(Filename.from_os_specific(str(chemin)))
+        self.emplacements.mettre_a_jour(
+            self.emplacement, self.etat_jeu.credits, len(self.etat_jeu.encyclopedie),
+            self.temps_jeu, miniature=avec_miniature, attendre=True
+        )
+        if self.emplacements.ecriture.erreur:
+            LOG_SAUVEGARDE.erreur("index_non_sauvegarde", erreur=str(self.emplacements.ecriture.erreur))
+
+    def capturer_miniature(self):
+        image = capturer_ecran()
+        if image is None:
+            return
+        miniature = PNMImage(ParametresJeu.TAILLE_MINIATURE[0], ParametresJeu.TAILLE_MINIATURE[1],
+                             image.getNumChannels())
+        miniature.quickFilterFrom(image)
+        self.miniature = miniature
+
+    def reinitialiser_monde(self):
+        self.dechets_collectes.clear()
+        self.instantane_rapide = None
+        self.restaurer_monde(self.monde_initial)
+        self.ecriture_monde.attendre()   # une sauvegarde rapide en cours recréerait le fichier
+        for generation in chemins_generations(self.fichier_monde):
+            if generation.exists():
+                generation.unlink()
+
+    def sauvegarde_rapide(self):
+        self.instantane_rapide = self.capturer_monde()
+        # Écriture disque hors du thread de rendu
+        self.ecriture_monde.ecrire(encadrer(self.instantane_rapide))
+        self.gest_notifs.ajouter("Sauvegarde rapide", Couleurs.ACCENT, 1.5)
+
+    def chargement_rapide(self):
+        if self.instantane_rapide is None:
+            self.gest_notifs.ajouter("Aucune sauvegarde rapide.", Couleurs.ATTENTION)
+            return
+        self.restaurer_monde(self.instantane_rapide)
+        self.gest_notifs.ajouter("Chargement rapide", Couleurs.ACCENT, 1.5)
+
     # ------------------------------------------------------------------
     def verifier_salutation_pnj(self):
         # Court-circuit immédiat si un menu est ouvert
@@ -1323,7 +2347,7 @@ class JeuFaunex:
         dist = distance_2d(self.joueur.position, self.pnj.position)
         if dist >= 8:
             return
-        maintenant = time.time()
+        maintenant = horloge()
         # Afficher le hint au maximum toutes les 2 secondes
         if maintenant - self._temps_derniere_notif_pnj > 2.0:
             self._temps_derniere_notif_pnj = maintenant
@@ -1331,37 +2355,111 @@ class JeuFaunex:
 
     # ------------------------------------------------------------------
     def update(self):
+        if TRACEUR.frame():
+            self._ecrire_trace_demarrage()
+
         # Si le jeu n'est pas initialisé, on met juste à jour l'intro
         if not self.jeu_initialise:
-            if self.intro:
+            if self.lecteur:
+                destroy(self.selecteur)
+                self.demarrer_jeu(self.lecteur.emplacement)
+            elif self.intro:
                 self.intro.update()
             return
-        
-        self.gest_notifs.mettre_a_jour()
-
-        # Autosauvegarde toutes les 10 s
-        if time.time() - self.temps_derniere_sauvegarde >= 10:
-            self.etat_jeu.sauvegarder(self.appareil_photo)
-            self.temps_derniere_sauvegarde = time.time()
-            self.gest_notifs.ajouter("Autosauvegarde...", color.gray, 1.5)
 
-        menu_ouvert = self.gest_menus.est_bloque()
-        self.viseur.h.enabled     = not menu_ouvert
-        self.viseur.v.enabled     = not menu_ouvert
-        self.viseur.point.enabled = not menu_ouvert
+        if self.lecteur:
+            self._rejouer()
+        elif self.enregistreur:
+            self.enregistreur.avancer(time.dt)
+            self.enregistreur.souris(mouse.velocity[0], mouse.velocity[1])
+
+        with PROFILEUR.portee("frame"):
+            self._mettre_a_jour_jeu()
+        self.superposition_profil.mettre_a_jour(time.dt)
+
+    def _rejouer(self):
+        touches, dx, dy = self.lecteur.avancer(time.dt)
+        # Lu ensuite par le FirstPersonController (les entités sont mises à jour après update())
+        mouse.velocity = Vec3(dx, dy, 0)
+        for key in touches:
+            app.input(key, is_raw=True)   # met aussi à jour held_keys
+        if self.lecteur.fini:
+            base = PROFILEUR.exporter(dossier_utilisateur() / "profils")
+            LOG_REJEU.info("rejeu_termine", duree=round(self.lecteur.temps, 1), profil=str(base))
+            self.lecteur = None
+            application.quit()
+
+    def _mettre_a_jour_jeu(self):
+        prof = PROFILEUR
+        with prof.portee("notifications"):
+            self.gest_notifs.mettre_a_jour(time.dt)
+        self.temps_jeu += time.dt
+
+        # Après le démarrage, une seule construction par frame creuse : un menu, sinon un niveau de détail
+        creuse = time.dt < ParametresJeu.BUDGET_FRAME_CREUSE
+        if self._prechauffage is not None:
+            self._prechauffage -= time.dt
+            if self._prechauffage <= 0 and creuse:
+                with prof.portee("prechauffage"):
+                    if self.gest_menus.prechauffer():
+                        creuse = False
+                    else:
+                        self._prechauffage = None
+        if self._chargement_lods is not None:
+            self._chargement_lods -= time.dt
+            if self._chargement_lods <= 0 and creuse:
+                with prof.portee("lods"):
+                    if not LODS.prechauffer():
+                        self._chargement_lods = None
+
+        with prof.portee("photos"):
+            for chemin, ok in self.encodeur.terminees():
+                if ok:
+                    self.gest_notifs.ajouter(f"Photo enregistree : {chemin.name}", Couleurs.ACCENT)
+                else:
+                    self.gest_notifs.ajouter("Echec de l'enregistrement de la photo.", Couleurs.ATTENTION)
+
+        # Autosauvegarde toutes les 10 s — seules les mutations sont journalisées,
+        # l'écriture se fait dans le thread du journal
+        if horloge() - self.temps_derniere_sauvegarde >= 10:
+            with prof.portee("autosauvegarde"):
+                self.temps_derniere_sauvegarde = horloge()
+                if self.etat_jeu.sauvegarder(self.appareil_photo, self.journal):
+                    self.gest_notifs.ajouter("Autosauvegarde...", color.gray, 1.5)
+                    self.emplacements.mettre_a_jour(
+                        self.emplacement, self.etat_jeu.credits,
+                        len(self.etat_jeu.encyclopedie), self.temps_jeu
+                    )
+                if self.journal.erreur:
+                    self.gest_notifs.ajouter("Echec de l'autosauvegarde !", Couleurs.ATTENTION)
+                    self.journal.erreur = None
+                if self.ecriture_monde.erreur:
+                    self.gest_notifs.ajouter("Echec de la sauvegarde rapide !", Couleurs.ATTENTION)
+                    self.ecriture_monde.erreur = None
+                if self.emplacements.ecriture.erreur:
+                    self.gest_notifs.ajouter("Echec de la mise a jour des emplacements !", Couleurs.ATTENTION)
+                    self.emplacements.ecriture.erreur = None
+
+        menu_ouvert = self.gest_menus.bloque
+        with prof.portee("camera"):
+            zoom_change = self.appareil_photo.mettre_a_jour_zoom(time.dt)
+            self.gest_detail.mettre_a_jour(time.dt, zoom_change)
+            self.appareil_photo.mettre_a_jour_mise_au_point(self.joueur, time.dt)
+            if self.appareil_photo.en_mise_au_point:
+                self.barre_focus.mettre_a_jour(self.appareil_photo.valeur_mise_au_point)
 
-        self.ath.mettre_a_jour()
-        self.appareil_photo.mettre_a_jour_mise_au_point()
-        if self.appareil_photo.en_mise_au_point:
-            self.barre_focus.mettre_a_jour(self.appareil_photo.valeur_mise_au_point)
+        with prof.portee("carte"):
+            self.carte.mettre_a_jour(time.dt, self.joueur, self.pnj, self.appats, self.animaux)
 
         if not menu_ouvert:
-            # self.appats passé directement — plus de list comprehension × 21 animaux
-            for e in self.entites:
-                if hasattr(e, 'mettre_a_jour_ia'):
-                    e.mettre_a_jour_ia(self.joueur, self.entites, self.appats)
+            with prof.portee("ia"):
+                # self.appats passé directement — plus de list comprehension × 21 animaux
+                self.ordonnanceur_ia.executer(
+                    self.animaux, self.joueur, self.entites, self.appats, time.dt
+                )
 
-        self.verifier_salutation_pnj()
+        with prof.portee("pnj"):
+            self.verifier_salutation_pnj()
 
     # ------------------------------------------------------------------
     def input(self, key):
@@ -1370,30 +2468,77 @@ class JeuFaunex:
             if self.intro:
                 self.intro.on_click()
             return
-        
+        if self.enregistreur:
+            self.enregistreur.touche(key)
+
+        # Profileur : F3 affiche / masque, F4 exporte (CSV + JSON) ; F6 : rapport mémoire
+        if key == 'f3':
+            self.superposition_profil.basculer()
+            return
+        if key == 'f4' and PROFILEUR.actif:
+            base = PROFILEUR.exporter(dossier_utilisateur() / "profils")
+            self.gest_notifs.ajouter(f"Profil exporte : {base.name}", Couleurs.ACCENT)
+            return
+        if key == 'f6':
+            chemin = memoire.ecrire(memoire.rapport(scene.entities, camera.ui, self.suivi_memoire),
+                                    dossier_utilisateur() / "profils")
+            self.gest_notifs.ajouter(f"Memoire : {chemin.name}", Couleurs.ACCENT)
+            return
+
+        with PROFILEUR.portee("input"):
+            self._traiter_entree(key)
+
+    def _traiter_entree(self, key):
         if key == 'escape':
             if self.gest_menus.menus_actifs:
                 self.gest_menus.fermer_tout()
-                self.pause_overlay.enabled = False
+                if 'pause' in self.gest_menus.objets:
+                    self.gest_menus.objets['pause'].enabled = False
             else:
-                self.pause_overlay.enabled = True
+                # Vue du jeu sans menu, pour le sélecteur : capturée ici (Sauvegarder et quitter
+                # passe par la pause) plutôt qu'à l'autosauvegarde, où la relecture accrochait
+                self.capturer_miniature()
+                self.gest_menus.obtenir('pause').enabled = True
                 self.gest_menus.ouvrir('pause')
             return
 
+        if 'photo' in self.gest_menus.menus_actifs:
+            self.gest_menus.obtenir('photo').entree(key)
+            return
+
+        if key == 'c' and not self.gest_menus.est_bloque():
+            self.gest_menus.ouvrir('photo')
+            return
+
         touches_menus = {'tab': 'commandes', 'e': 'encyclo', 'b': 'shop'}
         if key in touches_menus:
             self.gest_menus.basculer(touches_menus[key])
-            if touches_menus[key] == 'encyclo' and self.encyclo_menu.enabled:
-                self.encyclo_menu.rafraichir()
-            if touches_menus[key] == 'shop' and self.shop_menu.enabled:
-                self.shop_menu.mettre_a_jour_credits()
+            panneau = self.gest_menus.obtenir(touches_menus[key])
+            if touches_menus[key] == 'encyclo' and panneau.enabled:
+                panneau.rafraichir()
+            if touches_menus[key] == 'shop' and panneau.enabled:
+                panneau.mettre_a_jour_credits()
             return
 
+        if 'encyclo' in self.gest_menus.menus_actifs:
+            pages = {'scroll up': -1, 'left arrow': -1, 'scroll down': 1, 'right arrow': 1}
+            if key in pages:
+                self.gest_menus.obtenir('encyclo').defiler(pages[key])
+                return
+
         if self.gest_menus.est_bloque():
             return
 
+        # ── Sauvegarde / chargement rapide du monde ──
+        if key == 'f5':
+            self.sauvegarde_rapide()
+        elif key == 'f9':
+            self.chargement_rapide()
+        elif key == 'm':
+            self.carte.basculer_taille()
+
         # ── Zoom ──
-        if key == 'scroll up':
+        elif key == 'scroll up':
             self.appareil_photo.zoomer(1)
         elif key == 'scroll down':
             self.appareil_photo.zoomer(-1)
@@ -1417,7 +2562,7 @@ class JeuFaunex:
             dist = distance_2d(self.joueur.position, self.pnj.position)
             if dist < ParametresJeu.DIST_SALUTATION_PNJ:
                 self.etat_jeu.pnj_rencontre = True
-                self.dialogue_menu.demarrer()
+                self.gest_menus.obtenir('dialogue').demarrer()
                 self.gest_menus.ouvrir('dialogue')
             else:
                 self.gest_notifs.ajouter(
@@ -1434,12 +2579,13 @@ class JeuFaunex:
             )
             if touche_ray.hit and hasattr(touche_ray.entity, 'etiquette'):
                 if touche_ray.entity.etiquette == 'animal':
-                    self.appareil_photo.demarrer_mise_au_point()
+                    self.appareil_photo.demarrer_mise_au_point(touche_ray.distance)
                     self.barre_focus.afficher()
                 elif touche_ray.entity.etiquette == 'dechet':
                     entite = touche_ray.entity
                     if entite in self.entites:
                         self.entites.remove(entite)
+                    self.dechets_collectes.add(entite.ident)
                     destroy(entite)
                     self.etat_jeu.credits         += 10
                     self.etat_jeu.dechets_ramasses += 1
@@ -1461,9 +2607,17 @@ class JeuFaunex:
                 if (touche_ray.hit
                         and hasattr(touche_ray.entity, 'etiquette')
                         and touche_ray.entity.etiquette == 'animal'):
+                    # Cliché = image affichée, encodée hors du thread de rendu ; son chemin va au catalogue
+                    image  = capturer_ecran()
+                    chemin = None if image is None else PHOTOS_DIR / (
+                        f"faunex_{time.strftime('%Y%m%d_%H%M%S')}_"
+                        f"{self.appareil_photo.photos_prises + 1:03d}.png"
+                    )
                     succes, premiere_fois, score = self.appareil_photo.prendre_photo(
-                        touche_ray.entity, self.etat_jeu
+                        touche_ray.entity, self.etat_jeu, self.catalogue, chemin
                     )
+                    if succes and chemin is not None:
+                        self.encodeur.encoder(image, chemin)
                     if not succes:
                         self.gest_notifs.ajouter(
                             "Carte SD pleine ! Achete une extension.", Couleurs.ATTENTION
@@ -1472,8 +2626,9 @@ class JeuFaunex:
                         self.gest_notifs.ajouter(
                             f"NOUVEAU ! {touche_ray.entity.nom} +{score} cr", Couleurs.ACCENT
                         )
-                        self.quiz_menu.question.text    = f"Type de {touche_ray.entity.nom} ?"
-                        self.quiz_menu.reponse_attendue = touche_ray.entity.espece
+                        quiz = self.gest_menus.obtenir('quiz')
+                        quiz.question.text    = f"Type de {touche_ray.entity.nom} ?"
+                        quiz.reponse_attendue = touche_ray.entity.espece
                         self.gest_menus.ouvrir('quiz')
                     else:
                         self.gest_notifs.ajouter(
@@ -1484,7 +2639,9 @@ class JeuFaunex:
 # ─────────────────────────────────────────
 #  Lancement
 # ─────────────────────────────────────────
+TRACEUR.etape("selecteur")
 jeu = JeuFaunex()
+TRACEUR.etape("premiere_frame", frames=2)   # jusqu'au premier rendu, puis attente du joueur
 
 def update():
     jeu.update()
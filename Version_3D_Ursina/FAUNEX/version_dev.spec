@@ -1,7 +1,7 @@
 # -*- mode: python ; coding: utf-8 -*-
 from PyInstaller.utils.hooks import collect_all
 
-datas = [('assets_add', 'assets_add'), ('sauvegarde_faunex.json', '.')]
+datas = [('assets_add', 'assets_add'), ('regles_score.json', '.'), ('dialogues', 'dialogues')]
 binaries = []
 hiddenimports = ['ursina', 'panda3d', 'panda3d.core']
 tmp_ret = collect_all('panda3d')